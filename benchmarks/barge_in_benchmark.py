@@ -0,0 +1,127 @@
+"""Measure barge-in detection delay and false triggers on recorded fixtures.
+
+Each fixture is a pair of WAV files recorded together from the same start:
+what the microphone heard while the assistant spoke, and what was played.
+``manifest.json`` in the fixture directory lists them::
+
+    [
+      {"mic": "news_interrupt.mic.wav", "playback": "news_interrupt.tts.wav",
+       "onset": 2.35},
+      {"mic": "echo_only.mic.wav", "playback": "echo_only.tts.wav", "onset": null}
+    ]
+
+``onset`` is when the user starts talking, in seconds, or null for clips
+where only the assistant is heard. Usage::
+
+    python -m benchmarks.barge_in_benchmark --fixtures fixtures/barge_in
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.audio_capture import BLOCK_SECONDS
+from core.barge_in import SAMPLE_RATE, BargeInDetector
+from utils.audio_io import load_audio
+
+STOP_BUDGET_MS = 100.0
+
+
+def detect_clip(detector: BargeInDetector, mic: Any, playback: Optional[Any]) -> Optional[int]:
+    """Stream a clip through the detector in capture-sized blocks.
+
+    Returns the sample position at which the user was detected, or None.
+    """
+    detector.reset()
+    step = int(BLOCK_SECONDS * SAMPLE_RATE)
+    for offset in range(0, len(mic), step):
+        block = mic[offset:offset + step]
+        reference = None
+        if playback is not None:
+            reference = playback[offset:offset + step]
+            reference = np.pad(reference, (0, len(block) - len(reference)))
+        if detector.process(block, reference):
+            # The decision is made once the whole block has arrived
+            return min(offset + step, len(mic))
+    return None
+
+
+def run(fixtures: str, use_reference: bool = True,
+        noise_floor_db: Optional[float] = None) -> Dict[str, Any]:
+    """Run every fixture and summarize detection delays and false triggers."""
+    with open(os.path.join(fixtures, "manifest.json"), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    clips: List[Dict[str, Any]] = []
+    for entry in entries:
+        mic = load_audio(os.path.join(fixtures, entry["mic"]), SAMPLE_RATE)
+        playback = None
+        if use_reference and entry.get("playback"):
+            playback = load_audio(os.path.join(fixtures, entry["playback"]), SAMPLE_RATE)
+        # A fresh detector per clip, so results do not depend on clip order
+        detector = BargeInDetector(SAMPLE_RATE, noise_floor_db=noise_floor_db)
+        position = detect_clip(detector, mic, playback)
+        onset = entry.get("onset")
+        clip: Dict[str, Any] = {
+            "mic": entry["mic"],
+            "onset": onset,
+            "detected": None if position is None else round(position / SAMPLE_RATE, 3),
+            "delay_ms": None,
+            "outcome": "ok",
+        }
+        if onset is None:
+            if position is not None:
+                clip["outcome"] = "false_trigger"
+        elif position is None:
+            clip["outcome"] = "missed"
+        elif position < onset * SAMPLE_RATE:
+            clip["outcome"] = "early_trigger"
+        else:
+            clip["delay_ms"] = round((position / SAMPLE_RATE - onset) * 1000, 1)
+            if clip["delay_ms"] > STOP_BUDGET_MS:
+                clip["outcome"] = "slow"
+        clips.append(clip)
+
+    delays = [clip["delay_ms"] for clip in clips if clip["delay_ms"] is not None]
+    return {
+        "clips": clips,
+        "interruptions": sum(1 for clip in clips if clip["onset"] is not None),
+        "echo_only": sum(1 for clip in clips if clip["onset"] is None),
+        "missed": sum(1 for clip in clips if clip["outcome"] == "missed"),
+        "false_triggers": sum(
+            1 for clip in clips if clip["outcome"] in ("false_trigger", "early_trigger")
+        ),
+        "over_budget": sum(1 for clip in clips if clip["outcome"] == "slow"),
+        "delay_ms_p50": round(float(np.percentile(delays, 50)), 1) if delays else None,
+        "delay_ms_max": max(delays) if delays else None,
+    }
+
+
+def main():
+    """Run the benchmark and print a table, optionally writing JSON."""
+    parser = argparse.ArgumentParser(description="Barge-in detection benchmark")
+    parser.add_argument("--fixtures", required=True, help="Directory with manifest.json")
+    parser.add_argument("--no-reference", action="store_true",
+                        help="Ignore playback files, as when the engine speaks directly")
+    parser.add_argument("--noise-floor", type=float, help="Seed noise floor in dB")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    report = run(args.fixtures, not args.no_reference, args.noise_floor)
+    print(f"{report['interruptions']} interruption clips, {report['echo_only']} echo-only clips")
+    print(f"Missed: {report['missed']}, false triggers: {report['false_triggers']}, "
+          f"over {STOP_BUDGET_MS:.0f} ms: {report['over_budget']}")
+    print(f"Detection delay: p50 {report['delay_ms_p50']} ms, max {report['delay_ms_max']} ms")
+    for clip in report["clips"]:
+        print(f"  {clip['outcome']:13s} {clip['mic']}  onset={clip['onset']}  "
+              f"detected={clip['detected']}  delay={clip['delay_ms']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
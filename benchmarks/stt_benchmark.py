@@ -0,0 +1,153 @@
+"""Offline speech recognition benchmark over recorded command clips.
+
+Clips are replayed through ``SpeechToText.replay``, the same buffer and
+transcription path the microphone uses. Per clip it reports the delay from
+end of audio to final text, real-time factor, word error rate and detected
+language; the summary breaks WER and language accuracy down per language.
+
+The fixtures directory holds WAV clips and a ``manifest.json`` (see
+``utils.audio_io.load_manifest``). Usage::
+
+    python -m benchmarks.stt_benchmark --fixtures fixtures/stt --json stt.json
+    python -m benchmarks.stt_benchmark --fixtures fixtures/stt --baseline stt.json
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.speech_to_text import MAX_CAPTURE_SECONDS, SAMPLE_RATE, SpeechToText
+from utils.audio_io import load_manifest, load_wav
+from utils.logger import logger
+from utils.wer import edit_distance, normalize_transcript
+
+# Summary metrics where a larger value is a regression
+REGRESSION_KEYS = ("latency_ms_p50", "latency_ms_p95", "rtf_mean", "wer")
+
+
+def run_clip(stt: SpeechToText, clip: Dict[str, Any], realtime: bool) -> Dict[str, Any]:
+    """Replay one clip and score the transcript."""
+    audio = load_wav(clip["audio"], SAMPLE_RATE)
+    limit = MAX_CAPTURE_SECONDS * SAMPLE_RATE
+    if len(audio) > limit:
+        logger.warning("Truncating %s to %s seconds", clip["audio"], MAX_CAPTURE_SECONDS)
+        audio = audio[:limit]
+    duration = len(audio) / SAMPLE_RATE
+
+    text = stt.replay(audio, realtime=realtime)
+
+    reference = normalize_transcript(clip["text"])
+    errors = edit_distance(reference, normalize_transcript(text))
+    return {
+        "audio": clip["audio"],
+        "expected_language": clip["language"],
+        "detected_language": stt.last_language,
+        "reference": clip["text"],
+        "transcript": text,
+        "duration_s": round(duration, 3),
+        "latency_ms": round(stt.last_latency * 1000, 1) if stt.last_latency is not None else None,
+        "rtf": round(stt.last_compute / duration, 4) if duration else None,
+        "errors": errors,
+        "words": len(reference),
+        "wer": round(errors / max(1, len(reference)), 4),
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-clip results overall and per expected language."""
+    def aggregate(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        latencies = [row["latency_ms"] for row in rows if row["latency_ms"] is not None]
+        rtfs = [row["rtf"] for row in rows if row["rtf"] is not None]
+        labelled = [row for row in rows if row["expected_language"]]
+        return {
+            "clips": len(rows),
+            "latency_ms_p50": round(float(np.percentile(latencies, 50)), 1) if latencies else None,
+            "latency_ms_p95": round(float(np.percentile(latencies, 95)), 1) if latencies else None,
+            "rtf_mean": round(float(np.mean(rtfs)), 4) if rtfs else None,
+            "wer": round(sum(row["errors"] for row in rows)
+                         / max(1, sum(row["words"] for row in rows)), 4),
+            "language_accuracy": round(
+                sum(row["detected_language"] == row["expected_language"] for row in labelled)
+                / len(labelled), 4) if labelled else None,
+        }
+
+    languages = sorted({row["expected_language"] or "unknown" for row in results})
+    return {
+        "overall": aggregate(results),
+        "by_language": {
+            language: aggregate([row for row in results
+                                 if (row["expected_language"] or "unknown") == language])
+            for language in languages
+        },
+    }
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Return one line per overall metric that got worse than the baseline."""
+    lines = []
+    for key in REGRESSION_KEYS:
+        new, old = summary["overall"].get(key), baseline["overall"].get(key)
+        if new is not None and old is not None and new > old:
+            lines.append(f"{key}: {old} -> {new}")
+    return lines
+
+
+def run(fixtures: str, language: str, streaming: bool, realtime: bool,
+        model: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark every clip in the fixture manifest."""
+    clips = load_manifest(fixtures)
+    stt = SpeechToText(streaming=streaming,
+                       whisper_config={"model_size": model} if model else None)
+    stt.set_language(language)
+    # Warm up so model initialization does not land on the first clip
+    stt.replay(np.zeros(SAMPLE_RATE, dtype=np.float32), realtime=False)
+
+    results = [run_clip(stt, clip, realtime) for clip in clips]
+    return {
+        "config": {"whisper": stt.whisper_config, "language": language,
+                   "streaming": streaming, "realtime": realtime},
+        "summary": summarize(results),
+        "clips": results,
+    }
+
+
+def main():
+    """Run the benchmark, print a table and optionally write or compare JSON."""
+    parser = argparse.ArgumentParser(description="Offline speech-to-text benchmark")
+    parser.add_argument("--fixtures", required=True, help="Directory with manifest.json")
+    parser.add_argument("--language", default="auto", choices=["auto", "en", "hi"])
+    parser.add_argument("--batch", action="store_true",
+                        help="Transcribe each clip in one pass instead of streaming windows")
+    parser.add_argument("--fast", action="store_true",
+                        help="Deliver audio at once instead of at recording speed")
+    parser.add_argument("--model", help="Override the Whisper model size")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to check for regressions")
+    args = parser.parse_args()
+
+    report = run(args.fixtures, args.language, not args.batch, not args.fast, args.model)
+    print("latency ms  RTF     WER     lang      clip")
+    for row in report["clips"]:
+        print(f"{row['latency_ms'] or 0:10.0f}  {row['rtf'] or 0:.3f}  {row['wer']:6.1%}  "
+              f"{row['detected_language'] or '-':>2}/{row['expected_language'] or '-':<5}  "
+              f"{row['audio']}")
+    for language, data in report["summary"]["by_language"].items():
+        print(f"[{language}] {data}")
+    print(f"[overall] {report['summary']['overall']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report["summary"], json.load(f)["summary"])
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure the per-utterance cost of applying a TTS voice profile.
+
+Compares the old behavior, where every utterance set the rate and
+enumerated the installed voices to set the voice again, with
+``TextToSpeech._apply_profile``, which resolves the profile once and only
+sets properties that changed. pyttsx3 queues property changes until
+``runAndWait``, so each iteration includes one ``runAndWait`` with nothing
+to say. The pre-roll pause is reported separately; it is part of the
+profile, not overhead.
+
+Usage::
+
+    python -m benchmarks.tts_profile_benchmark --iterations 200
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from core.text_to_speech import TextToSpeech
+from core.voice_profiles import VOICE_PROFILES
+
+
+def legacy_apply(engine: Any, mode: str):
+    """Apply a voice mode the way every utterance used to."""
+    if mode == "jarvis":
+        engine.setProperty('rate', 153)
+        try:
+            voices = engine.getProperty('voices')
+            if voices:
+                engine.setProperty('voice', voices[0].id)
+        except (AttributeError, IndexError, RuntimeError):
+            pass
+    else:
+        engine.setProperty('rate', 180)
+
+
+def time_calls(engine: Any, apply: Callable[[], None], iterations: int) -> List[float]:
+    """Return the milliseconds each apply-and-flush iteration took."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        apply()
+        engine.runAndWait()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Return mean, median and p95 of a list of milliseconds."""
+    return {
+        "mean_ms": round(float(np.mean(timings)), 3),
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+    }
+
+
+def run(iterations: int, mode: str) -> Dict[str, Any]:
+    """Time the old and new profile application for one voice mode."""
+    # pylint: disable=protected-access
+    TextToSpeech._init_engine()
+    engine = TextToSpeech._engine
+    profile = VOICE_PROFILES[mode]
+
+    baseline = time_calls(engine, lambda: None, iterations)
+    before = time_calls(engine, lambda: legacy_apply(engine, mode), iterations)
+    resolve_started = time.perf_counter()
+    TextToSpeech._resolve_profile(profile)
+    resolve_ms = (time.perf_counter() - resolve_started) * 1000
+    after = time_calls(engine, lambda: TextToSpeech._apply_profile(profile), iterations)
+    driver = getattr(getattr(engine, "proxy", None), "_driver", None)
+
+    return {
+        "mode": mode,
+        "iterations": iterations,
+        "driver": type(driver).__module__ if driver is not None else None,
+        "empty_run": summarize(baseline),
+        "before": summarize(before),
+        "after": summarize(after),
+        "one_time_resolve_ms": round(resolve_ms, 3),
+        "pre_roll_s": profile.pre_roll,
+    }
+
+
+def main():
+    """Run the benchmark and print a table, optionally writing JSON."""
+    parser = argparse.ArgumentParser(description="TTS voice profile overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--mode", choices=sorted(VOICE_PROFILES), default="jarvis")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.mode)
+    print(f"Voice mode {report['mode']}, {report['iterations']} utterances "
+          f"(driver {report['driver']})")
+    print("                 mean ms    p50 ms    p95 ms")
+    for label in ("empty_run", "before", "after"):
+        row = report[label]
+        print(f"{label:14s} {row['mean_ms']:9.3f} {row['p50_ms']:9.3f} {row['p95_ms']:9.3f}")
+    print(f"One-time profile resolution: {report['one_time_resolve_ms']} ms")
+    print(f"Pre-roll pause per utterance: {report['pre_roll_s']} s (unchanged)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
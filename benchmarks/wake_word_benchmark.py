@@ -0,0 +1,141 @@
+"""Measure wake word false accepts, false rejects and CPU cost on WAV fixtures.
+
+Fixtures are 16-bit PCM WAV files laid out as::
+
+    <fixtures>/positive/*.wav   clips that contain the wake word once
+    <fixtures>/negative/*.wav   speech, music or room noise without it
+
+Usage::
+
+    python -m benchmarks.wake_word_benchmark --fixtures fixtures/wake_word
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from core.wake_word_spotter import (
+    DEFAULT_THRESHOLD, SAMPLE_RATE, TEMPLATES_PATH, WakeWordSpotter
+)
+from utils.audio_io import load_wav
+
+DEFAULT_THRESHOLDS = (0.20, 0.25, 0.30, 0.35, 0.40)
+
+
+def score_clip(spotter: WakeWordSpotter, audio: Any) -> Tuple[List[Tuple[int, float]], float]:
+    """Stream a clip through the spotter one check at a time.
+
+    Returns the (sample position, score) of every check and the wall-clock
+    seconds spent per check.
+    """
+    spotter.reset()
+    scores = []
+    step = spotter.check_samples
+    started = time.perf_counter()
+    for offset in range(0, len(audio) - step + 1, step):
+        spotter.process(audio[offset:offset + step])
+        scores.append((offset + step, spotter.last_score))
+    elapsed = time.perf_counter() - started
+    return scores, elapsed / max(1, len(scores))
+
+
+def count_detections(scores: List[Tuple[int, float]], threshold: float,
+                     refractory_samples: int) -> int:
+    """Count detections a spotter with ``threshold`` would have fired."""
+    detections = 0
+    last = -refractory_samples
+    for position, score in scores:
+        if score < threshold and position - last >= refractory_samples:
+            detections += 1
+            last = position
+    return detections
+
+
+def run(fixtures: str, templates: str, thresholds: List[float]) -> Dict[str, Any]:
+    """Score every fixture and summarize error rates per threshold."""
+    # A threshold below any score keeps the spotter from resetting mid-clip,
+    # so one pass yields the raw scores for every threshold
+    spotter = WakeWordSpotter.load(templates, threshold=float("-inf"))
+    if spotter is None:
+        raise SystemExit(f"No wake word templates at {templates}")
+
+    clips: Dict[str, List[Tuple[str, List[Tuple[int, float]], float]]] = {}
+    check_ms: List[float] = []
+    for label in ("positive", "negative"):
+        clips[label] = []
+        for path in sorted(glob.glob(os.path.join(fixtures, label, "*.wav"))):
+            audio = load_wav(path, SAMPLE_RATE)
+            scores, per_check = score_clip(spotter, audio)
+            clips[label].append((path, scores, len(audio) / SAMPLE_RATE))
+            check_ms.append(per_check * 1000)
+    if not clips["positive"] and not clips["negative"]:
+        raise SystemExit(f"No fixtures under {fixtures}/positive or {fixtures}/negative")
+
+    stats = spotter.get_stats()
+    negative_hours = sum(seconds for _, _, seconds in clips["negative"]) / 3600
+    results = []
+    for threshold in thresholds:
+        rejected = sum(
+            1 for _, scores, _ in clips["positive"]
+            if count_detections(scores, threshold, spotter.refractory_samples) == 0
+        )
+        false_accepts = sum(
+            count_detections(scores, threshold, spotter.refractory_samples)
+            for _, scores, _ in clips["negative"]
+        )
+        results.append({
+            "threshold": threshold,
+            "false_reject_rate": rejected / max(1, len(clips["positive"])),
+            "false_accepts": false_accepts,
+            "false_accepts_per_hour": false_accepts / negative_hours if negative_hours else 0.0,
+        })
+
+    return {
+        "positives": len(clips["positive"]),
+        "negatives": len(clips["negative"]),
+        "negative_hours": round(negative_hours, 3),
+        "cpu_percent": round(stats["cpu_percent"], 3),
+        "checks": stats["checks"],
+        "matched_checks": stats["matched"],
+        "check_ms_p50": round(float(np.percentile(check_ms, 50)), 3) if check_ms else 0.0,
+        "check_ms_max": round(max(check_ms), 3) if check_ms else 0.0,
+        "thresholds": results,
+        "best_scores": {
+            path: round(min((s for _, s in scores), default=float("inf")), 4)
+            for label in ("positive", "negative") for path, scores, _ in clips[label]
+        },
+    }
+
+
+def main():
+    """Run the benchmark and print a table, optionally writing JSON."""
+    parser = argparse.ArgumentParser(description="Wake word FA/FR and CPU benchmark")
+    parser.add_argument("--fixtures", required=True, help="Directory with positive/ and negative/")
+    parser.add_argument("--templates", default=TEMPLATES_PATH)
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=sorted(set(DEFAULT_THRESHOLDS) | {DEFAULT_THRESHOLD}))
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    report = run(args.fixtures, args.templates, args.thresholds)
+    print(f"{report['positives']} positive clips, {report['negatives']} negative clips "
+          f"({report['negative_hours']} h)")
+    print(f"CPU: {report['cpu_percent']}% of one core, "
+          f"{report['check_ms_p50']} ms per check (max {report['check_ms_max']} ms), "
+          f"{report['matched_checks']}/{report['checks']} checks matched")
+    print("threshold  FR rate  FA  FA/hour")
+    for row in report["thresholds"]:
+        print(f"{row['threshold']:9.2f}  {row['false_reject_rate']:7.1%}  "
+              f"{row['false_accepts']:2d}  {row['false_accepts_per_hour']:7.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ ASSISTANT_NAME = "Jarvis"
 WAKE_WORD = "jarvis"
 DEFAULT_LANGUAGE = "en"
 LOG_LEVEL = "INFO"
+CONTEXT_TOKEN_BUDGET = 500  # Max estimated tokens of conversation history per prompt
+
+# LLM backend: "gemini" or "fake" (offline, scripted responses for benchmarking)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
 
 def validate_config():
     """Validate that required configuration is set."""
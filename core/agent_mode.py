@@ -1,6 +1,6 @@
 """Agent mode for autonomous task execution."""
 from typing import Any
-from core.gemini_llm import GeminiLLM
+from core.gemini_llm import get_llm
 from core.self_coder import SelfCoder
 from skills.web_search import search_web
 from skills.system_control import open_app
@@ -9,7 +9,7 @@ from skills.system_control import open_app
 class AgentMode:
     """Autonomous agent for multi-step task execution."""
     def __init__(self, tts: Any, memory: Any, persistent_memory: Any):
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
         self.self_coder = SelfCoder()
         self.tts = tts
         self.memory = memory
@@ -43,7 +43,9 @@ Respond with one of:
 - OPEN: <app>
 - COMPLETE: <summary>"""
 
-                decision = self.llm.generate_reply(decision_prompt, "")
+                decision = self.llm.generate_reply(
+                    decision_prompt, "", call_site="agent_decision"
+                )
                 reasoning_trace.append(f"Step {step_count} Decision: {decision}")
 
                 step_text = decision.split(':', 1)[0] if ':' in decision else decision
@@ -1,14 +1,17 @@
 """Main Jarvis assistant."""
 
+import asyncio
 import json
 import os
 import re
 import threading
 import time
 import tkinter as tk
-from typing import List
+from typing import Iterator, List, Optional
 
-from core.gemini_llm import GeminiLLM
+from core.barge_in import BargeInMonitor
+from core.fast_router import FastPathRouter
+from core.gemini_llm import get_llm
 from core.intent_classifier import IntentClassifier
 from core.life_automation import LifeAutomation
 from core.life_os import LifeOS
@@ -19,24 +22,35 @@ from core.self_improver import SelfImprover
 from core.skill_learner import SkillLearner
 from core.skill_manager import SkillManager
 from core.speech_to_text import SpeechToText
-from core.text_to_speech import TextToSpeech
+from core.text_to_speech import PRIORITY_ALARM, PRIORITY_PROACTIVE, TextToSpeech
 from core.wake_word_detector import WakeWordDetector
 from hud import JarvisOverlay
+from utils.context_builder import ContextBuilder
 from utils.file_indexer import FileIndexer
 from utils.goals import GoalsManager
 from utils.memory import Memory
 from utils.persistent_memory import PersistentMemory
 from utils.routines import RoutinesManager
 
+# Response cache lifetimes (seconds) for deterministic LLM prompts
+ROUTING_CACHE_TTL = 24 * 60 * 60
+# Deadline (seconds) for a background proactive suggestion
+PROACTIVE_TIMEOUT = 30
+# Proactive tips not spoken within this many seconds are dropped
+PROACTIVE_SPEECH_MAX_AGE = 120
+# Let the user interrupt spoken replies by talking over them
+BARGE_IN_ENABLED = True
+
 class JarvisAssistant:
     """Main Jarvis assistant class that integrates all components."""
     def __init__(self):
         self.stt = SpeechToText()
         self.stt.set_language("auto")  # Enable auto language detection
         self.tts = TextToSpeech()
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
         self.memory = Memory()
         self.persistent_memory = PersistentMemory()
+        self.context_builder = ContextBuilder(self.persistent_memory)
         self.wake_detector = WakeWordDetector("jarvis")
         self.intent_classifier = IntentClassifier()
         self.personality = PersonalityManager()
@@ -50,7 +64,10 @@ class JarvisAssistant:
         self.goals_manager = GoalsManager()
         self.routines_manager = RoutinesManager()
         self.skill_manager = SkillManager()
+        self.fast_router = FastPathRouter(self.skill_manager)
         self.sleeping = False
+        self.user_active = threading.Event()  # Set while a voice command is handled
+        self.barge_in = BARGE_IN_ENABLED
         self.last_command = None
         self.overlay = None
         self._start_routine_checker()
@@ -83,130 +100,189 @@ class JarvisAssistant:
     def process_text_command(self, command: str) -> str:
         """Process text command and return response."""
         try:
-            # Check for sleep commands
-            if self.wake_detector.is_sleep_command(command):
-                if self.overlay:
-                    self.overlay.toggle_sleep()
-                return "Going into sleep mode. Say 'Jarvis' to wake me up."
-
-            # Check for wake commands when sleeping
-            if self.sleeping and self.wake_detector.is_wake_word(command):
-                self.sleeping = False
-                if self.overlay:
-                    self.overlay.wake_up()
-                return "I'm back online. How can I help you?"
-
-            # Process normal commands
-            if not self.sleeping:
-                return self._process_command(command)
-            else:
-                return "I'm sleeping. Say 'Jarvis' to wake me up."
+            control_response = self._handle_control_command(command)
+            if control_response is not None:
+                return control_response
+            return self._process_command(command)
 
         except (ValueError, TypeError, json.JSONDecodeError) as e:
             return f"Error processing command: {str(e)}"
 
-    def _process_command(self, command: str) -> str:
-        """Process a command and return response."""
+    def stream_text_command(self, command: str,
+                            spoken_language: Optional[str] = None) -> Iterator[str]:
+        """Process a command, yielding the response as it is generated.
+
+        Chat replies are streamed from the LLM chunk by chunk; skill and
+        control responses are yielded whole. When the personality mode
+        styles text, chat replies are also yielded whole, once styled, so
+        what is spoken and shown matches what is remembered.
+
+        Args:
+            command: The user's command.
+            spoken_language: Language speech recognition decided the command
+                was spoken in, if it came from the microphone.
+        """
         try:
-            # Detect language and set context
-            is_hindi = self._is_hindi_text(command)
-            lang_context = (
-                "Respond in Hindi (Devanagari script)" if is_hindi 
-                else "Respond in English"
-            )
+            control_response = self._handle_control_command(command)
+            if control_response is not None:
+                yield control_response
+                return
 
-            # Get all skill descriptions
-            skill_descriptions = self.skill_manager.get_all_skills_descriptions()
-
-            # Formulate prompt for LLM
-            prompt = f"""
-            User command: "{command}"
-            Language instruction: {lang_context}
-
-            Available skills:
-            {skill_descriptions}
-
-            Based on the user's command, which skill should be executed?
-            If the command requires arguments, extract them.
-            Respond with the skill name and arguments in JSON format, like this:
-            {{
-                "skill_name": "skill_name",
-                "args": ["arg1", "arg2"],
-                "kwargs": {{"key1": "value1"}}
-            }}
-            If no skill matches, respond with:
-            {{
-                "skill_name": "chat",
-                "args": [],
-                "kwargs": {{}}
-            }}
-            """
-
-            llm_response = self.llm.generate_reply(prompt, "")
+            hindi = self._is_hindi(command, spoken_language)
+            lang_context = self._get_lang_context(hindi)
             try:
-                parsed_response = json.loads(llm_response)
-            except json.JSONDecodeError:
-                # If LLM doesn't return valid JSON, fall back to chat
-                parsed_response = {"skill_name": "chat", "args": [], "kwargs": {}}
-
-            skill_name = parsed_response.get("skill_name")
-            args = parsed_response.get("args", [])
-            kwargs = parsed_response.get("kwargs", {})
-
-            if skill_name and skill_name != "chat":
-                response = self.skill_manager.execute_skill(skill_name, *args, **kwargs)
-            else:
-                context = self._get_combined_context()
-                chat_prompt = f"{lang_context}. User: {command}"
-                response = self.llm.generate_reply(chat_prompt, context)
+                response = self._route_to_skill(command, lang_context, hindi)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Error processing command: {e}")
+                response = None
 
+            if response is not None:
+                yield self._remember(command, response)
+                return
+
+            context = self._get_combined_context()
+            chat_prompt = f"{lang_context}. User: {command}"
+            stream = self.llm.generate_reply_stream(chat_prompt, context, call_site="chat")
+            if self.personality.styles_text:
+                yield self._remember(command, "".join(stream))
+                return
+            chunks: List[str] = []
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            self._remember(command, "".join(chunks))
+
+        except (ValueError, TypeError, json.JSONDecodeError) as e:
+            yield f"Error processing command: {str(e)}"
+
+    def _handle_control_command(self, command: str) -> Optional[str]:
+        """Handle sleep and wake commands, or return None for normal commands."""
+        # Check for sleep commands
+        if self.wake_detector.is_sleep_command(command):
+            if self.overlay:
+                self.overlay.toggle_sleep()
+            return "Going into sleep mode. Say 'Jarvis' to wake me up."
+
+        # Check for wake commands when sleeping
+        if self.sleeping and self.wake_detector.is_wake_word(command):
+            self.sleeping = False
+            if self.overlay:
+                self.overlay.wake_up()
+            return "I'm back online. How can I help you?"
+
+        if self.sleeping:
+            return "I'm sleeping. Say 'Jarvis' to wake me up."
+
+        return None
+
+    def _process_command(self, command: str, spoken_language: Optional[str] = None) -> str:
+        """Process a command and return response."""
+        hindi = self._is_hindi(command, spoken_language)
+        lang_context = self._get_lang_context(hindi)
+        try:
+            response = self._route_to_skill(command, lang_context, hindi)
         except Exception as e:  # pylint: disable=broad-except
             print(f"Error processing command: {e}")
+            response = None
+
+        if response is None:
             context = self._get_combined_context()
-            is_hindi = self._is_hindi_text(command)
-            lang_context = (
-                "Respond in Hindi (Devanagari script)" if is_hindi 
-                else "Respond in English"
-            )
             chat_prompt = f"{lang_context}. User: {command}"
-            response = self.llm.generate_reply(chat_prompt, context)
+            response = self.llm.generate_reply(chat_prompt, context, call_site="chat")
+
+        return self._remember(command, response)
 
+    def _remember(self, command: str, response: str) -> str:
+        """Style the response and save the interaction to memory."""
         # Apply personality style to response
         response = self.personality.apply_style(response)
 
         # Save to memory
         self.memory.add(command, response)
         self.persistent_memory.save(command, response)
+        self.context_builder.add(command, response)
 
         return response
 
+    def _is_hindi(self, command: str, spoken_language: Optional[str] = None) -> bool:
+        """Check if a command should be handled in Hindi.
+
+        Speech recognition's language decision counts as well as the script,
+        so Hindi transcribed in Latin or Urdu script is still answered in Hindi.
+        """
+        return spoken_language == "hi" or self._is_hindi_text(command)
+
+    def _get_lang_context(self, hindi: bool) -> str:
+        """Return the response-language instruction for a command."""
+        if hindi:
+            return "Respond in Hindi (Devanagari script)"
+        return "Respond in English"
+
+    def _route_to_skill(self, command: str, lang_context: str, hindi: bool) -> Optional[str]:
+        """Run the command on a skill, or return None if it is a chat message."""
+        # Confident keyword matches skip the LLM routing round-trip
+        if not hindi:
+            response = self.fast_router.route(command)
+            if response is not None:
+                return response
+        return self._route_with_llm(command, lang_context)
+
+    def _route_with_llm(self, command: str, lang_context: str) -> Optional[str]:
+        """Ask the LLM which skill handles the command, or None for chat."""
+        # Get all skill descriptions
+        skill_descriptions = self.skill_manager.get_all_skills_descriptions()
+
+        # Formulate prompt for LLM
+        prompt = f"""
+        User command: "{command}"
+        Language instruction: {lang_context}
+
+        Available skills:
+        {skill_descriptions}
+
+        Based on the user's command, which skill should be executed?
+        If the command requires arguments, extract them.
+        Respond with the skill name and arguments in JSON format, like this:
+        {{
+            "skill_name": "skill_name",
+            "args": ["arg1", "arg2"],
+            "kwargs": {{"key1": "value1"}}
+        }}
+        If no skill matches, respond with:
+        {{
+            "skill_name": "chat",
+            "args": [],
+            "kwargs": {{}}
+        }}
+        """
+
+        route_start = time.perf_counter()
+        llm_response = self.llm.generate_reply(
+            prompt, "", cache_ttl=ROUTING_CACHE_TTL, call_site="routing"
+        )
+        self.fast_router.record_llm_route(time.perf_counter() - route_start)
+        try:
+            parsed_response = json.loads(llm_response)
+        except json.JSONDecodeError:
+            # If LLM doesn't return valid JSON, fall back to chat
+            parsed_response = {"skill_name": "chat", "args": [], "kwargs": {}}
+
+        skill_name = parsed_response.get("skill_name")
+        args = parsed_response.get("args", [])
+        kwargs = parsed_response.get("kwargs", {})
+
+        if skill_name and skill_name != "chat":
+            return self.skill_manager.execute_skill(skill_name, *args, **kwargs)
+        return None
+
     def _is_hindi_text(self, text: str) -> bool:
         """Check if text contains Hindi characters."""
         hindi_chars = re.findall(r'[ऀ-ॿ]', text)
         return len(hindi_chars) > 0
 
     def _get_combined_context(self) -> str:
-        """Get combined context from persistent and short-term memory."""
-        # Get persistent memory
-        persistent = self.persistent_memory.fetch_last(5)
-        persistent_context = "\n".join(
-            [f"User: {user}\nJarvis: {jarvis}" for user, jarvis in persistent]
-        )
-
-        # Get short-term memory
-        short_term_context = self.memory.get_context()
-
-        # Combine contexts
-        combined = (
-            f"{persistent_context}\n{short_term_context}" 
-            if persistent_context else short_term_context
-        )
-
-        # Trim to 2000 characters from oldest side
-        if len(combined) > 2000:
-            combined = combined[-2000:]
-
-        return combined
+        """Get recent conversation turns that fit in the context token budget."""
+        return self.context_builder.build()
 
     def _run_diagnostics(self):
         """Run system diagnostics and report status."""
@@ -214,14 +290,17 @@ class JarvisAssistant:
 
         # Test TTS
         try:
-            self.tts.speak("Testing voice system.")
+            self.tts.speak("Testing voice system.").result()
         except Exception as e:  # Keep broad for diagnostics, but log
             print(f"TTS test failed: {e}")
             failed_systems.append("voice system")
 
         # Test Gemini API
         try:
-            response = self.llm.generate_reply("Reply with: Gemini OK", "")
+            # Never cached: a health check must reach the API every time
+            response = self.llm.generate_reply(
+                "Reply with: Gemini OK", "", cache_ttl=None, call_site="diagnostic"
+            )
             if "OK" not in response:
                 failed_systems.append("Gemini API")
         except Exception:  # pylint: disable=broad-except
@@ -245,6 +324,9 @@ class JarvisAssistant:
             print(f"Intent classifier test failed: {e}")
             failed_systems.append("intent classifier")
 
+        # How many LLM round-trips local routing saved so far
+        print(self.fast_router.summary())
+
         # Report results
         if failed_systems:
             self.tts.speak(
@@ -263,7 +345,7 @@ class JarvisAssistant:
                 try:
                     due_tasks = self.routines_manager.check_due_tasks()
                     for task in due_tasks:
-                        self.tts.speak(f"Routine reminder: {task}")
+                        self.tts.speak(f"Routine reminder: {task}", PRIORITY_ALARM)
                 except Exception:  # pylint: disable=broad-except
                     pass
                 time.sleep(60)  # Check every 60 seconds
@@ -281,9 +363,11 @@ class JarvisAssistant:
                 try:
                     time.sleep(1800)  # Wait 30 minutes
                     if not self.sleeping:  # Only suggest when awake
-                        suggestion = self.life_automation.proactive_assist()
+                        suggestion = asyncio.run(self._get_proactive_suggestion())
                         if suggestion:
-                            self.tts.speak(suggestion)
+                            self.tts.speak(
+                                suggestion, PRIORITY_PROACTIVE, max_age=PROACTIVE_SPEECH_MAX_AGE
+                            )
                 except Exception:  # pylint: disable=broad-except
                     pass
 
@@ -292,6 +376,20 @@ class JarvisAssistant:
         )
         proactive_thread.start()
 
+    async def _get_proactive_suggestion(self) -> str:
+        """Fetch a proactive suggestion, dropping it if the user starts talking."""
+        task = asyncio.create_task(
+            self.life_automation.proactive_assist_async(timeout=PROACTIVE_TIMEOUT)
+        )
+        while not task.done():
+            if self.user_active.is_set():
+                task.cancel()
+                return ""
+            await asyncio.wait({task}, timeout=0.1)
+        if self.user_active.is_set():
+            return ""
+        return task.result()
+
     def run(self):
         """Main assistant loop with voice and UI support."""
         print("Jarvis is listening...")
@@ -308,6 +406,46 @@ class JarvisAssistant:
                 time.sleep(1)
         except KeyboardInterrupt:
             print("\nShutting down Jarvis...")
+            print(self.fast_router.summary())
+
+    def _respond_by_voice(self, command: str) -> str:
+        """Speak the reply to a voice command.
+
+        With barge-in enabled and speech played from PCM (sounddevice
+        installed), the microphone stays open while the reply is spoken. If
+        the user talks over it, speech stops and what they said is
+        transcribed and returned as the next command.
+
+        Returns:
+            str: The command the user interrupted with, or "" if none.
+        """
+        monitor = None
+        if self.barge_in and self.tts.supports_barge_in:
+            monitor = BargeInMonitor(self.tts, noise_floor_db=self.stt.endpointer.noise_floor_db)
+            monitor.start()
+        try:
+            response = self.tts.speak_stream(
+                self.stream_text_command(command, self.stt.last_language),
+                started_at=time.perf_counter()
+            )
+        except BaseException:
+            if monitor is not None:
+                monitor.close()
+            raise
+        interrupted = monitor is not None and monitor.triggered.is_set()
+        if monitor is not None and not interrupted:
+            monitor.close()
+        if self.tts.last_first_audio_latency is not None:
+            print(f"Time to first audio: {self.tts.last_first_audio_latency * 1000:.0f} ms")
+
+        # Update UI
+        if self.overlay:
+            self.overlay.add_message("You (Voice)", command)
+            self.overlay.add_message("JARVIS", response)
+
+        if not interrupted:
+            return ""
+        return self.stt.listen(monitor.source())
 
     def _voice_loop(self):
         """Voice recognition loop."""
@@ -324,31 +462,28 @@ class JarvisAssistant:
 
                         if self.overlay:
                             self.overlay.set_listening(True)
+                        self.user_active.set()
+                        self.tts.cancel(PRIORITY_PROACTIVE)  # Tips would talk over the user
 
-                        self.tts.speak("Yes, how can I help you?")
+                        self.tts.speak("Yes, how can I help you?").result()
 
                         command = self.stt.listen()
-                        if command:
+                        while command:
                             # Check for wake word
                             if self.wake_detector.is_wake_word(command):
                                 if self.overlay and self.overlay.is_sleeping:
                                     self.overlay.wake_up()
                                     self.tts.speak(
                                         "I'm back online. How can I help you?"
-                                    )
-                                    continue
-
-                            # Process command
-                            response = self.process_text_command(command)
-                            self.tts.speak(response)
+                                    ).result()
+                                    break
 
-                            # Update UI
-                            if self.overlay:
-                                self.overlay.add_message("You (Voice)", command)
-                                self.overlay.add_message("JARVIS", response)
+                            # Process command, speaking the reply as it streams in
+                            command = self._respond_by_voice(command)
 
                         if self.overlay:
                             self.overlay.set_listening(False)
+                        self.user_active.clear()
 
                 time.sleep(0.1)  # Small delay to prevent high CPU usage
 
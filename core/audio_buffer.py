@@ -0,0 +1,78 @@
+"""Preallocated ring buffer for audio capture."""
+
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer written in place by audio callbacks.
+
+    Positions are absolute sample indexes counted from the last ``reset``.
+    Reads of a range that does not wrap around the end of the storage return
+    a zero-copy view; only wrapped ranges are copied.
+    """
+
+    def __init__(self, capacity: int, dtype: Any = np.float32):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget all samples without releasing the storage."""
+        with self._lock:
+            self._written = 0
+
+    @property
+    def total_written(self) -> int:
+        """Number of samples written since the last reset."""
+        return self._written
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    def write(self, block: Any):
+        """Copy a block of samples into the buffer, overwriting the oldest."""
+        samples = np.asarray(block).reshape(-1)
+        # Samples that would be overwritten within this write still advance the position
+        skipped = max(0, len(samples) - self.capacity)
+        samples = samples[skipped:]
+        count = len(samples)
+        with self._lock:
+            self._written += skipped
+            start = self._written % self.capacity
+            first = min(count, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            if first < count:
+                self._data[:count - first] = samples[first:]
+            self._written += count
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> Any:
+        """Return samples ``[start, end)`` by absolute position.
+
+        Positions older than ``capacity`` samples have been overwritten and
+        are clamped to the oldest sample still held.
+        """
+        written = self._written
+        end = written if end is None else min(end, written)
+        start = max(start, written - self.capacity, 0)
+        if end <= start:
+            return self._data[:0]
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self._data[first:last]
+        return np.concatenate((self._data[first:], self._data[:last - self.capacity]))
+
+    def latest(self, count: int) -> Any:
+        """Return the most recent ``count`` samples."""
+        return self.view(self._written - count)
+
+    def rms(self, count: int) -> float:
+        """Return the RMS level of the most recent ``count`` samples."""
+        samples = self.latest(count)
+        if len(samples) == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
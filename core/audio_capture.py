@@ -0,0 +1,203 @@
+"""Shared microphone capture.
+
+One ``AudioCaptureService`` owns the only input stream and keeps it open.
+Components that need microphone audio (speech recognition, wake-word
+spotting, voice authentication) subscribe instead of opening their own
+stream. Each subscription gets its own ring buffer at the sample rate it
+asked for, so subscribing usually costs no device open/close and adds no
+latency.
+
+The stream runs at the highest rate any subscriber asked for (at least
+``SAMPLE_RATE``), so audio is only ever downsampled for a subscriber,
+never upsampled from a lower capture rate. Subscribing at a higher rate
+reopens the stream once.
+"""
+
+import functools
+import threading
+from typing import Any, List, Optional
+
+import numpy as np
+
+from core.audio_buffer import AudioRingBuffer
+from utils.audio_io import StreamResampler
+from utils.logger import logger
+
+SAMPLE_RATE = 16000
+BLOCK_SECONDS = 0.03
+
+
+class CaptureSubscription:
+    """A subscriber's view of the shared capture stream."""
+
+    def __init__(self, service: "AudioCaptureService", samplerate: int, seconds: float):
+        self.service = service
+        self.samplerate = samplerate
+        self.buffer = AudioRingBuffer(int(seconds * samplerate))
+        self._cursor = 0  # Absolute position of the next sample ``read`` returns
+        self._condition = threading.Condition()
+        self._resampler: Optional[StreamResampler] = None
+
+    def _push(self, block: Any, samplerate: int):
+        """Append a block captured at ``samplerate``, resampling it if needed (audio thread)."""
+        if samplerate != self.samplerate:
+            if self._resampler is None or self._resampler.orig_rate != samplerate:
+                # New or restarted stream: start from a clean filter history
+                self._resampler = StreamResampler(samplerate, self.samplerate)
+            block = self._resampler.process(block)
+        with self._condition:
+            self.buffer.write(block)
+            self._condition.notify_all()
+
+    def read(self, timeout: float = 0.5) -> Any:
+        """Return the samples captured since the last read.
+
+        Waits up to ``timeout`` seconds for new audio and returns an empty
+        array if none arrived. Audio older than the ring buffer is dropped.
+        """
+        with self._condition:
+            if self.buffer.total_written <= self._cursor:
+                self._condition.wait(timeout)
+            end = self.buffer.total_written
+            samples = self.buffer.view(self._cursor, end).copy()
+            self._cursor = end
+        return samples
+
+    def drain(self):
+        """Skip everything captured so far."""
+        with self._condition:
+            self._cursor = self.buffer.total_written
+
+    def record(self, seconds: float) -> Any:
+        """Block until ``seconds`` of new audio have been captured and return it."""
+        self.drain()
+        wanted = int(seconds * self.samplerate)
+        chunks: List[Any] = []
+        collected = 0
+        while collected < wanted:
+            block = self.read(timeout=1.0)
+            if len(block) == 0 and not self.service.running:
+                raise RuntimeError("Audio capture stopped while recording")
+            chunks.append(block)
+            collected += len(block)
+        return np.concatenate(chunks)[:wanted]
+
+    def close(self):
+        """Stop receiving audio."""
+        self.service.unsubscribe(self)
+
+    def __enter__(self) -> "CaptureSubscription":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+
+class AudioCaptureService:
+    """Owns the single microphone stream and fans blocks out to subscribers."""
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, device: Any = None):
+        """Create a service.
+
+        Args:
+            samplerate: Lowest rate to capture at; subscribers asking for a
+                higher rate raise the capture rate while they are subscribed.
+            device: Input device, as accepted by sounddevice.
+        """
+        self.min_samplerate = samplerate
+        self.samplerate = samplerate  # Rate the stream runs at
+        self.device = device
+        self._subscriptions: List[CaptureSubscription] = []
+        self._lock = threading.Lock()
+        self._stream: Any = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the input stream is open."""
+        return self._stream is not None
+
+    def _callback(self, samplerate: int, indata: Any, _frames: Any, _time_info: Any,
+                  status: Any) -> None:
+        if status:
+            logger.warning("Sounddevice status: %s", status)
+        block = indata[:, 0]
+        for subscription in self._subscriptions:
+            subscription._push(block, samplerate)  # pylint: disable=protected-access
+
+    def _required_samplerate(self) -> int:
+        return max([self.min_samplerate] + [s.samplerate for s in self._subscriptions])
+
+    def _open(self):
+        """Open the input stream at the required rate (lock held)."""
+        import sounddevice as sd  # type: ignore  # pylint: disable=import-outside-toplevel
+
+        self.samplerate = self._required_samplerate()
+        self._stream = sd.InputStream(
+            samplerate=self.samplerate, channels=1, dtype="float32", device=self.device,
+            blocksize=int(BLOCK_SECONDS * self.samplerate),
+            callback=functools.partial(self._callback, self.samplerate)
+        )
+        self._stream.start()
+        logger.info("Audio capture started at %s Hz", self.samplerate)
+
+    def _close(self):
+        """Close the input stream (lock held)."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _update_samplerate(self):
+        """Reopen a running stream if the subscribers now need another rate (lock held).
+
+        Subscribers miss the few milliseconds the device takes to reopen.
+        """
+        if self._stream is not None and self._required_samplerate() != self.samplerate:
+            self._close()
+            self._open()
+
+    def start(self):
+        """Open the input stream if it is not already running."""
+        with self._lock:
+            if self._stream is None:
+                self._open()
+
+    def stop(self):
+        """Close the input stream."""
+        with self._lock:
+            self._close()
+
+    def subscribe(self, samplerate: Optional[int] = None,
+                  seconds: float = 12.0) -> CaptureSubscription:
+        """Start receiving audio, opening the stream on first use.
+
+        Args:
+            samplerate: Rate the subscriber wants; defaults to ``min_samplerate``.
+            seconds: Audio the subscriber's ring buffer holds between reads.
+        """
+        subscription = CaptureSubscription(self, samplerate or self.min_samplerate, seconds)
+        with self._lock:
+            # Replace rather than mutate so the audio thread can iterate safely
+            self._subscriptions = self._subscriptions + [subscription]
+            self._update_samplerate()
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription: CaptureSubscription):
+        """Stop delivering audio to a subscription. The stream stays open."""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+            self._update_samplerate()
+
+
+_capture_service: Optional[AudioCaptureService] = None
+_capture_service_lock = threading.Lock()
+
+
+def get_capture_service() -> AudioCaptureService:
+    """Return the process-wide capture service, creating it on first use."""
+    global _capture_service  # pylint: disable=global-statement
+    with _capture_service_lock:
+        if _capture_service is None:
+            _capture_service = AudioCaptureService()
+        return _capture_service
@@ -0,0 +1,139 @@
+"""Audio sources that SpeechToText can capture from.
+
+Every source yields mono float32 blocks at ``SAMPLE_RATE``. Live sources
+(microphone, stdin) run until the speaker goes quiet; finite sources (files,
+arrays) are read to the end.
+"""
+
+import abc
+import sys
+import time
+from typing import Any, BinaryIO, Optional
+
+import numpy as np
+
+from core.audio_capture import get_capture_service
+from utils.audio_io import load_audio, resample
+
+SAMPLE_RATE = 16000
+BLOCK_SECONDS = 0.03
+
+
+class AudioSource(abc.ABC):
+    """Base class for a stream of mono float32 audio blocks."""
+
+    live = False  # Whether capture should stop on silence rather than at the end
+
+    def __init__(self, samplerate: int = SAMPLE_RATE):
+        self.samplerate = samplerate
+
+    def open(self):
+        """Start delivering audio."""
+
+    def close(self):
+        """Release any device or file handle."""
+
+    @abc.abstractmethod
+    def read(self, timeout: float = 0.5) -> Optional[Any]:
+        """Return the next block, an empty block if none arrived within
+        ``timeout``, or None once the source is exhausted."""
+
+    def __enter__(self) -> "AudioSource":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+
+class MicrophoneSource(AudioSource):
+    """Microphone audio tapped from the shared capture service."""
+
+    live = True
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, subscription: Any = None,
+                 prefix: Optional[Any] = None):
+        """Create a microphone source.
+
+        Args:
+            samplerate: Rate to capture at.
+            subscription: An open capture subscription to take over instead
+                of subscribing on ``open``; it is closed with the source.
+            prefix: Samples already captured, returned before live audio.
+        """
+        super().__init__(samplerate)
+        self._subscription: Any = subscription
+        self._prefix = prefix
+
+    def open(self):
+        if self._subscription is None:
+            self._subscription = get_capture_service().subscribe(self.samplerate)
+
+    def close(self):
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+
+    def read(self, timeout: float = 0.5) -> Optional[Any]:
+        if self._prefix is not None:
+            prefix, self._prefix = self._prefix, None
+            return prefix
+        return self._subscription.read(timeout)
+
+
+class ArraySource(AudioSource):
+    """In-memory samples, optionally delivered at recording speed."""
+
+    def __init__(self, samples: Any, samplerate: int = SAMPLE_RATE, realtime: bool = False):
+        super().__init__(SAMPLE_RATE)
+        self.samples = resample(np.asarray(samples, dtype=np.float32).reshape(-1),
+                                samplerate, SAMPLE_RATE)
+        self.realtime = realtime
+        self._position = 0
+        self._started = 0.0
+
+    def open(self):
+        self._position = 0
+        self._started = time.perf_counter()
+
+    def read(self, timeout: float = 0.5) -> Optional[Any]:
+        if self._position >= len(self.samples):
+            return None
+        if self.realtime:
+            delay = self._started + self._position / SAMPLE_RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        block = self.samples[self._position:self._position + int(BLOCK_SECONDS * SAMPLE_RATE)]
+        self._position += len(block)
+        return block
+
+
+class FileSource(ArraySource):
+    """A WAV file, or FLAC/OGG when soundfile is installed."""
+
+    def __init__(self, path: str, realtime: bool = False):
+        super().__init__(load_audio(path, SAMPLE_RATE), SAMPLE_RATE, realtime)
+        self.path = path
+
+
+class StdinSource(AudioSource):
+    """Raw little-endian PCM piped on standard input, e.g. from ``arecord``."""
+
+    live = True
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, dtype: str = "int16",
+                 stream: Optional[BinaryIO] = None):
+        super().__init__(samplerate)
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.stream = stream if stream is not None else sys.stdin.buffer
+
+    def read(self, timeout: float = 0.5) -> Optional[Any]:
+        frames = int(BLOCK_SECONDS * self.samplerate)
+        data = self.stream.read(frames * self.dtype.itemsize)
+        if not data:
+            return None
+        usable = len(data) - len(data) % self.dtype.itemsize
+        samples = np.frombuffer(data[:usable], dtype=self.dtype)
+        if self.dtype.kind == "i":
+            samples = samples.astype(np.float32) / float(np.iinfo(self.dtype).max + 1)
+        return resample(samples.astype(np.float32), self.samplerate, SAMPLE_RATE)
@@ -0,0 +1,280 @@
+"""Barge-in: let the user interrupt speech output by talking over it.
+
+While the assistant speaks, ``BargeInMonitor`` taps the shared microphone
+stream and runs a ``BargeInDetector`` on it. The detector is a frame VAD
+(the endpointer's noise-floor and fricative logic) with an echo gate: a
+frame only counts as the user when it is louder than the assistant's own
+output is expected to sound at the microphone. When enough consecutive
+frames pass, speech output is stopped and the subscription, including the
+audio since the user started talking, is handed to ``SpeechToText``.
+
+``BargeInDetector`` works on plain arrays, so it can be driven from
+recorded microphone and playback fixtures (see
+``benchmarks/barge_in_benchmark.py``).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Optional
+
+import numpy as np
+
+from core.audio_buffer import AudioRingBuffer
+from core.audio_capture import get_capture_service
+from core.audio_sources import MicrophoneSource
+from core.endpointer import Endpointer
+from utils.logger import logger
+
+SAMPLE_RATE = 16000
+SILENT_REFERENCE_DB = -60.0  # Playback quieter than this produces no echo worth gating
+
+
+def _energy_db(frame: Any) -> float:
+    return 10.0 * float(np.log10(np.mean(np.square(frame, dtype=np.float64)) + 1e-10))
+
+
+class BargeInDetector:
+    """Detects the user talking over the assistant's own speech.
+
+    ``process`` takes microphone audio and, when known, the audio that was
+    playing over the same span. The echo level is estimated as the loudest
+    recent playback frame plus a learned speaker-to-microphone coupling, so
+    output latency and room echo within ``echo_window_ms`` are covered. The
+    coupling is the loudest echo seen relative to playback over the last
+    ``coupling_window_ms`` of echo-only frames; until ``coupling_warmup_ms``
+    of echo has been heard it is at least ``initial_coupling_db``. Without a
+    playback reference a fixed ``unknown_echo_margin_db`` above the noise
+    floor is required instead.
+    """
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, frame_ms: int = 20,
+                 min_speech_ms: int = 60, echo_margin_db: float = 6.0,
+                 echo_window_ms: int = 200, initial_coupling_db: float = 0.0,
+                 coupling_window_ms: int = 2000, coupling_warmup_ms: int = 500,
+                 unknown_echo_margin_db: float = 25.0,
+                 noise_floor_db: Optional[float] = None):
+        """Create a detector.
+
+        Args:
+            samplerate: Sample rate of both microphone and reference audio.
+            frame_ms: VAD frame length in milliseconds.
+            min_speech_ms: Consecutive user speech needed to trigger.
+            echo_margin_db: How far the microphone must exceed the expected echo.
+            echo_window_ms: Playback history the echo estimate looks back over.
+            initial_coupling_db: Echo level relative to playback assumed
+                before enough echo has been observed; 0 dB assumes the worst.
+            coupling_window_ms: Echo history the coupling estimate holds.
+            coupling_warmup_ms: Echo needed before the estimate is trusted.
+            unknown_echo_margin_db: Level above the noise floor required when
+                no playback reference is available.
+            noise_floor_db: Seed for the VAD noise floor, e.g. from the
+                SpeechToText endpointer, so no calibration is needed.
+        """
+        self.samplerate = samplerate
+        self.vad = Endpointer(samplerate, frame_ms)
+        self.vad.noise_floor_db = noise_floor_db
+        self.frame = self.vad.frame
+        self.min_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.echo_margin_db = echo_margin_db
+        self.unknown_echo_margin_db = unknown_echo_margin_db
+        self.initial_coupling_db = initial_coupling_db
+        self.coupling_warmup = max(1, coupling_warmup_ms // frame_ms)
+        self._reference_db: Deque[float] = deque(maxlen=max(1, echo_window_ms // frame_ms))
+        self._echo_db: Deque[float] = deque(maxlen=max(1, coupling_window_ms // frame_ms))
+        self.reset()
+
+    def reset(self):
+        """Forget the current run of speech, keeping the noise floor and echo history."""
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._reference_pending = np.zeros(0, dtype=np.float32)
+        self._reference_db.clear()
+        self.position = 0  # Samples fed, including a partial frame
+        self._run = 0
+        self.onset: Optional[int] = None  # Start of the current run of user speech
+        self.detected_at: Optional[int] = None
+
+    @property
+    def detected(self) -> bool:
+        """Whether the user has been heard since the last reset."""
+        return self.detected_at is not None
+
+    @property
+    def coupling_db(self) -> float:
+        """Expected echo level relative to the playback level."""
+        if not self._echo_db:
+            return self.initial_coupling_db
+        if len(self._echo_db) < self.coupling_warmup:
+            return max(self.initial_coupling_db, max(self._echo_db))
+        return max(self._echo_db)
+
+    @property
+    def onset_age(self) -> int:
+        """Samples fed since the detected speech started."""
+        return 0 if self.onset is None else self.position - self.onset
+
+    def process(self, block: Any, reference: Optional[Any] = None) -> bool:
+        """Feed microphone audio and return True once the user is heard.
+
+        Args:
+            block: Microphone samples.
+            reference: Playback samples covering the same span, or None if
+                the output level is unknown.
+        """
+        if self.detected:
+            return True
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        samples = np.concatenate((self._pending, block))
+        count = len(samples) // self.frame
+        self._pending = samples[count * self.frame:]
+        frame_start = self.position - (len(samples) - len(block))
+        self.position += len(block)
+
+        references = [None] * count
+        if reference is not None:
+            played = np.concatenate((self._reference_pending,
+                                     np.asarray(reference, dtype=np.float32).reshape(-1)))
+            usable = min(count, len(played) // self.frame)
+            self._reference_pending = played[usable * self.frame:]
+            references[:usable] = played[:usable * self.frame].reshape(usable, self.frame)
+
+        for index in range(count):
+            frame = samples[index * self.frame:(index + 1) * self.frame]
+            if self._is_user(frame, references[index], reference is not None):
+                if self._run == 0:
+                    self.onset = frame_start + index * self.frame
+                self._run += 1
+                if self._run >= self.min_frames:
+                    self.detected_at = frame_start + (index + 1) * self.frame
+                    return True
+            else:
+                self._run = 0
+                self.onset = None
+        return False
+
+    def _is_user(self, frame: Any, reference: Optional[Any], has_reference: bool) -> bool:
+        """Classify one frame, updating the noise floor and echo coupling."""
+        speech = self.vad.is_speech(frame)
+        mic_db = _energy_db(frame)
+        if not has_reference:
+            floor = self.vad.noise_floor_db
+            return speech and floor is not None and mic_db - floor >= self.unknown_echo_margin_db
+
+        if reference is not None:
+            self._reference_db.append(_energy_db(reference))
+        playback_db = max(self._reference_db, default=SILENT_REFERENCE_DB)
+        if playback_db <= SILENT_REFERENCE_DB:
+            return speech
+
+        user = speech and mic_db >= playback_db + self.coupling_db + self.echo_margin_db
+        if not user:
+            # Echo-only frame: learn how loud our own output is at the microphone
+            self._echo_db.append(mic_db - playback_db)
+        return user
+
+
+class BargeInMonitor:
+    """Listens for the user while ``TextToSpeech`` is speaking and interrupts it.
+
+    Only speech played from PCM (``tts.reference`` not None) is monitored;
+    while the engine speaks directly, barge-in is inactive. Use as a context
+    manager around speech output. After the speech, check
+    ``triggered``; if set, pass ``source()`` to ``SpeechToText.listen`` to
+    transcribe what the user said, starting from when they began talking.
+    """
+
+    def __init__(self, tts: Any, detector: Optional[BargeInDetector] = None,
+                 samplerate: int = SAMPLE_RATE, noise_floor_db: Optional[float] = None,
+                 lead_in: float = 0.1):
+        """Create a monitor.
+
+        Args:
+            tts: The TextToSpeech whose output is watched and interrupted.
+            detector: Detector to use; a new one is created by default.
+            samplerate: Capture rate for the detector.
+            noise_floor_db: Noise floor seed for a new detector.
+            lead_in: Audio kept from before the detected onset for STT.
+        """
+        self.tts = tts
+        self.samplerate = samplerate
+        self.detector = detector or BargeInDetector(samplerate, noise_floor_db=noise_floor_db)
+        self.lead_in = lead_in
+        self.triggered = threading.Event()
+        self.stop_latency: Optional[float] = None  # Seconds from detection to silence
+        self.detection_delay: Optional[float] = None  # Seconds from onset to detection
+        self._history = AudioRingBuffer(int(2.0 * samplerate))
+        self._subscription: Any = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._onset_position: Optional[int] = None
+
+    def start(self):
+        """Start listening on the shared capture stream."""
+        self._subscription = get_capture_service().subscribe(self.samplerate, seconds=3.0)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="barge-in")
+        self._thread.start()
+
+    def _run(self):
+        was_speaking = False
+        while not self._closed.is_set():
+            block = self._subscription.read(timeout=0.1)
+            if len(block) == 0:
+                continue
+            self._history.write(block)
+            speaking = self.tts.speaking
+            if not speaking:
+                if was_speaking:
+                    self.detector.reset()
+                was_speaking = False
+                continue
+            was_speaking = True
+            reference = self.tts.reference(len(block), self.samplerate)
+            if reference is None:
+                # The engine is speaking directly; without its output the
+                # assistant's own voice cannot be told from the user's
+                continue
+            if self.detector.process(block, reference):
+                detected = time.perf_counter()
+                self.tts.stop()
+                self.stop_latency = time.perf_counter() - detected
+                self.detection_delay = self.detector.onset_age / self.samplerate
+                self._onset_position = self._history.total_written - self.detector.onset_age
+                logger.info("Barge-in: stopped speech %.0f ms after the user started talking",
+                            (self.detection_delay + self.stop_latency) * 1000)
+                self.triggered.set()
+                return
+
+    def source(self) -> MicrophoneSource:
+        """Return a source that continues from where the user started talking.
+
+        The monitor's subscription is handed over, so no audio is lost
+        between the interruption and the start of transcription.
+        """
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        start = (self._onset_position or self._history.total_written) - int(
+            self.lead_in * self.samplerate)
+        prefix = self._history.view(start).copy()
+        subscription, self._subscription = self._subscription, None
+        return MicrophoneSource(self.samplerate, subscription=subscription, prefix=prefix)
+
+    def close(self):
+        """Stop listening; a subscription handed to ``source`` stays open."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+
+    def __enter__(self) -> "BargeInMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        # Keep the subscription open for ``source`` if the user interrupted
+        if not self.triggered.is_set():
+            self.close()
+        else:
+            self._closed.set()
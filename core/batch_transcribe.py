@@ -0,0 +1,126 @@
+"""Transcribe a directory of recordings across a process pool.
+
+Each worker process loads its own WhisperModel once and then transcribes
+files as they are handed out, so voice notes and meeting recordings use
+every core instead of one clip at a time.
+
+Usage::
+
+    python -m core.batch_transcribe recordings/ --workers 4 --json out.json
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core.speech_to_text import SAMPLE_RATE, SpeechToText, load_whisper_config
+from utils.audio_io import AUDIO_EXTENSIONS, load_audio
+from utils.logger import logger
+
+_worker_stt: Optional[SpeechToText] = None  # One model per worker process
+
+
+def find_recordings(directory: str) -> List[str]:
+    """Return the audio files under ``directory``, sorted by path."""
+    paths = []
+    for root, _dirs, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files
+                     if name.lower().endswith(AUDIO_EXTENSIONS))
+    return sorted(paths)
+
+
+def _init_worker(whisper_config: Dict[str, Any], language: str):
+    """Load the worker's model once, before it receives any file."""
+    global _worker_stt  # pylint: disable=global-statement
+    _worker_stt = SpeechToText(streaming=False, whisper_config=whisper_config, use_worker=False)
+    _worker_stt.set_language(language)
+    _worker_stt.language_tracker = None  # Detect every file independently
+
+
+def _transcribe_path(path: str) -> Dict[str, Any]:
+    """Transcribe one file in a worker process."""
+    started = time.perf_counter()
+    try:
+        audio = load_audio(path, SAMPLE_RATE)
+        text, _ = _worker_stt._transcribe(audio)  # pylint: disable=protected-access
+    except (OSError, ValueError, RuntimeError, ImportError) as e:
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "text": text,
+        "language": _worker_stt.last_language,
+        "duration_s": round(len(audio) / SAMPLE_RATE, 3),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def transcribe_directory(directory: str, workers: Optional[int] = None, language: str = "auto",
+                         whisper_config: Optional[Dict[str, Any]] = None
+                         ) -> List[Dict[str, Any]]:
+    """Transcribe every recording under ``directory`` in parallel.
+
+    Args:
+        directory: Folder searched recursively for WAV/FLAC/OGG files.
+        workers: Worker processes; defaults to one per core.
+        language: "en", "hi" or "auto".
+        whisper_config: Overrides for the tuned Whisper settings. CPU threads
+            default to an even share of the cores so workers do not contend.
+
+    Returns:
+        One result dict per file, in path order.
+    """
+    paths = find_recordings(directory)
+    if not paths:
+        return []
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or cores, len(paths)))
+    config = dict(load_whisper_config(), **(whisper_config or {}))
+    if not (whisper_config or {}).get("cpu_threads"):
+        config["cpu_threads"] = max(1, cores // workers)
+    config["num_workers"] = 1
+
+    logger.info("Transcribing %s files with %s workers", len(paths), workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(config, language)) as pool:
+        return list(pool.map(_transcribe_path, paths))
+
+
+def main():
+    """Command-line entry point for batch transcription."""
+    parser = argparse.ArgumentParser(description="Transcribe a directory of recordings")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--language", default="auto", choices=["auto", "en", "hi"])
+    parser.add_argument("--model", help="Override the Whisper model size")
+    parser.add_argument("--json", help="Write all results to this file")
+    parser.add_argument("--txt", action="store_true", help="Write a .txt next to each file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = transcribe_directory(args.directory, args.workers, args.language,
+                                   {"model_size": args.model} if args.model else None)
+    elapsed = time.perf_counter() - started
+
+    audio_seconds = 0.0
+    for result in results:
+        if "error" in result:
+            print(f"{result['path']}: ERROR {result['error']}")
+            continue
+        audio_seconds += result["duration_s"]
+        print(f"{result['path']} [{result['language']}]: {result['text']}")
+        if args.txt:
+            with open(os.path.splitext(result["path"])[0] + ".txt", "w", encoding="utf-8") as f:
+                f.write(result["text"] + "\n")
+    if elapsed:
+        print(f"{len(results)} files, {audio_seconds:.0f} s of audio in {elapsed:.1f} s "
+              f"({audio_seconds / elapsed:.1f}x real time)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Adaptive end-of-speech detection for live audio capture."""
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+MIN_NOISE_FLOOR_DB = -65.0  # Digital silence must not make faint hiss count as speech
+DEFAULT_LEADING_TIMEOUT = 8.0  # Seconds to wait for the user to start talking
+
+
+class Endpointer:
+    """Frame-level energy/zero-crossing VAD with a tracked noise floor.
+
+    Audio is split into short frames. A frame counts as speech when its
+    energy is well above the noise floor, or moderately above it with the
+    high zero-crossing rate of fricatives such as "s" and "f". The noise
+    floor follows drops quickly but only rises steadily during confirmed
+    silence (``silence_confirm_ms`` of non-speech frames); elsewhere it
+    creeps up, so a noisy room raises it instead of keeping capture open
+    forever, while soft syllables and pauses between words do not. The
+    floor is kept between utterances.
+
+    The hang time (silence needed to end an utterance) grows with the amount
+    of speech heard, so a one-word command ends quickly while longer
+    sentences may pause mid-way.
+    """
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, frame_ms: int = 20,
+                 min_hang: float = 0.3, max_hang: float = 1.0, hang_ramp: float = 3.0,
+                 leading_timeout: float = DEFAULT_LEADING_TIMEOUT, min_speech: float = 0.15,
+                 speech_margin_db: float = 10.0, fricative_margin_db: float = 5.0,
+                 fricative_zcr: float = 0.25, calibration_frames: int = 10,
+                 silence_confirm_ms: int = 300):
+        """Create an endpointer.
+
+        Args:
+            samplerate: Sample rate of the audio passed to ``process``.
+            frame_ms: VAD frame length in milliseconds (10-30 ms).
+            min_hang: Silence that ends an utterance right after speech starts.
+            max_hang: Silence that ends an utterance after ``hang_ramp``
+                seconds of speech.
+            hang_ramp: Seconds of speech over which hang time grows to ``max_hang``.
+            leading_timeout: Give up if no speech starts within this many seconds.
+            min_speech: Seconds of speech frames needed before an utterance can end.
+            speech_margin_db: Energy above the noise floor that marks speech.
+            fricative_margin_db: Smaller margin accepted for high-ZCR frames.
+            fricative_zcr: Zero crossings per sample that mark a fricative.
+            calibration_frames: Frames used to seed the noise floor.
+            silence_confirm_ms: Consecutive non-speech audio after which the
+                noise floor may rise at its normal rate.
+        """
+        self.samplerate = samplerate
+        self.frame = int(samplerate * frame_ms / 1000)
+        self.min_hang = min_hang
+        self.max_hang = max_hang
+        self.hang_ramp = hang_ramp
+        self.leading_timeout = leading_timeout
+        self.min_speech = min_speech
+        self.speech_margin_db = speech_margin_db
+        self.fricative_margin_db = fricative_margin_db
+        self.fricative_zcr = fricative_zcr
+        self.calibration_frames = calibration_frames
+        self.silence_confirm_frames = max(1, silence_confirm_ms // frame_ms)
+        self.noise_floor_db: Optional[float] = None
+        self._quiet_frames = 0  # Consecutive non-speech frames
+        self._calibration: List[float] = []
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance, keeping the calibrated noise floor."""
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.position = 0  # Samples consumed
+        self.speech_samples = 0
+        self.speech_start: Optional[int] = None
+        self.speech_end: Optional[int] = None  # End of the last speech frame
+        self.endpoint: Optional[int] = None  # Where the utterance was declared over
+        self.timed_out = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the utterance has ended or no speech ever started."""
+        return self.endpoint is not None or self.timed_out
+
+    @property
+    def delay(self) -> Optional[float]:
+        """Seconds between the end of speech and the endpoint decision."""
+        if self.endpoint is None or self.speech_end is None:
+            return None
+        return (self.endpoint - self.speech_end) / self.samplerate
+
+    def hang_time(self) -> float:
+        """Return the silence needed to end the utterance given speech so far."""
+        progress = min(1.0, self.speech_samples / self.samplerate / self.hang_ramp)
+        return self.min_hang + (self.max_hang - self.min_hang) * progress
+
+    def process(self, block: Any) -> bool:
+        """Feed audio and return True once the utterance is over."""
+        if self.done:
+            return True
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        samples = np.concatenate((self._pending, block))
+        count = len(samples) // self.frame
+        self._pending = samples[count * self.frame:]
+        for frame in samples[:count * self.frame].reshape(count, self.frame):
+            self.position += self.frame
+            if self.is_speech(frame):
+                self.speech_samples += self.frame
+                if self.speech_start is None:
+                    self.speech_start = self.position - self.frame
+                self.speech_end = self.position
+            elif self.speech_start is None:
+                if self.position >= self.leading_timeout * self.samplerate:
+                    self.timed_out = True
+                    return True
+            elif (self.speech_samples >= self.min_speech * self.samplerate
+                  and self.position - self.speech_end >= self.hang_time() * self.samplerate):
+                self.endpoint = self.position
+                return True
+        return False
+
+    def is_speech(self, frame: Any) -> bool:
+        """Classify one frame and update the noise floor."""
+        energy_db = 10.0 * np.log10(float(np.mean(np.square(frame, dtype=np.float64))) + 1e-10)
+        if self.noise_floor_db is None:
+            # Seed the floor from the quietest of the first frames
+            self._calibration.append(energy_db)
+            if len(self._calibration) < self.calibration_frames:
+                return False
+            self.noise_floor_db = max(min(self._calibration), MIN_NOISE_FLOOR_DB)
+            self._calibration = []
+
+        zcr = float(np.count_nonzero(np.diff(np.signbit(frame)))) / len(frame)
+        above = energy_db - self.noise_floor_db
+        speech = above >= self.speech_margin_db or (
+            above >= self.fricative_margin_db and zcr >= self.fricative_zcr
+        )
+        self._quiet_frames = 0 if speech else self._quiet_frames + 1
+        # Follow drops quickly and confirmed silence steadily. Speech and the
+        # quiet frames within it barely move the floor, or soft syllables at
+        # low SNR would raise it until the rest of the utterance is missed.
+        if energy_db < self.noise_floor_db:
+            rate = 0.3
+        elif self._quiet_frames >= self.silence_confirm_frames:
+            rate = 0.05
+        else:
+            rate = 0.002
+        self.noise_floor_db = max(
+            MIN_NOISE_FLOOR_DB, self.noise_floor_db + rate * (energy_db - self.noise_floor_db)
+        )
+        return speech
@@ -0,0 +1,201 @@
+"""Local fast-path routing in front of the LLM skill-selection call."""
+import inspect
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import logger
+
+# Legacy function skills have no ``commands`` table of their own, so the
+# phrases that may route to them locally are listed here.
+FUNCTION_SKILL_PHRASES: Dict[str, List[str]] = {
+    "get_time_date": [
+        "what time is it", "what's the time", "what is the time", "current time",
+        "what date is it", "what's the date", "what is the date", "today's date"
+    ],
+    "handle_small_talk": ["how are you", "who are you", "your name"],
+}
+
+
+class FastPathRouter:
+    """Routes confidently matched commands to skills without asking the LLM.
+
+    The keyword table is built from the ``commands`` dicts of the class-based
+    skills loaded by ``SkillManager``. A command is routed locally only when a
+    single skill clearly wins; anything ambiguous returns ``None`` so the caller
+    can fall back to LLM routing.
+    """
+
+    def __init__(self, skill_manager: Any, min_phrase_words: int = 2,
+                 short_command_words: int = 4):
+        self.skill_manager = skill_manager
+        self.min_phrase_words = min_phrase_words
+        self.short_command_words = short_command_words
+        self._lock = threading.Lock()
+        self._table: List[Tuple[re.Pattern, int, str]] = []
+        self._handlers_only: List[str] = []
+        self._counters = {
+            "lookups": 0,
+            "hits": 0,
+            "ambiguous": 0,
+            "misses": 0,
+            "route_time": 0.0,
+            "llm_routes": 0,
+            "llm_route_time": 0.0,
+        }
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the keyword table from the currently loaded skills."""
+        table: List[Tuple[re.Pattern, int, str]] = []
+        handlers_only: List[str] = []
+
+        for skill_name, skill_data in self.skill_manager.skills.items():
+            if "instance" in skill_data:
+                commands = getattr(skill_data["instance"], "commands", None)
+                if isinstance(commands, dict):
+                    for phrases in commands.values():
+                        for phrase in phrases:
+                            table.append(self._compile(phrase, skill_name))
+                elif hasattr(skill_data["instance"], "can_handle"):
+                    handlers_only.append(skill_name)
+            elif skill_name in FUNCTION_SKILL_PHRASES:
+                for phrase in FUNCTION_SKILL_PHRASES[skill_name]:
+                    table.append(self._compile(phrase, skill_name))
+
+        with self._lock:
+            self._table = table
+            self._handlers_only = handlers_only
+
+    @staticmethod
+    def _compile(phrase: str, skill_name: str) -> Tuple[re.Pattern, int, str]:
+        """Compile a keyword phrase into a whole-word pattern."""
+        pattern = re.compile(r"\b" + re.escape(phrase.lower()) + r"\b")
+        return pattern, len(phrase.split()), skill_name
+
+    def match(self, command: str) -> Optional[str]:
+        """Return the skill name for a confident local match, else None."""
+        return self._decide(command)[0]
+
+    def _decide(self, command: str) -> Tuple[Optional[str], bool]:
+        """Pick a skill for the command.
+
+        Returns:
+            The matched skill name (or None) and whether several skills matched.
+        """
+        text_lower = command.lower().strip()
+        if not text_lower:
+            return None, False
+
+        scores: Dict[str, int] = {}
+        for pattern, words, skill_name in self._table:
+            if words > scores.get(skill_name, 0) and pattern.search(text_lower):
+                scores[skill_name] = words
+
+        # Skills without a keyword table only get a weak, single-word vote
+        for skill_name in self._handlers_only:
+            if skill_name not in scores:
+                try:
+                    if self.skill_manager.skills[skill_name]["instance"].can_handle(command):
+                        scores[skill_name] = 1
+                except Exception:  # pylint: disable=broad-except
+                    continue
+
+        if not scores:
+            return None, False
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_name, best_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+
+        if best_score <= runner_up:
+            return None, True
+        if best_score >= self.min_phrase_words:
+            return best_name, False
+        # Below ``min_phrase_words`` a hit is only trusted when it is the
+        # only one and the command is short
+        if runner_up > 0:
+            return None, True  # Several weak hits; only possible with min_phrase_words > 2
+        if len(text_lower.split()) <= self.short_command_words:
+            return best_name, False
+        return None, False
+
+    def route(self, command: str) -> Optional[str]:
+        """Execute the command on a confidently matched skill.
+
+        Returns:
+            The skill response, or None when the command should go to the LLM.
+        """
+        start = time.perf_counter()
+        skill_name, ambiguous = self._decide(command)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._counters["lookups"] += 1
+            self._counters["route_time"] += elapsed
+            if skill_name is None:
+                self._counters["ambiguous" if ambiguous else "misses"] += 1
+                return None
+
+        args = self._skill_args(skill_name, command)
+        response = self.skill_manager.execute_skill(skill_name, *args)
+        if response is None:
+            # Skill matched on keywords but declined the command
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+
+        with self._lock:
+            self._counters["hits"] += 1
+        logger.debug("Fast-path routed to %s in %.2f ms", skill_name, elapsed * 1000)
+        return str(response)
+
+    def _skill_args(self, skill_name: str, command: str) -> List[str]:
+        """Build the positional arguments a skill expects for a raw command."""
+        skill_data = self.skill_manager.skills[skill_name]
+        if "function" in skill_data:
+            try:
+                if not inspect.signature(skill_data["function"]).parameters:
+                    return []
+            except (TypeError, ValueError):
+                return []
+        return [command]
+
+    def record_llm_route(self, elapsed: float):
+        """Record the latency of a routing decision that went to the LLM."""
+        with self._lock:
+            self._counters["llm_routes"] += 1
+            self._counters["llm_route_time"] += elapsed
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return hit rate, routing latency and saved LLM round-trips."""
+        with self._lock:
+            counters = dict(self._counters)
+
+        lookups = counters["lookups"]
+        llm_routes = counters["llm_routes"]
+        return {
+            "lookups": lookups,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "ambiguous": counters["ambiguous"],
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "avg_route_ms": counters["route_time"] / lookups * 1000 if lookups else 0.0,
+            "llm_routes": llm_routes,
+            "avg_llm_route_ms": (
+                counters["llm_route_time"] / llm_routes * 1000 if llm_routes else 0.0
+            ),
+            "round_trips_saved": counters["hits"],
+        }
+
+    def summary(self) -> str:
+        """Return a one-line summary of ``get_stats`` for logs and diagnostics."""
+        stats = self.get_stats()
+        return (
+            f"Fast-path routing: {stats['hits']}/{stats['lookups']} commands routed locally "
+            f"({stats['hit_rate']:.0%}), {stats['round_trips_saved']} LLM round-trips saved; "
+            f"{stats['avg_route_ms']:.2f} ms per local lookup vs "
+            f"{stats['avg_llm_route_ms']:.0f} ms per LLM route "
+            f"({stats['ambiguous']} ambiguous, {stats['misses']} misses)"
+        )
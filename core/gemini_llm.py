@@ -1,5 +1,5 @@
 """Gemini LLM module - imports from llm.py for compatibility."""
 
-from core.llm import GeminiLLM
+from core.llm import GeminiLLM, get_llm, is_degraded_reply
 
-__all__ = ['GeminiLLM']
+__all__ = ['GeminiLLM', 'get_llm', 'is_degraded_reply']
@@ -0,0 +1,85 @@
+"""Sticky spoken-language tracking for auto language mode."""
+
+import threading
+from typing import Any, Iterable, Optional
+
+
+class LanguageDecision:
+    """The language used for one transcription and why it was chosen."""
+
+    def __init__(self, language: Optional[str], probability: float, source: str,
+                 dropped: bool = False):
+        self.language = language
+        self.probability = probability
+        self.source = source  # "detected" or "sticky"
+        self.dropped = dropped  # Sticky language abandoned for low confidence
+
+    def __repr__(self) -> str:
+        return (f"LanguageDecision({self.language!r}, {self.probability:.2f}, "
+                f"{self.source!r}, dropped={self.dropped})")
+
+
+class LanguageTracker:
+    """Reuses the last confidently detected language instead of re-detecting.
+
+    Detection runs on the first audio Whisper sees when no language is
+    sticky. A detection at or above ``min_probability`` for one of the
+    supported languages becomes sticky and is forced on later utterances,
+    which skips detection and stops short commands flipping between
+    languages. A sticky language is dropped, so the next transcription
+    detects again, when a forced transcription decodes with an average log
+    probability below ``min_logprob`` or after ``max_sticky_uses`` uses.
+    """
+
+    def __init__(self, languages: Iterable[str] = ("en", "hi"), min_probability: float = 0.7,
+                 min_logprob: float = -1.0, max_sticky_uses: int = 20):
+        self.languages = set(languages)
+        self.min_probability = min_probability
+        self.min_logprob = min_logprob
+        self.max_sticky_uses = max_sticky_uses
+        self.language: Optional[str] = None
+        self.probability = 0.0
+        self.last_decision: Optional[LanguageDecision] = None
+        self._uses = 0
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[str]:
+        """Return the language to force, or None to let Whisper detect it."""
+        with self._lock:
+            if self.language is not None and self._uses < self.max_sticky_uses:
+                return self.language
+            return None
+
+    def observe(self, forced: Optional[str], info: Any,
+                segments: Iterable[Any]) -> LanguageDecision:
+        """Update the tracker from a finished transcription.
+
+        Args:
+            forced: The language returned by ``choose`` for this transcription.
+            info: faster-whisper's TranscriptionInfo.
+            segments: The decoded segments, for their average log probability.
+        """
+        with self._lock:
+            if forced is None:
+                language = getattr(info, "language", None)
+                probability = float(getattr(info, "language_probability", 0.0))
+                if language in self.languages and probability >= self.min_probability:
+                    self.language, self.probability = language, probability
+                else:
+                    self.language, self.probability = None, 0.0
+                self._uses = 0
+                decision = LanguageDecision(language, probability, "detected")
+            else:
+                self._uses += 1
+                logprobs = [seg.avg_logprob for seg in segments if hasattr(seg, "avg_logprob")]
+                dropped = bool(logprobs) and sum(logprobs) / len(logprobs) < self.min_logprob
+                decision = LanguageDecision(forced, self.probability, "sticky", dropped)
+                if dropped:
+                    self.language, self.probability = None, 0.0
+            self.last_decision = decision
+            return decision
+
+    def reset(self):
+        """Forget the sticky language."""
+        with self._lock:
+            self.language, self.probability, self._uses = None, 0.0, 0
@@ -1,16 +1,19 @@
 """Life automation module for proactive assistance in JARVIS-X."""
-from typing import Any
+from typing import Any, Optional
 from datetime import datetime
-from core.gemini_llm import GeminiLLM
+from core.gemini_llm import get_llm, is_degraded_reply
 from utils.goals import GoalsManager
 from utils.routines import RoutinesManager
 
+# Identical situations within this window reuse the previous suggestion
+SUGGESTION_CACHE_TTL = 60 * 60
+
 
 class LifeAutomation:
     """Provides proactive life automation and assistance."""
     # pylint: disable=too-few-public-methods
     def __init__(self, memory: Any, persistent_memory: Any):
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
         self.goals_manager = GoalsManager()
         self.routines_manager = RoutinesManager()
         self.memory = memory
@@ -19,31 +22,54 @@ class LifeAutomation:
     def proactive_assist(self) -> str:
         """Analyze user patterns and suggest proactive actions."""
         try:
-            # Gather user data
-            current_time = datetime.now().strftime("%H:%M")
-            current_day = datetime.now().strftime("%A")
-
-            # Get goals and routines
-            goals = self.goals_manager.list_goals()
-            routines = self.routines_manager.list_routines()
+            suggestion = self.llm.generate_reply(
+                self._build_analysis_prompt(), "", cache_ttl=SUGGESTION_CACHE_TTL,
+                call_site="proactive"
+            )
+            return self._format_suggestion(suggestion)
 
-            # Get recent behavior from memory
-            recent_conversations = self.persistent_memory.fetch_last(10)
-            recent_context = "\n".join([
-                f"User: {user}\nJarvis: {jarvis}"
-                for user, jarvis in recent_conversations[-5:]
-            ])
+        except (AttributeError, ValueError, TypeError):
+            return ""
 
-            today_routines = (
-                [r for r in routines if current_time < r.split(' - ')[0]][:2]
-                if routines else ['No routines']
-            )
-            # Build analysis prompt
-            recent_activity = (
-                recent_context[-500:] if recent_context else 'No recent activity'
+    async def proactive_assist_async(self, timeout: Optional[float] = None) -> str:
+        """Asynchronous ``proactive_assist``; cancel the task to abandon it."""
+        try:
+            suggestion = await self.llm.generate_reply_async(
+                self._build_analysis_prompt(), "",
+                cache_ttl=SUGGESTION_CACHE_TTL, timeout=timeout, call_site="proactive"
             )
-            analysis_prompt = (
-                f"""Analyze this user's current situation and suggest ONE proactive action.
+            return self._format_suggestion(suggestion)
+
+        except (AttributeError, ValueError, TypeError):
+            return ""
+
+    def _build_analysis_prompt(self) -> str:
+        """Build the suggestion prompt from goals, routines and recent activity."""
+        # Gather user data
+        current_time = datetime.now().strftime("%H:%M")
+        current_day = datetime.now().strftime("%A")
+
+        # Get goals and routines
+        goals = self.goals_manager.list_goals()
+        routines = self.routines_manager.list_routines()
+
+        # Get recent behavior from memory
+        recent_conversations = self.persistent_memory.fetch_last(10)
+        recent_context = "\n".join([
+            f"User: {user}\nJarvis: {jarvis}"
+            for user, jarvis in recent_conversations[-5:]
+        ])
+
+        today_routines = (
+            [r for r in routines if current_time < r.split(' - ')[0]][:2]
+            if routines else ['No routines']
+        )
+        # Build analysis prompt
+        recent_activity = (
+            recent_context[-500:] if recent_context else 'No recent activity'
+        )
+        return (
+            f"""Analyze this user's current situation and suggest ONE proactive action.
 Current time: {current_time} on {current_day}
 Active goals: {goals[:3] if goals else ['No active goals']}
 Today's routines: {today_routines}
@@ -54,17 +80,16 @@ Respond with ONE specific, actionable suggestion in this format:
 "work on [specific task]" or "take a break" or "prepare for [upcoming routine]"
 
 Be concise and helpful."""
-            )
+        )
 
-            suggestion = self.llm.generate_reply(analysis_prompt, "")
-
-            # Clean up suggestion
-            suggestion = suggestion.strip().replace('"', '').lower()
-
-            if suggestion and len(suggestion) > 5:
-                return f"Sulekh, based on your goals, you should {suggestion} now. Shall I begin?"
-            else:
-                return ""
-
-        except (AttributeError, ValueError, TypeError):
+    @staticmethod
+    def _format_suggestion(suggestion: str) -> str:
+        """Turn the raw LLM suggestion into the spoken prompt."""
+        # Clean up suggestion
+        if is_degraded_reply(suggestion):
             return ""
+        suggestion = suggestion.strip().replace('"', '').lower()
+
+        if suggestion and len(suggestion) > 5:
+            return f"Sulekh, based on your goals, you should {suggestion} now. Shall I begin?"
+        return ""
@@ -1,20 +1,878 @@
-"""Gemini LLM implementation using google.generativeai."""
+"""Gemini LLM implementation with pluggable backends."""
 
-import google.generativeai as genai
-from config import GEMINI_API_KEY
+import abc
+import asyncio
+import hashlib
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # Only needed by GeminiBackend
+    genai = None
+    google_exceptions = None
+
+from config import GEMINI_API_KEY, LLM_BACKEND
+from utils.logger import logger
+from utils.metrics import metrics
+
+DEFAULT_MODEL = 'gemini-pro'
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_CACHE_ENTRIES = 500
+DEFAULT_DEADLINE = 20.0  # seconds per generate_reply call, retries included
+CANCEL_POLL_INTERVAL = 0.05  # seconds between checks of a call's cancel event
+
+# Spoken instead of an error message while the LLM is failing or unreachable
+DEGRADED_REPLY = (
+    "I'm having trouble reaching my language service right now. "
+    "Please try again in a moment."
+)
+
+
+def is_degraded_reply(reply: str) -> bool:
+    """Check whether a reply came from the degraded local responder."""
+    return reply == DEGRADED_REPLY
+
+
+def prompt_fingerprint(prompt: str, context: str, model_name: str) -> str:
+    """Hash the whitespace-normalized prompt, context and model name."""
+    normalized = "\x00".join(
+        re.sub(r"\s+", " ", part).strip() for part in (model_name, context, prompt)
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and receive the same result or exception.
+    """
 
-class GeminiLLM:
-    """Gemini AI language model wrapper for generating responses."""
-    # pylint: disable=too-few-public-methods
     def __init__(self):
-        genai.configure(api_key=GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-pro')
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"executed": 0, "collapsed": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once for all concurrent callers sharing ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["collapsed"] += 1
+                leader = False
+            else:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                self._stats["executed"] += 1
+                leader = True
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
 
-    def generate_reply(self, prompt: str, context: str = "") -> str:
-        """Generate a reply using Gemini AI."""
         try:
-            full_prompt = f"{context}\n{prompt}" if context else prompt
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return how many calls ran upstream and how many were collapsed."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with per-call TTL and LRU eviction."""
+
+    def __init__(self, db_path: str = "jarvis_llm_cache.db",
+                 max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self.max_entries = max_entries
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize cache database and table."""
+        with self._lock:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        response TEXT,
+                        created REAL,
+                        last_access REAL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)"
+                )
+                conn.commit()
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        """Return the cached response if it is younger than ``ttl`` seconds."""
+        now = time.time()
+        with self._lock:
+            with sqlite3.connect(self._db_path) as conn:
+                row = conn.execute(
+                    "SELECT response, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                if now - row[1] > ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+                self._stats["hits"] += 1
+                return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries."""
+        now = time.time()
+        with self._lock:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                overflow -= self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                        (overflow,)
+                    )
+                    self._stats["evictions"] += overflow
+                conn.commit()
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            with sqlite3.connect(self._db_path) as conn:
+                size = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size"] = size
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _response_cache  # pylint: disable=global-statement
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+
+class LLMBackend(abc.ABC):
+    """Interface for the model providers behind ``GeminiLLM``.
+
+    Backends raise ``ValueError``, ``ConnectionError`` or ``TimeoutError`` on
+    failure; ``GeminiLLM`` turns those into error replies.
+    """
+
+    name = "backend"
+
+    @abc.abstractmethod
+    def generate(self, prompt: str) -> str:
+        """Return the full completion for a prompt."""
+
+    def generate_cancellable(self, prompt: str, cancel: threading.Event) -> str:
+        """Like ``generate``, but may stop early once ``cancel`` is set.
+
+        Backends that cannot stop a request override nothing; the call runs
+        to completion and its result is discarded.
+        """
+        return self.generate(prompt)
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Yield the completion for a prompt in chunks."""
+        yield self.generate(prompt)
+
+
+class GeminiBackend(LLMBackend):
+    """Backend calling Google Gemini through google.generativeai."""
+
+    name = "gemini"
+    _configure_lock = threading.Lock()
+    _configured_key: Optional[str] = None
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None):
+        if genai is None:
+            raise ImportError("google-generativeai is required for the Gemini backend")
+        self._configure(api_key or GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(model_name)
+
+    @classmethod
+    def _configure(cls, api_key: Optional[str]):
+        """Configure the SDK once per API key for the whole process."""
+        with cls._configure_lock:
+            if cls._configured_key != api_key:
+                genai.configure(api_key=api_key)
+                cls._configured_key = api_key
+
+    def generate(self, prompt: str) -> str:
+        with self._translate_errors():
+            return self.model.generate_content(prompt).text
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        with self._translate_errors():
+            for chunk in self.model.generate_content(prompt, stream=True):
+                text = getattr(chunk, "text", "")
+                if text:
+                    yield text
+
+    @staticmethod
+    @contextmanager
+    def _translate_errors() -> Iterator[None]:
+        """Map google.api_core errors onto the backend error contract."""
+        try:
+            yield
+        except google_exceptions.DeadlineExceeded as e:
+            raise TimeoutError(str(e)) from e
+        except (google_exceptions.InvalidArgument, google_exceptions.PermissionDenied) as e:
+            raise ValueError(str(e)) from e
+        except google_exceptions.GoogleAPIError as e:
+            raise ConnectionError(str(e)) from e
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic offline backend for load tests and benchmarks.
+
+    Args:
+        responses: Regex pattern to reply mapping; the first pattern found in
+            the prompt wins.
+        default_response: Reply when no pattern matches, or a callable taking
+            the prompt.
+        latency: Time to first token in seconds (the median for "lognormal").
+        jitter: Spread of the latency distribution in seconds ("uniform",
+            "normal") or the log-space sigma ("lognormal").
+        distribution: One of "fixed", "uniform", "normal" or "lognormal".
+        tokens_per_second: Simulated generation speed; None returns instantly.
+        error_rate: Probability of raising ``ConnectionError`` per call.
+        seed: Seed for the latency and error random generator.
+    """
+
+    name = "fake"
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, responses: Optional[Dict[str, str]] = None,
+                 default_response: Union[str, Callable[[str], str]] = "OK",
+                 latency: float = 0.0, jitter: float = 0.0, distribution: str = "fixed",
+                 tokens_per_second: Optional[float] = None, error_rate: float = 0.0,
+                 seed: Optional[int] = 0):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.responses = [
+            (re.compile(pattern, re.IGNORECASE), reply)
+            for pattern, reply in (responses or {}).items()
+        ]
+        self.default_response = default_response
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: List[str] = []
+
+    def _reply_for(self, prompt: str) -> str:
+        """Pick the scripted reply for a prompt."""
+        for pattern, reply in self.responses:
+            if pattern.search(prompt):
+                return reply
+        if callable(self.default_response):
+            return self.default_response(prompt)
+        return self.default_response
+
+    def _sample_latency(self) -> float:
+        """Draw a time-to-first-token from the configured distribution."""
+        with self._lock:
+            if self.distribution == "uniform":
+                value = self._random.uniform(self.latency - self.jitter,
+                                             self.latency + self.jitter)
+            elif self.distribution == "normal":
+                value = self._random.gauss(self.latency, self.jitter)
+            elif self.distribution == "lognormal" and self.latency > 0:
+                value = self._random.lognormvariate(math.log(self.latency), self.jitter)
+            else:
+                value = self.latency
+        return max(0.0, value)
+
+    def _start_call(self, prompt: str, cancel: Optional[threading.Event] = None) -> str:
+        """Record the call, wait out the latency and maybe fail."""
+        with self._lock:
+            self.calls.append(prompt)
+            failed = self._random.random() < self.error_rate
+        if cancel is None:
+            time.sleep(self._sample_latency())
+        elif cancel.wait(self._sample_latency()):
+            raise TimeoutError("Simulated request cancelled")
+        if failed:
+            raise ConnectionError("Simulated backend failure")
+        return self._reply_for(prompt)
+
+    def generate(self, prompt: str) -> str:
+        reply = self._start_call(prompt)
+        if self.tokens_per_second:
+            time.sleep(len(reply.split()) / self.tokens_per_second)
+        return reply
+
+    def generate_cancellable(self, prompt: str, cancel: threading.Event) -> str:
+        reply = self._start_call(prompt, cancel)
+        if self.tokens_per_second and cancel.wait(len(reply.split()) / self.tokens_per_second):
+            raise TimeoutError("Simulated request cancelled")
+        return reply
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        reply = self._start_call(prompt)
+        for token in re.findall(r"\S+\s*", reply):
+            if self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            yield token
+
+
+class CircuitBreaker:
+    """Fails fast while the upstream keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. Then a single trial call
+    is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a call may go upstream now."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = "half_open"
+                self._trial_running = False
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_running = False
+
+    def release(self):
+        """Give up an allowed call without an outcome, freeing a half-open trial."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit when needed."""
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    logger.warning("LLM circuit opened after %d failures", self._failures)
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+
+def create_backend(model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None) -> LLMBackend:
+    """Create the backend selected by the LLM_BACKEND setting."""
+    if LLM_BACKEND == "fake":
+        return FakeBackend()
+    return GeminiBackend(model_name, api_key)
+
+
+class GeminiLLM:  # pylint: disable=too-many-instance-attributes
+    """Gemini AI language model wrapper for generating responses.
+
+    Instances are safe to share between threads; at most ``max_concurrency``
+    requests are sent upstream at once and the rest wait their turn.
+    Prefer ``get_llm()`` over constructing this class directly. Requests go
+    through ``backend``, which defaults to the one selected by LLM_BACKEND.
+
+    Every call is bounded by a deadline. Transient failures are retried with
+    jittered exponential backoff, an optional hedged duplicate is sent when a
+    request runs past the observed p95 latency, and a circuit breaker answers
+    with ``DEGRADED_REPLY`` while the upstream is unhealthy.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 backend: Optional[LLMBackend] = None, deadline: float = DEFAULT_DEADLINE,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 4.0,
+                 hedge: bool = False, breaker: Optional[CircuitBreaker] = None):
+        self.model_name = model_name
+        self.backend = backend or create_backend(model_name, api_key)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._gauge_lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self.max_concurrency = max_concurrency
+        self._single_flight = SingleFlight()
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.breaker = breaker or CircuitBreaker()
+        # Every upstream call holds a slot until the backend returns, even
+        # after its caller gave up, so one worker per slot is enough
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._latencies: deque = deque(maxlen=200)
+        self._resilience = {"retries": 0, "hedges": 0, "timeouts": 0, "degraded": 0}
+
+    def generate_reply(self, prompt: str, context: str = "",
+                       cache_ttl: Optional[float] = None,
+                       deadline: Optional[float] = None,
+                       call_site: str = "default",
+                       cancel: Optional[threading.Event] = None) -> str:
+        """Generate a reply using Gemini AI.
+
+        Args:
+            prompt: The prompt to send.
+            context: Optional context prepended to the prompt.
+            cache_ttl: When set, serve and store the reply in the response
+                cache, accepting cached replies up to this many seconds old.
+                Only pass it for prompts whose answer is deterministic.
+            deadline: Seconds the whole call may take, retries included.
+                Defaults to the client's ``deadline``.
+            call_site: Name the call is recorded under in ``utils.metrics``.
+            cancel: When set, stop waiting, give up any queued request slot
+                and return ``DEGRADED_REPLY``. A call already sent upstream
+                is abandoned rather than cancelled and keeps its slot until
+                the backend returns.
+
+        Identical requests already in flight on this client are not sent
+        again; the caller waits for and shares the pending reply. If the
+        upstream fails or the deadline passes, ``DEGRADED_REPLY`` is returned.
+        """
+        start = time.perf_counter()
+        key = prompt_fingerprint(prompt, context, f"{self.backend.name}:{self.model_name}")
+        executed: List[bool] = []
+
+        def run() -> Tuple[str, str]:
+            executed.append(True)
+            return self._generate_cached(key, prompt, context, cache_ttl, deadline, cancel)
+
+        reply, cache_outcome = self._single_flight.do(key, run)
+        metrics.record_llm_call(
+            call_site, time.perf_counter() - start,
+            f"{context}\n{prompt}" if context else prompt, reply,
+            error=is_degraded_reply(reply),
+            cache=cache_outcome if executed else "coalesced"
+        )
+        return reply
+
+    def _generate_cached(self, key: str, prompt: str, context: str,
+                         cache_ttl: Optional[float], deadline: Optional[float],
+                         cancel: Optional[threading.Event] = None) -> Tuple[str, str]:
+        """Serve a reply from the response cache or generate and store it.
+
+        Returns:
+            The reply and the cache outcome: "hit", "miss" or "bypass".
+        """
+        cache = get_response_cache() if cache_ttl is not None else None
+        if cache is not None:
+            cached = cache.get(key, cache_ttl)
+            if cached is not None:
+                return cached, "hit"
+
+        try:
+            reply = self._generate(prompt, context, deadline, cancel)
         except (ValueError, ConnectionError, TimeoutError) as e:
-            return f"Error generating reply: {str(e)}"
+            return self._degraded_reply(e), "miss" if cache else "bypass"
+
+        if cache is not None:
+            cache.put(key, reply)
+            return reply, "miss"
+        return reply, "bypass"
+
+    async def generate_reply_async(self, prompt: str, context: str = "",
+                                   cache_ttl: Optional[float] = None,
+                                   timeout: Optional[float] = None,
+                                   call_site: str = "default") -> str:
+        """Asynchronous ``generate_reply`` for use from an asyncio event loop.
+
+        The request runs on a worker thread and still counts against
+        ``max_concurrency``, so many coroutines can await replies concurrently.
+        ``timeout`` is used as the call deadline. Cancelling the awaiting task
+        stops the worker thread waiting and frees a queued request slot; a
+        call already sent upstream is abandoned, not cancelled, and holds its
+        slot until the backend returns.
+        """
+        cancel = threading.Event()
+        worker = asyncio.ensure_future(asyncio.to_thread(
+            self.generate_reply, prompt, context, cache_ttl, timeout, call_site, cancel
+        ))
+        try:
+            return await asyncio.wait_for(asyncio.shield(worker), timeout)
+        except asyncio.TimeoutError:
+            # The worker returns the degraded reply promptly once cancelled
+            # and records the call in ``utils.metrics``
+            cancel.set()
+            return await worker
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+
+    def generate_reply_stream(self, prompt: str, context: str = "",
+                              call_site: str = "default") -> Iterator[str]:
+        """Generate a reply using Gemini AI, yielding text chunks as they arrive.
+
+        The call is recorded in ``utils.metrics`` with its full duration once
+        the stream is exhausted.
+        """
+        start = time.perf_counter()
+        full_prompt = f"{context}\n{prompt}" if context else prompt
+        chunks: List[str] = []
+        error: Optional[Exception] = None
+        unsettled = False  # An allowed call whose outcome is not recorded yet
+        try:
+            if self.breaker.allow():
+                unsettled = True
+                with self._slot(time.monotonic() + self.deadline):
+                    for chunk in self.backend.generate_stream(full_prompt):
+                        chunks.append(chunk)
+                        yield chunk
+                unsettled = False
+                self.breaker.record_success()
+            else:
+                error = ConnectionError("circuit open")
+        except (ConnectionError, TimeoutError) as e:
+            unsettled = False
+            self.breaker.record_failure()
+            error = e
+        except ValueError as e:
+            # A rejected request (e.g. a blocked response) still means the
+            # upstream is answering
+            unsettled = False
+            self.breaker.record_success()
+            error = e
+        finally:
+            if unsettled:
+                # Abandoned by the consumer or an unexpected error; release the
+                # half-open trial so the breaker cannot stay stuck
+                self.breaker.record_failure()
+            if error is not None:
+                chunks.append(self._degraded_reply(error))
+            metrics.record_llm_call(
+                call_site, time.perf_counter() - start, full_prompt, "".join(chunks),
+                error=error is not None
+            )
+        if error is not None:
+            yield chunks[-1]
+
+    def _generate(self, prompt: str, context: str, deadline: Optional[float] = None,
+                  cancel: Optional[threading.Event] = None) -> str:
+        """Send a request upstream with deadline, retries and circuit breaking.
+
+        Raises:
+            ValueError: The request was rejected; it is not retried.
+            ConnectionError: The upstream failed or the circuit is open.
+            TimeoutError: The deadline passed or ``cancel`` was set.
+        """
+        if not self.breaker.allow():
+            raise ConnectionError("circuit open")
+
+        full_prompt = f"{context}\n{prompt}" if context else prompt
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        cancel = cancel or threading.Event()
+        attempt = 0
+        unsettled = True  # An allowed call whose outcome is not recorded yet
+        try:
+            while True:
+                try:
+                    reply = self._attempt(full_prompt, deadline_at, cancel)
+                    unsettled = False
+                    self.breaker.record_success()
+                    return reply
+                except ValueError:
+                    # A rejected request (e.g. a blocked response) still means
+                    # the upstream is answering
+                    unsettled = False
+                    self.breaker.record_success()
+                    raise
+                except (ConnectionError, TimeoutError) as e:
+                    unsettled = False
+                    if cancel.is_set():
+                        # Says nothing about the upstream's health
+                        self.breaker.release()
+                        raise
+                    self.breaker.record_failure()
+                    if isinstance(e, TimeoutError):
+                        self._count("timeouts")
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        raise
+                    backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                    backoff *= random.uniform(0.5, 1.0)
+                    if time.monotonic() + backoff >= deadline_at or not self.breaker.allow():
+                        raise
+                    unsettled = True
+                    self._count("retries")
+                    if cancel.wait(backoff):
+                        unsettled = False
+                        self.breaker.release()
+                        raise TimeoutError("LLM request cancelled") from e
+        finally:
+            if unsettled:
+                # Unexpected error; release the half-open trial so the breaker
+                # cannot stay stuck
+                self.breaker.record_failure()
+
+    def _attempt(self, full_prompt: str, deadline_at: float, cancel: threading.Event) -> str:
+        """Run one attempt, hedging it with a duplicate past the p95 latency.
+
+        Each upstream call, hedge included, holds its own request slot until
+        the backend returns, so calls abandoned at the deadline or through
+        ``cancel`` still count against ``max_concurrency``. The hedge is
+        skipped when no slot is free.
+        """
+        if not self._acquire_slot(deadline_at, cancel=cancel):
+            if cancel.is_set():
+                raise TimeoutError("LLM request cancelled")
+            raise TimeoutError("No free LLM request slot before the deadline")
+        start = time.perf_counter()
+        futures: List[Future] = [self._submit(full_prompt, cancel)]
+
+        hedge_after = self._hedge_delay()
+        if hedge_after is not None and time.monotonic() + hedge_after < deadline_at:
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done and self._acquire_slot(blocking=False):
+                self._count("hedges")
+                futures.append(self._submit(full_prompt, cancel))
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending and not cancel.is_set():
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=min(remaining, CANCEL_POLL_INTERVAL),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    with self._gauge_lock:
+                        self._latencies.append(time.perf_counter() - start)
+                    return future.result()
+
+        if cancel.is_set():
+            raise TimeoutError("LLM request cancelled")
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError("LLM request exceeded its deadline")
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Return the p95 latency once enough samples exist and hedging is on."""
+        if not self.hedge:
+            return None
+        with self._gauge_lock:
+            if len(self._latencies) < 20:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _degraded_reply(self, error: BaseException) -> str:
+        """Log the failure and answer with the local degraded reply."""
+        logger.warning("LLM unavailable, using degraded reply: %s", error or "timeout")
+        self._count("degraded")
+        return DEGRADED_REPLY
+
+    def _count(self, name: str):
+        """Increment a resilience counter."""
+        with self._gauge_lock:
+            self._resilience[name] += 1
+
+    def _acquire_slot(self, deadline_at: Optional[float] = None, blocking: bool = True,
+                      cancel: Optional[threading.Event] = None) -> bool:
+        """Take one of the upstream request slots.
+
+        Waits until ``deadline_at`` unless ``blocking`` is False, giving up
+        early once ``cancel`` is set.
+        """
+        # pylint: disable=consider-using-with
+        if not blocking:
+            acquired = self._semaphore.acquire(blocking=False)
+        else:
+            with self._gauge_lock:
+                self._waiting += 1
+            try:
+                acquired = False
+                while not acquired and not (cancel is not None and cancel.is_set()):
+                    remaining = (deadline_at or 0.0) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if cancel is not None:
+                        remaining = min(remaining, CANCEL_POLL_INTERVAL)
+                    acquired = self._semaphore.acquire(timeout=remaining)
+            finally:
+                with self._gauge_lock:
+                    self._waiting -= 1
+        if acquired:
+            with self._gauge_lock:
+                self._in_flight += 1
+        return acquired
+
+    def _release_slot(self, _future: Optional[Future] = None):
+        """Give back a request slot; also used as a future's done callback."""
+        with self._gauge_lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    def _submit(self, full_prompt: str, cancel: threading.Event) -> Future:
+        """Start an upstream call that releases its (already taken) slot when it returns."""
+        try:
+            future = self._executor.submit(self.backend.generate_cancellable, full_prompt, cancel)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    @contextmanager
+    def _slot(self, deadline_at: float) -> Iterator[None]:
+        """Hold one of the upstream request slots for a call made on this thread."""
+        if not self._acquire_slot(deadline_at):
+            raise TimeoutError("No free LLM request slot before the deadline")
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a free request slot."""
+        with self._gauge_lock:
+            return self._waiting
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the concurrency gauges for this client."""
+        with self._gauge_lock:
+            return {
+                "model": self.model_name,
+                "backend": self.backend.name,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "coalescing": self._single_flight.get_stats(),
+                "circuit": self.breaker.state,
+                **self._resilience,
+            }
+
+
+class LLMRegistry:
+    """Process-wide registry handing out shared ``GeminiLLM`` clients."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[Any, ...], GeminiLLM] = {}
+        self._backend_factory: Optional[Callable[[str], LLMBackend]] = None
+
+    def get(self, model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None,
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY, **options: Any) -> GeminiLLM:
+        """Return the shared client for this model and configuration.
+
+        ``options`` are passed on to ``GeminiLLM`` (deadline, retries, hedging).
+        """
+        key = (model_name, api_key or GEMINI_API_KEY, max_concurrency,
+               tuple(sorted(options.items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                backend = self._backend_factory(model_name) if self._backend_factory else None
+                client = GeminiLLM(model_name, api_key, max_concurrency, backend, **options)
+                self._clients[key] = client
+            return client
+
+    def set_backend_factory(self, factory: Optional[Callable[[str], LLMBackend]]):
+        """Build future clients with ``factory(model_name)`` instead of LLM_BACKEND.
+
+        Existing clients are dropped, so call this before components are created.
+        Pass None to go back to the configured backend.
+        """
+        with self._lock:
+            self._backend_factory = factory
+            self._clients.clear()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return the concurrency gauges of every registered client."""
+        with self._lock:
+            clients = list(self._clients.values())
+        return [client.get_stats() for client in clients]
+
+    def clear(self):
+        """Drop all registered clients."""
+        with self._lock:
+            self._clients.clear()
+
+
+registry = LLMRegistry()
+
+
+def get_llm(model_name: str = DEFAULT_MODEL, **config: Any) -> GeminiLLM:
+    """Return the process-wide shared client for ``model_name``."""
+    return registry.get(model_name, **config)
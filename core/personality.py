@@ -34,6 +34,15 @@ class PersonalityManager:
         else:
             self.mode = "normal"
 
+    @property
+    def styles_text(self) -> bool:
+        """Whether ``apply_style`` changes text in the current mode.
+
+        Styles look at the whole response (suffixes, replacements), so a
+        response must be complete before it is styled.
+        """
+        return self.mode != "normal"
+
     def apply_style(self, text: str) -> str:
         """Apply personality style to text."""
         if self.mode == "normal":
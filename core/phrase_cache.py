@@ -0,0 +1,230 @@
+"""Pre-rendered audio for fixed and frequently repeated TTS phrases.
+
+Acknowledgements, status lines and reminders are spoken over and over with
+identical text. ``PhraseCache`` renders such a phrase to PCM once per voice
+profile, keeps recent renders in memory and on disk, and plays them back
+directly with sounddevice instead of running the TTS engine again.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.audio_io import read_audio
+from utils.logger import logger
+
+try:
+    import sounddevice as sd  # type: ignore
+except ImportError:  # pragma: no cover - playback needs sounddevice
+    sd = None
+
+CACHE_DIR = "jarvis_tts_cache"
+PHRASES_PATH = "jarvis_tts_phrases.txt"
+MAX_PHRASE_CHARS = 200  # Longer text is rarely repeated word for word
+REPEATS_TO_CACHE = 2
+
+# Rendered at startup; extend with one phrase per line in PHRASES_PATH
+WARMUP_PHRASES = (
+    "Yes, how can I help you?",
+    "I'm back online. How can I help you?",
+    "Going into sleep mode. Say 'Jarvis' to wake me up.",
+    "I'm sleeping. Say 'Jarvis' to wake me up.",
+    "Step completed.",
+    "Testing voice system.",
+    "All systems operational. Memory, voice, and intelligence are online.",
+)
+
+
+def load_warmup_phrases(path: str = PHRASES_PATH) -> List[str]:
+    """Return the built-in warm-up phrases plus any listed in ``path``."""
+    phrases = list(WARMUP_PHRASES)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#") and line not in phrases:
+                        phrases.append(line)
+        except OSError as e:
+            logger.warning("Could not read TTS phrase list %s: %s", path, e)
+    return phrases
+
+
+class PhraseCache:
+    """LRU cache of rendered phrases keyed by voice profile and text.
+
+    Rendering and playback both run on the speech worker thread, so the
+    cache itself only guards its bookkeeping. A phrase is worth caching when
+    it is in the warm-up list or has been spoken ``REPEATS_TO_CACHE`` times.
+    Rendered WAV files survive restarts; the oldest are pruned once there
+    are more than ``max_disk_entries``.
+    """
+
+    def __init__(self, max_entries: int = 64, cache_dir: Optional[str] = CACHE_DIR,
+                 max_disk_entries: int = 256, phrases: Optional[Iterable[str]] = None):
+        """Create a cache.
+
+        Args:
+            max_entries: Rendered phrases kept in memory.
+            cache_dir: Directory for rendered WAV files, or None for memory only.
+            max_disk_entries: Rendered files kept in ``cache_dir``.
+            phrases: Phrases always worth caching; defaults to
+                ``load_warmup_phrases()``.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.phrases = set(load_warmup_phrases() if phrases is None else phrases)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+
+    @property
+    def available(self) -> bool:
+        """Whether cached audio can be played on this system."""
+        return sd is not None
+
+    def should_cache(self, text: str) -> bool:
+        """Count a use of ``text`` and return whether it is worth rendering."""
+        text = text.strip()
+        if text in self.phrases:
+            return True
+        if len(text) > MAX_PHRASE_CHARS:
+            return False
+        with self._lock:
+            self._seen[text] = self._seen.get(text, 0) + 1
+            if len(self._seen) > self.max_entries * 16:
+                self._seen.clear()  # Forget one-off texts rather than grow forever
+                self._seen[text] = 1
+            return self._seen[text] >= REPEATS_TO_CACHE
+
+    def _path(self, profile: str, text: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha1(f"{profile}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.wav")
+
+    def get(self, profile: str, text: str) -> Optional[Tuple[Any, int]]:
+        """Return (audio, samplerate) for a rendered phrase, or None."""
+        key = (profile, text.strip())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+
+        path = self._path(*key)
+        if path and os.path.exists(path):
+            try:
+                entry = read_audio(path)
+            except (OSError, ValueError, ImportError) as e:
+                logger.warning("Discarding unreadable cached phrase %s: %s", path, e)
+                self._remove(path)
+            else:
+                os.utime(path)  # Keep recently used files out of pruning
+                self._store(key, entry)
+                with self._lock:
+                    self._stats["hits"] += 1
+                return entry
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def render(self, profile: str, text: str,
+               synthesize: Callable[[str, str], None]) -> Optional[Tuple[Any, int]]:
+        """Render a phrase with ``synthesize(text, path)`` and cache the result.
+
+        ``synthesize`` must write the spoken text to the audio file at
+        ``path``, e.g. with the engine's ``save_to_file``. Returns None if
+        rendering failed.
+        """
+        key = (profile, text.strip())
+        path = self._path(*key)
+        try:
+            if path is None:
+                handle, path = tempfile.mkstemp(suffix=".wav")
+                os.close(handle)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            synthesize(key[1], path)
+            entry = read_audio(path)
+        except (OSError, RuntimeError, ValueError, ImportError) as e:
+            logger.warning("Could not pre-render phrase %r: %s", key[1], e)
+            if path:
+                self._remove(path)
+            return None
+        if len(entry[0]) == 0:
+            self._remove(path)
+            return None
+        if not self.cache_dir:
+            self._remove(path)
+
+        self._store(key, entry)
+        with self._lock:
+            self._stats["renders"] += 1
+        self._prune_disk()
+        return entry
+
+    def play(self, entry: Tuple[Any, int]) -> bool:
+        """Play rendered audio and block until it has finished.
+
+        Returns False if the output device could not play it.
+        """
+        audio, samplerate = entry
+        try:
+            sd.play(audio, samplerate)
+            sd.wait()
+        except sd.PortAudioError as e:
+            logger.warning("Could not play cached phrase: %s", e)
+            return False
+        return True
+
+    def stop(self):
+        """Cut off playback started by ``play``, which then returns."""
+        sd.stop()
+
+    def _store(self, key: Tuple[str, str], entry: Tuple[Any, int]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _prune_disk(self):
+        """Delete the least recently used files beyond ``max_disk_entries``."""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        files = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith(".wav")
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Forget everything held in memory. Files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._seen.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return hit, miss, render and eviction counts."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
@@ -1,12 +1,12 @@
 """Self-coding module for JARVIS-X autonomous code generation."""
-from core.gemini_llm import GeminiLLM
+from core.gemini_llm import get_llm
 
 
 class SelfCoder:
     """Autonomous code generation system for JARVIS-X."""
     # pylint: disable=too-few-public-methods
     def __init__(self):
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
         self.system_prompt = (
             "You are Jarvis, an elite software engineer. "
             "Write clean, modular Python code."
@@ -17,7 +17,7 @@ class SelfCoder:
         try:
             # Generate code using Gemini
             full_prompt = f"{self.system_prompt}\n\nTask: {task}"
-            code = self.llm.generate_reply(full_prompt, "")
+            code = self.llm.generate_reply(full_prompt, "", call_site="self_coder")
 
             # Save to file
             with open("generated_code.py", "w", encoding="utf-8") as f:
@@ -2,14 +2,15 @@
 from typing import Any, List
 import os
 from datetime import datetime
-from core.gemini_llm import GeminiLLM
+from core.gemini_llm import get_llm
+from utils.metrics import metrics as llm_metrics
 
 
 class SelfImprover:
     """Analyzes system performance and generates improvement suggestions."""
     # pylint: disable=too-few-public-methods
     def __init__(self, memory: Any, persistent_memory: Any):
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
         self.memory = memory
         self.persistent_memory = persistent_memory
 
@@ -33,7 +34,9 @@ Provide specific, actionable improvements for:
 
 Be concise and technical."""
 
-            suggestions = self.llm.generate_reply(analysis_prompt, "")
+            suggestions = self.llm.generate_reply(
+                analysis_prompt, "", call_site="self_improver"
+            )
 
             # Save to improvements.md
             with open("improvements.md", "w", encoding="utf-8") as f:
@@ -70,11 +73,13 @@ Be concise and technical."""
         except OSError:
             metrics.append("Database: Size unknown")
 
-        # Recent errors (simulated - would need actual logging)
-        metrics.append("Recent errors: System appears stable")
-
-        # Response times (simulated)
-        metrics.append("Response times: Average processing within normal range")
+        # LLM latency, size, error and cache statistics per call site
+        llm_sites = llm_metrics.summary_lines()
+        if llm_sites:
+            metrics.append("LLM call sites (slowest p95 first):")
+            metrics.extend(f"- {line}" for line in llm_sites)
+        else:
+            metrics.append("LLM call sites: no calls recorded yet")
 
         # System uptime
         metrics.append(f"Analysis time: {datetime.now().strftime('%H:%M:%S')}")
@@ -1,14 +1,14 @@
 """Skill learning module for JARVIS-X dynamic capability acquisition."""
 import os
 import importlib.util
-from core.gemini_llm import GeminiLLM
+from core.gemini_llm import get_llm
 
 
 class SkillLearner:
     """Generates and validates new skill modules dynamically."""
     # pylint: disable=too-few-public-methods
     def __init__(self):
-        self.llm = GeminiLLM()
+        self.llm = get_llm()
 
     def learn_skill(self, name: str, description: str) -> str:
         """Generate and save a new skill module."""
@@ -21,7 +21,7 @@ Description: {description}
 
 Only return the Python code, no explanations."""
 
-            code = self.llm.generate_reply(prompt, "")
+            code = self.llm.generate_reply(prompt, "", call_site="skill_learning")
 
             # Clean up code (remove markdown if present)
             if "```python" in code:
@@ -0,0 +1,166 @@
+"""Single-threaded, prioritized speech output queue."""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.logger import logger
+
+# Lower numbers are spoken first
+PRIORITY_ALARM = 0
+PRIORITY_REPLY = 1
+PRIORITY_PROACTIVE = 2
+
+
+class SpeechItem:
+    """One queued utterance, or a control job (see ``SpeechScheduler.run``)."""
+
+    def __init__(self, text: str, priority: int, job: Callable[[], Any],
+                 max_age: Optional[float], control: bool = False):
+        self.text = text
+        self.priority = priority
+        self.job = job
+        self.max_age = max_age
+        self.control = control
+        self.created_at = time.monotonic()
+        self.future: "Future[Any]" = Future()
+
+    def is_stale(self) -> bool:
+        """Whether the item waited longer than it is worth speaking."""
+        return self.max_age is not None and time.monotonic() - self.created_at > self.max_age
+
+
+class SpeechScheduler:
+    """Runs speech jobs one at a time on a worker thread, highest priority first.
+
+    The worker is the only thread that touches the TTS engine, so callers
+    never run the engine concurrently and never wait for an utterance unless
+    they block on the returned future. Items of equal priority are spoken
+    in submission order. Submitting text that is already waiting at the same
+    priority returns the queued item's future instead of speaking it twice,
+    and items older than their ``max_age`` are dropped when they reach the
+    front of the queue. Control jobs queued with ``run`` (engine setup,
+    pre-rendering) share the worker but are exempt from all of that.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, SpeechItem]] = []
+        self._queued: Dict[Tuple[int, str], SpeechItem] = {}
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._stats = {"spoken": 0, "deduplicated": 0, "stale": 0, "cancelled": 0}
+        self.current: Optional[SpeechItem] = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="speech-worker")
+        self._thread.start()
+
+    def submit(self, text: str, job: Callable[[], Any], priority: int = PRIORITY_REPLY,
+               max_age: Optional[float] = None, dedup: bool = True) -> "Future[Any]":
+        """Queue a speech job and return a future for its completion.
+
+        Args:
+            text: What the job says; used for deduplication and logging.
+            job: Callable run on the worker thread to speak the text.
+            priority: PRIORITY_ALARM, PRIORITY_REPLY or PRIORITY_PROACTIVE.
+            max_age: Seconds after which the item is no longer worth speaking.
+            dedup: Share the future of the same text already waiting at this
+                priority. Pass False for parts of one utterance, such as the
+                sentences of a streamed reply, which may repeat on purpose.
+        """
+        key = (priority, text.strip().lower())
+        with self._condition:
+            queued = self._queued.get(key) if dedup else None
+            if queued is not None and not queued.future.done():
+                self._stats["deduplicated"] += 1
+                return queued.future
+            item = SpeechItem(text, priority, job, max_age)
+            if dedup:
+                self._queued[key] = item
+            heapq.heappush(self._heap, (priority, next(self._order), item))
+            self._condition.notify()
+        return item.future
+
+    def run(self, job: Callable[[], Any], priority: int = PRIORITY_ALARM,
+            label: str = "control") -> "Future[Any]":
+        """Queue a job that must run on the worker but is not an utterance.
+
+        Control jobs are ordered by priority like speech, but are never
+        deduplicated, dropped as stale or cancelled, and do not count in
+        the stats.
+
+        Args:
+            job: Callable run on the worker thread.
+            priority: Where the job is ordered relative to speech.
+            label: Name used in logs.
+        """
+        item = SpeechItem(label, priority, job, None, control=True)
+        with self._condition:
+            heapq.heappush(self._heap, (priority, next(self._order), item))
+            self._condition.notify()
+        return item.future
+
+    def cancel(self, priority: Optional[int] = None) -> int:
+        """Cancel queued items, optionally only those of one priority.
+
+        The utterance currently being spoken and control jobs are not affected.
+        """
+        cancelled = 0
+        with self._condition:
+            for _, _, item in self._heap:
+                if item.control or (priority is not None and item.priority != priority):
+                    continue
+                if item.future.cancel():
+                    # Notify now so waiters need not wait for the worker to pop it
+                    item.future.set_running_or_notify_cancel()
+                    cancelled += 1
+            self._stats["cancelled"] += cancelled
+        return cancelled
+
+    def pending(self) -> int:
+        """Return how many items are waiting to be spoken."""
+        with self._condition:
+            return sum(
+                1 for _, _, item in self._heap if not item.control and not item.future.done()
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counts of spoken, deduplicated, stale and cancelled items."""
+        with self._condition:
+            return dict(self._stats, pending=self.pending())
+
+    def _next(self) -> SpeechItem:
+        """Block until an item that should still be spoken is available."""
+        with self._condition:
+            while True:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, item = heapq.heappop(self._heap)
+                key = (item.priority, item.text.strip().lower())
+                if self._queued.get(key) is item:
+                    del self._queued[key]
+                if item.future.done():
+                    continue  # Cancelled through ``cancel``
+                if item.is_stale() and item.future.cancel():
+                    item.future.set_running_or_notify_cancel()
+                    self._stats["stale"] += 1
+                    logger.debug("Dropping stale speech: %s", item.text)
+                    continue
+                # Returns False if the caller cancelled the future meanwhile
+                if item.future.set_running_or_notify_cancel():
+                    return item
+
+    def _run(self):
+        while True:
+            item = self._next()
+            self.current = item
+            try:
+                item.future.set_result(item.job())
+                if not item.control:
+                    self._stats["spoken"] += 1
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Speech job failed (%s): %s", item.text[:40], e)
+                item.future.set_exception(e)
+            finally:
+                self.current = None
@@ -1,29 +1,112 @@
 """Speech-to-text functionality."""
 
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import os
+import threading
 import time
 
 import numpy as np
-import sounddevice as sd  # type: ignore
 from faster_whisper import WhisperModel  # type: ignore
 
 from config import DEFAULT_LANGUAGE
+from core.audio_buffer import AudioRingBuffer
+from core.audio_sources import ArraySource, AudioSource, MicrophoneSource
+from core.endpointer import DEFAULT_LEADING_TIMEOUT, Endpointer
+from core.language_tracker import LanguageDecision, LanguageTracker
+from core.stt_worker import WhisperWorker
+from utils.audio_io import load_audio
 from utils.logger import logger
 
+SAMPLE_RATE = 16000
+MAX_CAPTURE_SECONDS = 10
+WHISPER_CONFIG_PATH = "jarvis_whisper_config.json"  # Written by core.stt_tuning
+DEFAULT_WHISPER_CONFIG: Dict[str, Any] = {
+    "model_size": "base",
+    "compute_type": "int8",
+    "cpu_threads": 0,  # 0 lets CTranslate2 pick
+    "num_workers": 1,
+    "beam_size": 5,
+}
+
+
+def load_whisper_config(path: str = WHISPER_CONFIG_PATH) -> Dict[str, Any]:
+    """Return the tuned Whisper settings, falling back to the defaults."""
+    config = dict(DEFAULT_WHISPER_CONFIG)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            config.update({key: saved[key] for key in DEFAULT_WHISPER_CONFIG if key in saved})
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable Whisper config %s: %s", path, e)
+    return config
+
+
+def create_whisper_model(config: Dict[str, Any]) -> Any:
+    """Build a CPU WhisperModel from a Whisper settings dict."""
+    return WhisperModel(
+        config["model_size"], device="cpu", compute_type=config["compute_type"],
+        cpu_threads=config["cpu_threads"], num_workers=config["num_workers"]
+    )
+
 
 class SpeechToText:
     """Class for speech-to-text using faster-whisper."""
 
-    def __init__(self):
-        """Initialize the SpeechToText class with faster-whisper model."""
+    def __init__(self, streaming: bool = True, whisper_config: Optional[Dict[str, Any]] = None,
+                 use_worker: bool = True, leading_timeout: float = DEFAULT_LEADING_TIMEOUT):
+        """Initialize the SpeechToText class with faster-whisper model.
+
+        Args:
+            streaming (bool): Transcribe committed audio windows in the
+                background while the user is still speaking.
+            whisper_config (dict): Model size, compute type, threads, workers
+                and beam size. Defaults to the tuned configuration on disk.
+            use_worker (bool): Run inference in a dedicated worker process so
+                transcription does not hold this interpreter's GIL.
+            leading_timeout (float): Seconds a live capture waits for the
+                user to start talking before giving up.
+        """
         try:
-            self.model: Any = WhisperModel("base", device="cpu", compute_type="int8")
+            self.whisper_config = (
+                {**DEFAULT_WHISPER_CONFIG, **whisper_config} if whisper_config
+                else load_whisper_config()
+            )
+            if use_worker:
+                self.model: Any = WhisperWorker(self.whisper_config)
+                self.model.on_partial = self._on_segment
+            else:
+                self.model = create_whisper_model(self.whisper_config)
+            logger.info("Whisper config: %s", self.whisper_config)
             self.language = DEFAULT_LANGUAGE
             self.supported_languages = ["en", "hi", "auto"]  # English, Hindi, Auto-detect
+            self.streaming = streaming
+            self.window_seconds = 3.0  # Audio committed per background transcription
+            self.partial_transcript = ""
+            self.on_partial: Optional[Callable[[str], None]] = None
+            self.last_latency: Optional[float] = None  # End of capture to final text
+            self.last_language: Optional[str] = None  # Language of the last transcription
+            self.last_compute = 0.0  # Seconds spent transcribing the last utterance
+            # Noise-floor-calibrated end-of-speech detection, kept across utterances
+            self.endpointer = Endpointer(SAMPLE_RATE, leading_timeout=leading_timeout)
+            self.last_endpoint_delay: Optional[float] = None  # End of speech to endpoint
+            # Auto mode reuses a confidently detected language across utterances
+            self.language_tracker: Optional[LanguageTracker] = LanguageTracker(
+                [code for code in self.supported_languages if code != "auto"]
+            )
+            self.last_language_decision: Optional[LanguageDecision] = None
+            # One second of headroom so a full-length capture never wraps
+            self.buffer = AudioRingBuffer((MAX_CAPTURE_SECONDS + 1) * SAMPLE_RATE)
         except Exception as e:
             logger.error("Error initializing WhisperModel: %s", e)
             raise
 
+    def _on_segment(self, text: str):
+        """Report segments of the window being decoded as partial text."""
+        if self.on_partial:
+            self.on_partial(" ".join(t for t in (self.partial_transcript, text) if t))
+
     def set_language(self, lang_code: str):
         """Set the language for speech recognition."""
         if lang_code in self.supported_languages:
@@ -32,57 +115,215 @@ class SpeechToText:
             logger.warning("Unsupported language: %s. Using auto-detect.", lang_code)
             self.language = "auto"
 
-    def listen(self) -> str:
+    def listen(self, source: Optional[AudioSource] = None) -> str:
         """Capture audio and transcribe to text.
 
+        In streaming mode, audio is transcribed window by window while capture
+        is still running, so only the final tail is left once the user stops.
+
+        Args:
+            source: Where to capture from. Defaults to the microphone. Live
+                sources stop when the endpointer hears the speaker finish;
+                finite sources are read to the end. Capture never exceeds
+                MAX_CAPTURE_SECONDS.
+
         Returns:
             str: Recognized text in lowercase.
         """
         try:
-            samplerate = 16000
-            silence_threshold = 0.01
-            timeout = 10  # seconds
-            chunk_duration = 0.5  # seconds
-            audio_chunks: List[Any] = []
-
-            def callback(indata: Any, _frames: Any, _time_info: Any, status: Any) -> None:
-                if status:
-                    logger.warning("Sounddevice status: %s", status)
-                audio_chunks.append(indata.copy())
-
-            with sd.InputStream(
-                samplerate=samplerate, channels=1, callback=callback
-            ):  # type: ignore
-                start_time = time.time()
-                last_audio_time = start_time
-
-                while time.time() - start_time < timeout:
-                    time.sleep(chunk_duration)
-                    if audio_chunks:
-                        # Check RMS of the last chunk for silence
-                        rms = np.sqrt(np.mean(audio_chunks[-1]**2))  # type: ignore
-                        if rms > silence_threshold:
-                            last_audio_time = time.time()
-                        elif time.time() - last_audio_time > 1.0:  # 1 second of silence
-                            break
-
-            if not audio_chunks:
-                logger.warning("No audio recorded.")
-                return ""
+            source = source or MicrophoneSource(SAMPLE_RATE)
+            samplerate = SAMPLE_RATE
+            limit = MAX_CAPTURE_SECONDS * samplerate
+            buffer = self.buffer
+            buffer.reset()
+            endpointer = self.endpointer
+            endpointer.reset()
+            self.partial_transcript = ""
+            self.last_latency = None
+            self.last_compute = 0.0
+            self.last_endpoint_delay = None
 
-            audio = np.concatenate(audio_chunks).flatten()
+            streamer = _WindowStreamer(self, buffer, samplerate) if self.streaming else None
 
-            # Transcribe with language detection
-            lang = None if self.language == "auto" else self.language
-            segments, info = self.model.transcribe(audio, language=lang)
-            text = " ".join([segment.text for segment in segments]).strip()
+            with source:
+                if streamer:
+                    streamer.start()
+                started = time.time()
 
-            # Log detected language for auto mode
-            if self.language == "auto" and hasattr(info, 'language'):
-                logger.info("Detected language: %s", info.language)
+                while buffer.total_written < limit and time.time() - started < MAX_CAPTURE_SECONDS:
+                    block = source.read()
+                    if block is None:
+                        break
+                    block = block[:limit - buffer.total_written]
+                    buffer.write(block)
+                    if source.live and endpointer.process(block):
+                        break
 
-            return text.lower()
+            if endpointer.timed_out:
+                if streamer:
+                    streamer.stop()
+                logger.info("No speech detected.")
+                return ""
+            self.last_endpoint_delay = endpointer.delay
+            if endpointer.delay is not None:
+                logger.info("Endpointing delay: %.0f ms (noise floor %.0f dB)",
+                            endpointer.delay * 1000, endpointer.noise_floor_db)
+            return self._finish_capture(streamer)
 
         except (OSError, ValueError, RuntimeError, AttributeError) as e:
             logger.error("Error in listen method: %s", e)
             return ""
+
+    def replay(self, audio: Any, realtime: bool = True) -> str:
+        """Transcribe recorded audio through the same path as ``listen``.
+
+        With ``realtime`` the audio arrives at recording speed, so streaming
+        mode transcribes windows while the clip is still "being spoken" and
+        ``last_latency`` measures the end-of-speech delay a user would notice.
+        """
+        return self.listen(ArraySource(audio, SAMPLE_RATE, realtime=realtime))
+
+    def transcribe_file(self, path: str) -> str:
+        """Transcribe a whole recording of any length in one pass."""
+        text, _ = self._transcribe(load_audio(path, SAMPLE_RATE))
+        return text
+
+    def _finish_capture(self, streamer: Optional["_WindowStreamer"]) -> str:
+        """Transcribe whatever capture has not yet committed and record latency."""
+        capture_end = time.time()
+        if not self.buffer.total_written:
+            if streamer:
+                streamer.stop()
+            logger.warning("No audio recorded.")
+            return ""
+
+        if streamer:
+            text = streamer.finish()
+        else:
+            text, _ = self._transcribe(self.buffer.view())
+
+        self.last_latency = time.time() - capture_end
+        logger.info("End of speech to text: %.0f ms", self.last_latency * 1000)
+        return text.lower()
+
+    def _decode(self, audio: Any, language: Optional[str],
+                initial_prompt: Optional[str]) -> Tuple[str, Any, List[Any]]:
+        """Run Whisper and return the text, info and decoded segments."""
+        started = time.perf_counter()
+        segments, info = self.model.transcribe(
+            audio, language=language, initial_prompt=initial_prompt,
+            beam_size=self.whisper_config["beam_size"]
+        )
+        segments = list(segments)
+        text = " ".join([segment.text for segment in segments]).strip()
+        self.last_compute += time.perf_counter() - started
+        return text, info, segments
+
+    def _transcribe(self, audio: Any, language: Optional[str] = None,
+                    initial_prompt: Optional[str] = None) -> Tuple[str, Any]:
+        """Transcribe an audio array.
+
+        Args:
+            audio: Mono float32 samples at 16 kHz.
+            language: Language code to force; defaults to the configured
+                language, or in auto mode to the tracker's sticky language.
+            initial_prompt: Preceding transcript, used to keep windows coherent.
+
+        Returns:
+            The transcribed text and the faster-whisper info object.
+        """
+        tracked = False
+        if language is None:
+            if self.language != "auto":
+                language = self.language
+            elif self.language_tracker is not None:
+                language = self.language_tracker.choose()
+                tracked = True
+
+        text, info, segments = self._decode(audio, language, initial_prompt)
+        if tracked:
+            decision = self.language_tracker.observe(language, info, segments)
+            if decision.dropped:
+                # The sticky language decoded poorly; detect it for this audio
+                logger.info("Low confidence in %s, re-detecting language", language)
+                text, info, segments = self._decode(audio, None, initial_prompt)
+                decision = self.language_tracker.observe(None, info, segments)
+            self.last_language_decision = decision
+
+        self.last_language = getattr(info, "language", language)
+
+        # Log detected language for auto mode
+        if self.language == "auto" and hasattr(info, 'language'):
+            logger.info("Detected language: %s", info.language)
+
+        return text, info
+
+
+class _WindowStreamer:
+    """Transcribes committed audio windows on a background thread during capture."""
+
+    def __init__(self, stt: SpeechToText, buffer: AudioRingBuffer, samplerate: int):
+        self.stt = stt
+        self.buffer = buffer
+        self.samplerate = samplerate
+        self.committed = 0  # Samples already transcribed
+        self.texts: List[str] = []
+        self.language: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start transcribing windows in the background."""
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and wait for any window in progress."""
+        self._stop.set()
+        self._thread.join()
+
+    def finish(self) -> str:
+        """Stop streaming, transcribe the remaining tail and return the full text."""
+        self.stop()
+        audio = self.buffer.view()
+        if len(audio) > self.committed:
+            self._commit(audio, len(audio))
+        return " ".join(text for text in self.texts if text).strip()
+
+    def _run(self):
+        window = int(self.stt.window_seconds * self.samplerate)
+        while not self._stop.wait(0.25):
+            audio = self.buffer.view()
+            # Keep one second beyond the window so the cut can land in a pause
+            if len(audio) - self.committed < window + self.samplerate:
+                continue
+            try:
+                self._commit(audio, self._cut_point(audio, self.committed + window))
+            except (ValueError, RuntimeError) as e:
+                logger.error("Streaming transcription error: %s", e)
+
+    def _cut_point(self, audio: Any, target: int) -> int:
+        """Find the quietest 50 ms frame in the second after ``target``."""
+        frame = self.samplerate // 20
+        region = audio[target:target + self.samplerate]
+        frames = len(region) // frame
+        if frames == 0:
+            return target
+        energy = np.mean(region[:frames * frame].reshape(frames, frame) ** 2, axis=1)
+        return target + int(np.argmin(energy)) * frame + frame // 2
+
+    def _commit(self, audio: Any, end: int):
+        """Transcribe ``audio[committed:end]`` and append it to the transcript."""
+        with self._lock:
+            prompt = " ".join(self.texts)[-200:] or None
+            text, info = self.stt._transcribe(  # pylint: disable=protected-access
+                audio[self.committed:end], self.language, prompt
+            )
+            if self.language is None and self.stt.language == "auto":
+                # Keep the first window's language for the rest of the utterance
+                self.language = getattr(info, "language", None)
+            self.texts.append(text)
+            self.committed = end
+            self.stt.partial_transcript = " ".join(t for t in self.texts if t).strip()
+        if self.stt.on_partial:
+            self.stt.on_partial(self.stt.partial_transcript)
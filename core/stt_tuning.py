@@ -0,0 +1,171 @@
+"""Pick the fastest Whisper configuration that is accurate enough on this machine.
+
+Every candidate combination of model size, compute type, CPU threads,
+workers and beam size transcribes a set of short command recordings. The
+fastest candidate whose word error rate stays under the accuracy floor is
+saved to ``WHISPER_CONFIG_PATH``, which ``SpeechToText`` loads at startup.
+
+Usage::
+
+    python -m core.stt_tuning --fixtures fixtures/stt
+
+The fixtures directory holds WAV clips and a ``manifest.json`` describing
+them (see ``utils.audio_io.load_manifest``).
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core.speech_to_text import (
+    DEFAULT_WHISPER_CONFIG, SAMPLE_RATE, WHISPER_CONFIG_PATH, SpeechToText
+)
+from utils.audio_io import load_manifest, load_wav
+from utils.logger import logger
+from utils.wer import edit_distance, normalize_transcript
+
+MODEL_SIZES = ("tiny", "base", "small")
+COMPUTE_TYPES = ("int8", "int8_float32")
+BEAM_SIZES = (1, 5)
+WORKER_COUNTS = (1, 2)
+DEFAULT_MAX_WER = 0.15
+
+
+def default_thread_counts() -> List[int]:
+    """Return CPU thread counts worth trying on this machine."""
+    cores = os.cpu_count() or 1
+    return sorted({count for count in (2, 4, cores) if count <= cores})
+
+
+def evaluate(stt: SpeechToText, clips: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Transcribe every clip and return speed and accuracy figures.
+
+    Clips are transcribed by ``num_workers`` threads at once, matching how
+    many transcriptions the model was configured to run in parallel.
+    """
+    def transcribe(clip: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        text, _ = stt._transcribe(  # pylint: disable=protected-access
+            clip["samples"], clip["language"]
+        )
+        return text, time.perf_counter() - started
+
+    workers = stt.whisper_config["num_workers"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outputs = list(pool.map(transcribe, clips))
+    wall = time.perf_counter() - started
+
+    errors = 0
+    words = 0
+    for clip, (text, _) in zip(clips, outputs):
+        reference = normalize_transcript(clip["text"])
+        errors += edit_distance(reference, normalize_transcript(text))
+        words += len(reference)
+    audio_seconds = sum(len(clip["samples"]) for clip in clips) / SAMPLE_RATE
+    return {
+        "rtf": wall / audio_seconds,
+        "wer": errors / max(1, words),
+        "mean_latency_ms": 1000 * sum(elapsed for _, elapsed in outputs) / len(outputs),
+    }
+
+
+def tune(clips: List[Dict[str, Any]], model_sizes: List[str], compute_types: List[str],
+         thread_counts: List[int], worker_counts: List[int], beam_sizes: List[int],
+         max_wer: float = DEFAULT_MAX_WER) -> Dict[str, Any]:
+    """Measure every candidate and return all results plus the chosen config."""
+    results = []
+    for model_size, compute_type, threads, workers in itertools.product(
+            model_sizes, compute_types, thread_counts, worker_counts):
+        config = dict(DEFAULT_WHISPER_CONFIG, model_size=model_size, compute_type=compute_type,
+                      cpu_threads=threads, num_workers=workers)
+        started = time.perf_counter()
+        # In-process, so num_workers can run transcriptions concurrently
+        stt = SpeechToText(streaming=False, whisper_config=config, use_worker=False)
+        load_seconds = time.perf_counter() - started
+        # Warm up so the first timed clip does not pay for lazy initialization
+        stt._transcribe(  # pylint: disable=protected-access
+            clips[0]["samples"], clips[0]["language"]
+        )
+
+        # Beam size only affects decoding, so one loaded model serves both
+        for beam_size in beam_sizes:
+            stt.whisper_config["beam_size"] = beam_size
+            measured = evaluate(stt, clips)
+            result = {"config": dict(stt.whisper_config), "load_seconds": load_seconds,
+                      **measured}
+            results.append(result)
+            logger.info("%s: RTF %.3f, WER %.1f%%, %.0f ms per clip", result["config"],
+                        measured["rtf"], measured["wer"] * 100, measured["mean_latency_ms"])
+        del stt
+
+    return {"results": results, "best": choose(results, max_wer)}
+
+
+def choose(results: List[Dict[str, Any]], max_wer: float) -> Optional[Dict[str, Any]]:
+    """Return the fastest result within the accuracy floor, else the most accurate."""
+    if not results:
+        return None
+    accurate = [result for result in results if result["wer"] <= max_wer]
+    if accurate:
+        return min(accurate, key=lambda result: result["rtf"])
+    logger.warning("No configuration reached WER <= %.0f%%; keeping the most accurate",
+                   max_wer * 100)
+    return min(results, key=lambda result: (result["wer"], result["rtf"]))
+
+
+def save_config(best: Dict[str, Any], path: str = WHISPER_CONFIG_PATH):
+    """Persist the chosen configuration with the measurements behind it."""
+    data = dict(best["config"])
+    data["measured"] = {
+        "rtf": round(best["rtf"], 4),
+        "wer": round(best["wer"], 4),
+        "mean_latency_ms": round(best["mean_latency_ms"], 1),
+        "cpu_count": os.cpu_count(),
+        "tuned_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    """Command-line entry point for Whisper tuning."""
+    parser = argparse.ArgumentParser(description="Tune Whisper settings for this machine")
+    parser.add_argument("--fixtures", required=True, help="Directory with manifest.json")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_SIZES))
+    parser.add_argument("--compute-types", nargs="+", default=list(COMPUTE_TYPES))
+    parser.add_argument("--threads", type=int, nargs="+", default=default_thread_counts())
+    parser.add_argument("--workers", type=int, nargs="+", default=list(WORKER_COUNTS))
+    parser.add_argument("--beams", type=int, nargs="+", default=list(BEAM_SIZES))
+    parser.add_argument("--max-wer", type=float, default=DEFAULT_MAX_WER,
+                        help="Accuracy floor as a maximum word error rate")
+    parser.add_argument("--output", default=WHISPER_CONFIG_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Report without saving")
+    args = parser.parse_args()
+
+    clips = load_manifest(args.fixtures)
+    if not clips:
+        raise SystemExit(f"No clips listed in {args.fixtures}/manifest.json")
+    for clip in clips:
+        clip["samples"] = load_wav(clip["audio"], SAMPLE_RATE)
+
+    report = tune(clips, args.models, args.compute_types, args.threads, args.workers,
+                  args.beams, args.max_wer)
+    print("RTF     WER     ms/clip  config")
+    for result in sorted(report["results"], key=lambda result: result["rtf"]):
+        print(f"{result['rtf']:.3f}  {result['wer']:6.1%}  {result['mean_latency_ms']:7.0f}  "
+              f"{result['config']}")
+
+    best = report["best"]
+    print(f"Best: {best['config']}")
+    if not args.dry_run:
+        save_config(best, args.output)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
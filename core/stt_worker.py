@@ -0,0 +1,204 @@
+"""Whisper inference in a dedicated worker process.
+
+Transcription in the main interpreter holds the GIL for long stretches and
+makes the overlay, TTS and skill threads stutter. ``WhisperWorker`` keeps a
+preloaded, warmed-up model in a separate process instead. Audio is copied
+into a shared-memory block rather than pickled, and segments come back over
+a queue as they are decoded, so partial text is available before the final
+result. A worker that dies is restarted on the next request.
+
+``WhisperWorker.transcribe`` mirrors ``WhisperModel.transcribe`` closely
+enough that ``SpeechToText`` can use either.
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.logger import logger
+
+STARTUP_TIMEOUT = 120.0  # Model download and load on first run can be slow
+REQUEST_TIMEOUT = 60.0
+
+
+def _worker_main(whisper_config: Dict[str, Any], requests: Any, results: Any):
+    """Worker process: load and warm up the model, then serve requests."""
+    from core.speech_to_text import create_whisper_model  # pylint: disable=import-outside-toplevel
+
+    model = create_whisper_model(whisper_config)
+    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1)
+    list(segments)  # Decoding is lazy; consume to finish the warm-up
+    results.put(("ready", None, None))
+
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        job, shm_name, length, options = request
+        try:
+            if shm_name not in attached:
+                # The parent replaced the block with a larger one
+                for old in attached.values():
+                    old.close()
+                # Spawned children share the parent's resource tracker, so
+                # attaching here does not make this process own the block
+                attached = {shm_name: shared_memory.SharedMemory(name=shm_name)}
+            audio = np.ndarray((length,), dtype=np.float32, buffer=attached[shm_name].buf)
+            segments, info = model.transcribe(audio, **options)
+            decoded = []
+            for segment in segments:
+                decoded.append({"text": segment.text, "avg_logprob": segment.avg_logprob,
+                                "start": segment.start, "end": segment.end})
+                results.put(("partial", job, " ".join(s["text"] for s in decoded).strip()))
+            results.put(("result", job, {
+                "segments": decoded,
+                "language": info.language,
+                "language_probability": info.language_probability,
+                "duration": info.duration,
+            }))
+        except Exception as e:  # pylint: disable=broad-except
+            results.put(("error", job, str(e)))
+    for shm in attached.values():
+        shm.close()
+
+
+class WhisperWorker:
+    """Client for a long-lived Whisper worker process."""
+
+    def __init__(self, whisper_config: Dict[str, Any], capacity: int = 16000 * 11):
+        """Start the worker.
+
+        Args:
+            whisper_config: Settings passed to ``create_whisper_model``.
+            capacity: Initial shared-memory size in samples; grows on demand.
+        """
+        self.whisper_config = dict(whisper_config)
+        self.on_partial: Optional[Callable[[str], None]] = None
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._jobs = itertools.count()
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity * 4)
+        self._process: Any = None
+        self._requests: Any = None
+        self._results: Any = None
+        self._ready = threading.Event()
+        self._closed = False
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self):
+        """Spawn the worker process; it loads and warms up the model right away."""
+        self._ready.clear()
+        self._requests = self._context.Queue()
+        self._results = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker_main, args=(self.whisper_config, self._requests, self._results),
+            daemon=True, name="whisper-worker"
+        )
+        self._process.start()
+        logger.info("Started Whisper worker process %s", self._process.pid)
+
+    def _wait_ready(self):
+        """Block until the worker has loaded and warmed up its model."""
+        if self._ready.is_set():
+            return
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if not self._process.is_alive():
+                raise RuntimeError("Whisper worker exited during startup")
+            try:
+                kind, _, _ = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if kind == "ready":
+                self._ready.set()
+                return
+        raise RuntimeError("Whisper worker did not become ready")
+
+    def restart(self):
+        """Replace the worker process, e.g. after a crash or a hung request."""
+        self.restarts += 1
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(5)
+        self._start()
+
+    def _write_audio(self, audio: Any) -> int:
+        """Copy audio into shared memory, growing it if needed."""
+        samples = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        if samples.nbytes > self._shm.size:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=samples.nbytes)
+        np.ndarray(samples.shape, dtype=np.float32, buffer=self._shm.buf)[:] = samples
+        return len(samples)
+
+    def transcribe(self, audio: Any, **options: Any) -> Tuple[List[Any], Any]:
+        """Transcribe audio in the worker.
+
+        Accepts the same keyword options as ``WhisperModel.transcribe`` and
+        returns (segments, info) objects with the attributes SpeechToText
+        uses. A crashed worker is restarted and the request retried once.
+        """
+        with self._lock:
+            for attempt in range(2):
+                if not self._process.is_alive():
+                    logger.warning("Whisper worker died; restarting")
+                    self.restart()
+                try:
+                    self._wait_ready()
+                    return self._request(audio, options)
+                except RuntimeError:
+                    if attempt or self._process.is_alive():
+                        raise
+            raise RuntimeError("Whisper worker unavailable")
+
+    def _request(self, audio: Any, options: Dict[str, Any]) -> Tuple[List[Any], Any]:
+        """Send one job and collect partials until its result arrives."""
+        job = next(self._jobs)
+        length = self._write_audio(audio)
+        self._requests.put((job, self._shm.name, length, options))
+        deadline = time.monotonic() + REQUEST_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                kind, result_job, payload = self._results.get(timeout=0.5)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError("Whisper worker died during transcription")
+                continue
+            if result_job != job:
+                continue  # Left over from a request that timed out
+            if kind == "partial":
+                if self.on_partial:
+                    self.on_partial(payload)
+            elif kind == "error":
+                raise ValueError(payload)
+            else:
+                segments = [SimpleNamespace(**segment) for segment in payload.pop("segments")]
+                return segments, SimpleNamespace(**payload)
+        logger.error("Whisper worker timed out; restarting")
+        self.restart()
+        raise RuntimeError("Whisper worker timed out")
+
+    def close(self):
+        """Stop the worker and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._process is not None and self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._shm.close()
+        self._shm.unlink()
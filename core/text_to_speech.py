@@ -1,21 +1,72 @@
 """Text-to-speech functionality."""
 
-from typing import Any
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import functools
+import queue
+import threading
 import time
 
+import numpy as np
 import pyttsx3  # type: ignore
 
+from core.phrase_cache import PhraseCache
+from core.speech_scheduler import (  # pylint: disable=unused-import
+    PRIORITY_ALARM, PRIORITY_PROACTIVE, PRIORITY_REPLY, SpeechScheduler
+)
+from core.tts_pipeline import ChunkTiming, SpeechPipeline, render_to_array
+from core.voice_profiles import DEFAULT_VOICE_MODE, VOICE_PROFILES, VoiceProfile
+from utils.audio_io import resample
 from utils.logger import logger
+from utils.sentences import SentenceSegmenter, split_sentences
 
 
 class TextToSpeech:
-    """Handles text-to-speech conversion using pyttsx3."""
+    """Handles text-to-speech conversion using pyttsx3.
+
+    All speech goes through one process-wide ``SpeechScheduler`` whose worker
+    thread is the only user of the engine. ``speak`` returns immediately with
+    a future; call ``.result()`` on it to wait until the text has been spoken.
+    Fixed and frequently repeated phrases are played from a ``PhraseCache``
+    of pre-rendered audio when sounddevice is available.
+
+    ``stop`` interrupts whatever is being said, e.g. when the user barges in.
+    """
 
     _engine: Any = None
+    _voices: Optional[List[Any]] = None
+    _applied: Dict[str, Any] = {}  # Properties currently set on the engine
+    _resolved: Dict[str, Tuple[str, Dict[str, Any]]] = {}  # Profile name -> (key, properties)
+    _phrase_cache: Optional[PhraseCache] = None
+    _scheduler: Optional[SpeechScheduler] = None
+    _scheduler_lock = threading.Lock()
+    _speaking = threading.Event()
+    _interrupted = threading.Event()
+    _interrupt_lock = threading.Lock()
+    _interruptions = 0  # Requests made before the latest ``stop`` are not spoken
+    _engine_speaking = False
+    _now_playing: Optional[Tuple[Any, int, float]] = None  # (audio, samplerate, started)
 
     def __init__(self):
-        self.voice_mode = "jarvis"
-        self._init_engine()
+        self.voice_mode = DEFAULT_VOICE_MODE
+        self.profile: VoiceProfile = VOICE_PROFILES[DEFAULT_VOICE_MODE]
+        self.last_first_audio_latency: Optional[float] = None
+        self.last_chunk_timings: List[ChunkTiming] = []
+        # Create the engine on the worker thread that will use it
+        scheduler = self._get_scheduler()
+        scheduler.run(self._init_engine, label="init engine")
+        scheduler.run(functools.partial(self._resolve_profile, self.profile),
+                      label=f"profile {self.profile.name}")
+        self.warm_up()
+
+    @classmethod
+    def _get_scheduler(cls) -> SpeechScheduler:
+        """Return the process-wide speech scheduler, starting it on first use."""
+        with cls._scheduler_lock:
+            if cls._scheduler is None:
+                cls._scheduler = SpeechScheduler()
+            return cls._scheduler
 
     @classmethod
     def _init_engine(cls):
@@ -25,46 +76,364 @@ class TextToSpeech:
             # Set default properties
             cls._engine.setProperty('rate', 180)  # type: ignore  # Words per minute
             cls._engine.setProperty('volume', 0.9)  # type: ignore  # Volume level (0.0 to 1.0)
+            cls._applied = {"rate": 180, "volume": 0.9}
+
+    @classmethod
+    def _get_voices(cls) -> List[Any]:
+        """Return the installed voices, enumerating them only once."""
+        if cls._voices is None:
+            try:
+                cls._voices = list(cls._engine.getProperty('voices') or [])  # type: ignore
+            except (AttributeError, RuntimeError) as e:
+                logger.warning("Could not list TTS voices: %s", e)
+                cls._voices = []
+        return cls._voices
+
+    @classmethod
+    def _resolve_profile(cls, profile: VoiceProfile) -> Tuple[str, Dict[str, Any]]:
+        """Return (cache key, engine properties) for a profile, resolving it once."""
+        resolved = cls._resolved.get(profile.name)
+        if resolved is None:
+            cls._init_engine()
+            resolved = profile.resolve(cls._get_voices())
+            cls._resolved[profile.name] = resolved
+        return resolved
+
+    @classmethod
+    def _get_phrase_cache(cls) -> Optional[PhraseCache]:
+        """Return the process-wide phrase cache, or None if playback is unavailable."""
+        with cls._scheduler_lock:
+            if cls._phrase_cache is None:
+                cls._phrase_cache = PhraseCache()
+            return cls._phrase_cache if cls._phrase_cache.available else None
+
+    def warm_up(self) -> int:
+        """Queue rendering of the warm-up phrases for the current voice profile.
+
+        Renders run at proactive priority, so they never delay real speech,
+        and are not cancelled by ``stop``. Returns how many phrases were queued.
+        """
+        cache = self._get_phrase_cache()
+        if cache is None:
+            return 0
+        scheduler = self._get_scheduler()
+        profile = self.profile
+        for phrase in sorted(cache.phrases):
+            scheduler.run(
+                functools.partial(self._prerender, cache, profile, phrase),
+                PRIORITY_PROACTIVE, label=f"render {profile.name}: {phrase}",
+            )
+        return len(cache.phrases)
+
+    def _prerender(self, cache: PhraseCache, profile: VoiceProfile, text: str):
+        """Render one phrase for ``profile`` unless it is already cached."""
+        key, _ = self._resolve_profile(profile)
+        if cache.get(key, text) is None:
+            cache.render(key, text, functools.partial(self._synthesize_to_file, profile))
+
+    def _synthesize_to_file(self, profile: VoiceProfile, text: str, path: str):
+        """Write ``text`` spoken with ``profile`` to an audio file."""
+        self._apply_profile(profile)
+        self._engine.save_to_file(text, path)  # type: ignore
+        self._engine.runAndWait()  # type: ignore
 
     def set_voice_mode(self, mode: str):
-        """Set voice profile mode."""
-        if mode in ["normal", "jarvis"]:
+        """Set voice profile mode.
+
+        The profile is resolved against the installed voices once, on the
+        speech worker, before any further speech.
+        """
+        previous = self.voice_mode
+        if mode in VOICE_PROFILES:
             self.voice_mode = mode
         else:
             logger.warning("Unknown voice mode: %s. Using jarvis mode.", mode)
-            self.voice_mode = "jarvis"
+            self.voice_mode = DEFAULT_VOICE_MODE
+        if self.voice_mode != previous:
+            self.profile = VOICE_PROFILES[self.voice_mode]
+            self._get_scheduler().run(
+                functools.partial(self._resolve_profile, self.profile),
+                label=f"profile {self.profile.name}",
+            )
+            self.warm_up()
 
-    def speak(self, text: str):
+    def speak(self, text: str, priority: int = PRIORITY_REPLY,
+              max_age: Optional[float] = None) -> "Future[Any]":
         """
-        Convert text to speech.
+        Queue text to be spoken and return without waiting.
+
+        Text of several sentences is synthesized a sentence at a time, each
+        one rendered while the previous one plays, when audio playback is
+        available; ``last_chunk_timings`` then holds the per-sentence timing.
 
         Args:
             text (str): The text to speak.
+            priority (int): PRIORITY_ALARM, PRIORITY_REPLY or PRIORITY_PROACTIVE.
+            max_age (float): Drop the text if it has not started within this
+                many seconds.
+
+        Returns:
+            Future: Completes when the text has been spoken, or is cancelled
+            if it was dropped.
         """
         if not text or not text.strip():
             logger.warning("Empty or None text provided to speak method.")
+            done: "Future[Any]" = Future()
+            done.set_result(None)
+            return done
+
+        # Alarms survive ``stop``; other requests are cut off by it
+        generation = None if priority == PRIORITY_ALARM else TextToSpeech._interruptions
+        sentences = split_sentences(text)
+        if len(sentences) > 1 and self._get_phrase_cache() is not None:
+            job = functools.partial(self._run_speech, generation, self._say_chunked, sentences)
+        else:
+            job = functools.partial(self._run_speech, generation, self._say, text)
+        return self._get_scheduler().submit(text, job, priority, max_age)
+
+    async def speak_async(self, text: str, priority: int = PRIORITY_REPLY,
+                          max_age: Optional[float] = None) -> Any:
+        """Queue text to be spoken and wait for it without blocking the event loop."""
+        return await asyncio.wrap_future(self.speak(text, priority, max_age))
+
+    def cancel(self, priority: Optional[int] = None) -> int:
+        """Drop queued speech, optionally only of one priority."""
+        return self._get_scheduler().cancel(priority)
+
+    @property
+    def speaking(self) -> bool:
+        """Whether speech is being output right now."""
+        return self._speaking.is_set()
+
+    @property
+    def supports_barge_in(self) -> bool:
+        """Whether speech is played from known PCM that barge-in can gate against."""
+        return self._get_phrase_cache() is not None
+
+    def stop(self):
+        """Cut off the current speech and drop queued replies and tips.
+
+        Queued alarms are kept. A ``speak_stream`` in progress stops queueing
+        further sentences.
+        """
+        cls = TextToSpeech
+        with cls._interrupt_lock:
+            cls._interruptions += 1
+            cls._interrupted.set()
+        self.cancel(PRIORITY_REPLY)
+        self.cancel(PRIORITY_PROACTIVE)
+        if cls._now_playing is not None and cls._phrase_cache is not None:
+            cls._phrase_cache.stop()
+        if cls._engine_speaking:
+            try:
+                cls._engine.stop()  # type: ignore
+            except (RuntimeError, AttributeError) as e:
+                logger.warning("Could not stop the TTS engine: %s", e)
+
+    def reference(self, count: int, samplerate: int = 16000) -> Optional[Any]:
+        """Return the last ``count`` samples of speech output at ``samplerate``.
+
+        Speech is played from known PCM when sounddevice is available, which
+        is used to recognize the assistant's own voice at the microphone.
+        While nothing plays this is silence; while the engine speaks directly
+        its output is unknown and None is returned.
+        """
+        playing = TextToSpeech._now_playing
+        if playing is None:
+            return None if TextToSpeech._engine_speaking else np.zeros(count, dtype=np.float32)
+        audio, rate, started = playing
+        end = min(int((time.monotonic() - started) * rate), len(audio))
+        window = resample(audio[max(0, end - int(count * rate / samplerate)):end],
+                          rate, samplerate)[-count:]
+        if len(window) < count:
+            window = np.concatenate((np.zeros(count - len(window), dtype=np.float32), window))
+        return window.astype(np.float32, copy=False)
+
+    def speak_stream(self, chunks: Iterable[str], started_at: Optional[float] = None) -> str:
+        """
+        Speak streamed text sentence by sentence while it is still arriving.
+
+        The chunks are drained on a background thread so generation keeps going
+        while earlier sentences are being spoken. Sentences are queued as
+        replies; the call returns once they have all been spoken.
+
+        Args:
+            chunks (Iterable[str]): Text chunks, e.g. from a streaming LLM reply.
+            started_at (float): ``time.perf_counter()`` value to measure
+                time-to-first-audio from. Defaults to the call time.
+
+        Returns:
+            str: The full text that was streamed.
+        """
+        started_at = time.perf_counter() if started_at is None else started_at
+        self.last_first_audio_latency = None
+        pending: "queue.Queue[Optional[str]]" = queue.Queue()
+        received: List[str] = []
+
+        def drain():
+            try:
+                for chunk in chunks:
+                    received.append(chunk)
+                    pending.put(chunk)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Error reading text stream: %s", e)
+            finally:
+                pending.put(None)
+
+        threading.Thread(target=drain, daemon=True).start()
+
+        def say_first(sentence: str):
+            self.last_first_audio_latency = time.perf_counter() - started_at
+            logger.debug("Time to first audio: %.0f ms", self.last_first_audio_latency * 1000)
+            self._say(sentence, pre_roll=True)
+
+        scheduler = self._get_scheduler()
+        segmenter = SentenceSegmenter()
+        spoken: List["Future[Any]"] = []
+        generation = TextToSpeech._interruptions
+        while generation == TextToSpeech._interruptions:  # Stop queueing once cut off
+            try:
+                chunk = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                remainder = segmenter.flush()
+                sentences = [remainder] if remainder else []
+            else:
+                sentences = segmenter.feed(chunk)
+            for sentence in sentences:
+                if spoken:
+                    job = functools.partial(
+                        self._run_speech, generation, self._say, sentence, pre_roll=False
+                    )
+                else:
+                    job = functools.partial(self._run_speech, generation, say_first, sentence)
+                # A reply may repeat a sentence ("No. ... No."); speak each copy
+                spoken.append(scheduler.submit(sentence, job, PRIORITY_REPLY, dedup=False))
+            if chunk is None:
+                break
+
+        # Wait until every sentence has been spoken, dropped or cancelled
+        wait(spoken)
+        return "".join(received)
+
+    @classmethod
+    def _run_speech(cls, generation: Optional[int], job: Callable[..., Any],
+                    *args: Any, **kwargs: Any):
+        """Run a speech job on the worker with the speaking flag set.
+
+        ``generation`` is the interruption count when the request was made;
+        the job is skipped if ``stop`` has been called since. None (alarms)
+        is never skipped.
+        """
+        with cls._interrupt_lock:
+            if generation is not None and generation != cls._interruptions:
+                return
+            cls._interrupted.clear()
+        cls._speaking.set()
+        try:
+            job(*args, **kwargs)
+        finally:
+            cls._speaking.clear()
+
+    @classmethod
+    def _play(cls, cache: PhraseCache, entry: Tuple[Any, int]) -> bool:
+        """Play rendered speech, publishing it as the barge-in reference.
+
+        Returns False only if the output device failed.
+        """
+        if cls._interrupted.is_set():
+            return True
+        cls._now_playing = (entry[0], entry[1], time.monotonic())
+        try:
+            return cache.play(entry)
+        finally:
+            cls._now_playing = None
+
+    def _render_chunk(self, cache: PhraseCache, profile: VoiceProfile,
+                      text: str) -> Optional[Tuple[Any, int]]:
+        """Render one sentence, from the phrase cache when it is worth caching."""
+        if cache.should_cache(text):
+            key, _ = self._resolve_profile(profile)
+            entry = cache.get(key, text) or cache.render(
+                key, text, functools.partial(self._synthesize_to_file, profile)
+            )
+            if entry is not None:
+                return entry
+        return self._render_uncached(profile, text)
+
+    def _render_uncached(self, profile: VoiceProfile, text: str) -> Optional[Tuple[Any, int]]:
+        """Render text to PCM without keeping it in the phrase cache."""
+        try:
+            return render_to_array(functools.partial(self._synthesize_to_file, profile), text)
+        except (OSError, RuntimeError, ValueError, ImportError) as e:
+            logger.error("Error synthesizing speech chunk: %s", e)
+            return None
+
+    def _say_chunked(self, sentences: List[str]):
+        """Speak several sentences, synthesizing each while the previous one plays."""
+        try:
+            self._init_engine()
+        except (RuntimeError, OSError, AttributeError) as e:
+            logger.error("Error in text-to-speech: %s", e)
             return
+        cache = self._get_phrase_cache()
+        if cache is None:
+            for sentence in sentences:
+                if self._interrupted.is_set():
+                    break
+                self._say(sentence, pre_roll=sentence is sentences[0])
+            return
+        pipeline = SpeechPipeline(
+            functools.partial(self._render_chunk, cache, self.profile),
+            functools.partial(self._play, cache), stop_event=self._interrupted
+        )
+        self.last_chunk_timings = pipeline.run(sentences)
+
+    @classmethod
+    def _apply_profile(cls, profile: VoiceProfile):
+        """Set the engine properties of a profile that differ from the current ones."""
+        _, properties = cls._resolve_profile(profile)
+        for name, value in properties.items():
+            if cls._applied.get(name) != value:
+                cls._engine.setProperty(name, value)  # type: ignore
+                cls._applied[name] = value
 
+    def _say(self, text: str, pre_roll: bool = True):
+        """Apply the voice profile and speak one piece of text."""
         try:
             self._init_engine()
 
-            # Apply voice profile settings
-            if self.voice_mode == "jarvis":
-                # Slower rate (15% slower)
-                self._engine.setProperty('rate', 153)  # type: ignore
-                # Lower pitch if supported
-                try:
-                    voices = self._engine.getProperty('voices')  # type: ignore
-                    if voices:
-                        self._engine.setProperty('voice', voices[0].id)  # type: ignore
-                except (AttributeError, IndexError, RuntimeError):
-                    pass  # Fail gracefully if pitch control unsupported
+            # With sounddevice, speech is played from rendered PCM so barge-in
+            # can tell the assistant's voice from the user's. Pre-rendered
+            # phrases start at once and skip the pre-roll pause.
+            profile = self.profile
+            cache = self._get_phrase_cache()
+            if cache is not None:
+                if cache.should_cache(text):
+                    key, _ = self._resolve_profile(profile)
+                    entry = cache.get(key, text) or cache.render(
+                        key, text, functools.partial(self._synthesize_to_file, profile)
+                    )
+                else:
+                    entry = self._render_uncached(profile, text)
+                    if entry is not None and pre_roll and profile.pre_roll:
+                        time.sleep(profile.pre_roll)
+                if entry is not None and self._play(cache, entry):
+                    return
+
+            self._apply_profile(profile)
+            if pre_roll and profile.pre_roll:
                 # Pause before speaking
-                time.sleep(0.4)
-            else:  # normal mode
-                self._engine.setProperty('rate', 180)  # type: ignore
+                time.sleep(profile.pre_roll)
+            if self._interrupted.is_set():
+                return
 
-            self._engine.say(text)  # type: ignore
-            self._engine.runAndWait()  # type: ignore
+            TextToSpeech._engine_speaking = True
+            try:
+                self._engine.say(text)  # type: ignore
+                self._engine.runAndWait()  # type: ignore
+            finally:
+                TextToSpeech._engine_speaking = False
         except (RuntimeError, OSError, AttributeError) as e:
             logger.error("Error in text-to-speech: %s", e)
@@ -0,0 +1,134 @@
+"""Overlapped synthesis and playback for multi-sentence speech.
+
+Speaking a long answer as one engine call means nothing is heard until the
+whole text is synthesized. ``SpeechPipeline`` synthesizes one sentence at a
+time on the calling thread (the only thread allowed to use the engine) and
+plays finished sentences on a playback thread, so sentence N+1 is rendered
+while sentence N is playing and the wait before audio starts is the cost
+of the first sentence only.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from utils.audio_io import read_audio
+from utils.logger import logger
+
+
+class ChunkTiming:
+    """When one sentence was synthesized and played, relative to the start."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.synth_start: Optional[float] = None
+        self.synth_end: Optional[float] = None
+        self.play_start: Optional[float] = None
+        self.play_end: Optional[float] = None
+        self.played = False
+
+    @property
+    def synth_seconds(self) -> Optional[float]:
+        """Time spent synthesizing the sentence."""
+        if self.synth_start is None or self.synth_end is None:
+            return None
+        return self.synth_end - self.synth_start
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        """Time the rendered sentence waited for the previous one to finish."""
+        if self.synth_end is None or self.play_start is None:
+            return None
+        return self.play_start - self.synth_end
+
+    def __repr__(self) -> str:
+        return (f"ChunkTiming({self.text[:30]!r}, synth={self.synth_start}-{self.synth_end}, "
+                f"play={self.play_start}-{self.play_end})")
+
+
+def render_to_array(synthesize_to_file: Callable[[str, str], None],
+                    text: str) -> Tuple[Any, int]:
+    """Synthesize ``text`` through a temporary file and return (audio, samplerate)."""
+    handle, path = tempfile.mkstemp(suffix=".wav")
+    os.close(handle)
+    try:
+        synthesize_to_file(text, path)
+        return read_audio(path)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SpeechPipeline:
+    """Synthesizes ahead of playback, one sentence at a time."""
+
+    def __init__(self, synthesize: Callable[[str], Optional[Tuple[Any, int]]],
+                 play: Callable[[Tuple[Any, int]], bool], lookahead: int = 1,
+                 stop_event: Optional[threading.Event] = None):
+        """Create a pipeline.
+
+        Args:
+            synthesize: Returns (audio, samplerate) for a sentence, or None
+                if it could not be rendered. Runs on the thread calling ``run``.
+            play: Plays rendered audio, blocking until done; returns False on
+                failure. Runs on the playback thread.
+            lookahead: Rendered sentences that may wait to be played.
+            stop_event: When set, no further sentences are synthesized or played.
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = max(1, lookahead)
+        self.stop_event = stop_event or threading.Event()
+
+    def run(self, sentences: Iterable[str],
+            started_at: Optional[float] = None) -> List[ChunkTiming]:
+        """Speak the sentences and return their timings once playback ends.
+
+        Times are seconds since ``started_at`` (a ``time.perf_counter()``
+        value), which defaults to the call time.
+        """
+        started_at = time.perf_counter() if started_at is None else started_at
+        rendered: "queue.Queue[Optional[Tuple[ChunkTiming, Any]]]" = queue.Queue(self.lookahead)
+        timings: List[ChunkTiming] = []
+
+        def playback():
+            while True:
+                item = rendered.get()
+                if item is None:
+                    return
+                timing, entry = item
+                if self.stop_event.is_set():
+                    continue  # Keep draining so the producer never blocks
+                timing.play_start = time.perf_counter() - started_at
+                try:
+                    timing.played = self.play(entry)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("Error playing speech chunk: %s", e)
+                timing.play_end = time.perf_counter() - started_at
+
+        player = threading.Thread(target=playback, daemon=True, name="speech-playback")
+        player.start()
+        try:
+            for sentence in sentences:
+                if self.stop_event.is_set():
+                    break
+                timing = ChunkTiming(sentence)
+                timings.append(timing)
+                timing.synth_start = time.perf_counter() - started_at
+                entry = self.synthesize(sentence)
+                timing.synth_end = time.perf_counter() - started_at
+                if entry is not None:
+                    rendered.put((timing, entry))  # Blocks while the lookahead is full
+        finally:
+            rendered.put(None)
+            player.join()
+
+        for timing in timings:
+            logger.debug("Speech chunk %r: synth %.0f ms, wait %.0f ms", timing.text[:40],
+                         (timing.synth_seconds or 0) * 1000, (timing.wait_seconds or 0) * 1000)
+        return timings
@@ -0,0 +1,62 @@
+"""Voice profiles for the TTS engine."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class VoiceProfile:
+    """Engine settings for one voice mode.
+
+    ``resolve`` turns the profile into concrete engine properties once the
+    installed voices are known; ``TextToSpeech`` caches the result and only
+    sets properties whose value actually changed.
+    """
+
+    def __init__(self, name: str, rate: int, volume: float = 0.9,
+                 voice_index: Optional[int] = None, voice_id: Optional[str] = None,
+                 pre_roll: float = 0.0):
+        """Create a profile.
+
+        Args:
+            name: Voice mode name, e.g. "jarvis".
+            rate: Speaking rate in words per minute.
+            volume: Volume from 0.0 to 1.0.
+            voice_index: Installed voice to use by position, if any.
+            voice_id: Installed voice to use by id; takes precedence over
+                ``voice_index`` when it is installed.
+            pre_roll: Seconds of silence before an utterance.
+        """
+        self.name = name
+        self.rate = rate
+        self.volume = volume
+        self.voice_index = voice_index
+        self.voice_id = voice_id
+        self.pre_roll = pre_roll
+
+    def resolve(self, voices: List[Any]) -> Tuple[str, Dict[str, Any]]:
+        """Return (cache key, engine properties) for the installed ``voices``.
+
+        The key identifies how the profile sounds, so audio rendered with one
+        key can be replayed for any profile that resolves to the same key.
+        """
+        properties: Dict[str, Any] = {"rate": self.rate, "volume": self.volume}
+        ids = [getattr(voice, "id", None) for voice in voices]
+        if self.voice_id is not None and self.voice_id in ids:
+            properties["voice"] = self.voice_id
+        elif self.voice_index is not None and -len(ids) <= self.voice_index < len(ids):
+            properties["voice"] = ids[self.voice_index]
+        key = "|".join(f"{name}={properties[name]}" for name in sorted(properties))
+        return key, properties
+
+    def __repr__(self) -> str:
+        return (f"VoiceProfile({self.name!r}, rate={self.rate}, volume={self.volume}, "
+                f"voice_index={self.voice_index}, voice_id={self.voice_id!r}, "
+                f"pre_roll={self.pre_roll})")
+
+
+DEFAULT_VOICE_MODE = "jarvis"
+
+VOICE_PROFILES = {
+    # Slower rate (15% slower), first installed voice, pause before speaking
+    "jarvis": VoiceProfile("jarvis", rate=153, voice_index=0, pre_roll=0.4),
+    "normal": VoiceProfile("normal", rate=180),
+}
@@ -1,5 +1,11 @@
 """Wake word detection functionality."""
 import re
+import time
+from typing import Any, Optional
+
+from core.audio_capture import get_capture_service
+from core.wake_word_spotter import SAMPLE_RATE, WakeWordSpotter
+from utils.logger import logger
 
 
 class WakeWordDetector:
@@ -10,6 +16,14 @@ class WakeWordDetector:
         self.wake_word = wake_word.lower()
         self.is_listening = False
         self.wake_detected = False
+        self.spotter: Optional[WakeWordSpotter] = WakeWordSpotter.load()
+        if self.spotter is None:
+            logger.warning(
+                "No wake word templates found; listening without a wake word, so "
+                "every listening cycle runs speech recognition. "
+                "Run 'python -m core.wake_word_spotter enroll' to enroll them."
+            )
+        self._subscription: Any = None
         self.sleep_words = [
             "go to sleep", "sleep mode", "stop listening", "jarvis sleep",
             "सो जाओ", "सोने का समय", "बंद करो"
@@ -41,18 +55,39 @@ class WakeWordDetector:
         normalized_text = text.lower()
         return any(sleep_cmd in normalized_text for sleep_cmd in self.sleep_words)
 
-    def detect(self) -> bool:
-        """Detect wake word from audio input."""
-        # For now, return True to simulate wake word detection
-        # In a real implementation, this would listen for audio input
-        return True
+    def detect(self, timeout: float = 1.0) -> bool:
+        """Listen for the spoken wake word.
+
+        Blocks for up to ``timeout`` seconds. Listening stops once the wake
+        word is heard so the command that follows is not matched again.
+        Without enrolled templates every call reports a detection.
+        """
+        if self.spotter is None:
+            return True
+        if not self.is_listening:
+            self.start_listening()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            block = self._subscription.read(timeout=deadline - time.monotonic())
+            if len(block) and self.spotter.process(block):
+                self.stop_listening()
+                self.wake_detected = True
+                logger.debug("Wake word spotted (score %.3f)", self.spotter.last_score)
+                return True
+        return False
 
     def start_listening(self):
         """Start continuous wake word detection."""
+        if self.spotter is not None and self._subscription is None:
+            self.spotter.reset()
+            self._subscription = get_capture_service().subscribe(SAMPLE_RATE, seconds=3.0)
         self.is_listening = True
 
     def stop_listening(self):
         """Stop wake word detection."""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
         self.is_listening = False
 
     def reset_wake_detection(self):
@@ -0,0 +1,311 @@
+"""Lightweight acoustic wake-word spotting.
+
+Incoming 16 kHz audio is turned into MFCC frames (25 ms windows, 10 ms hop)
+incrementally, and every hop the most recent window of frames is compared
+against enrolled recordings of the wake word with subsequence DTW. Quiet
+windows are skipped before any matching, so the steady-state cost in a
+silent room is a small FFT per 10 ms of audio.
+
+Enroll templates once with::
+
+    python -m core.wake_word_spotter enroll            # record from the mic
+    python -m core.wake_word_spotter enroll a.wav b.wav
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.audio_buffer import AudioRingBuffer
+from core.audio_capture import get_capture_service
+from utils.logger import logger
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 400  # 25 ms analysis window
+HOP_SAMPLES = 160  # 10 ms between frames
+FFT_SIZE = 512
+MEL_BANDS = 26
+CEPSTRA = 13
+TEMPLATES_PATH = "wake_word_templates.npz"
+DEFAULT_THRESHOLD = 0.30  # Mean cosine distance along the DTW path
+
+
+def _hz_to_mel(hz: Any) -> Any:
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel: Any) -> Any:
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def mel_filterbank(samplerate: int = SAMPLE_RATE, fft_size: int = FFT_SIZE,
+                   bands: int = MEL_BANDS) -> Any:
+    """Return a (bands, fft_size // 2 + 1) triangular mel filterbank."""
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(20.0), _hz_to_mel(samplerate / 2), bands + 2))
+    bins = np.fft.rfftfreq(fft_size, 1.0 / samplerate)
+    bank = np.zeros((bands, len(bins)), dtype=np.float32)
+    for band in range(bands):
+        low, center, high = edges[band:band + 3]
+        rising = (bins - low) / (center - low)
+        falling = (high - bins) / (high - center)
+        bank[band] = np.maximum(0.0, np.minimum(rising, falling))
+    return bank
+
+
+class FeatureExtractor:
+    """Computes frame-normalized MFCC vectors with precomputed tables."""
+
+    def __init__(self, samplerate: int = SAMPLE_RATE):
+        self.samplerate = samplerate
+        self.window = np.hamming(FRAME_SAMPLES).astype(np.float32)
+        self.filterbank = mel_filterbank(samplerate)
+        # DCT-II basis, skipping c0 so features ignore overall loudness
+        n = np.arange(MEL_BANDS)
+        k = np.arange(1, CEPSTRA)[:, None]
+        self.dct = np.cos(np.pi * k * (2 * n + 1) / (2 * MEL_BANDS)).astype(np.float32)
+
+    @staticmethod
+    def frame_count(samples: int) -> int:
+        """Return how many whole frames fit in ``samples`` samples."""
+        if samples < FRAME_SAMPLES:
+            return 0
+        return (samples - FRAME_SAMPLES) // HOP_SAMPLES + 1
+
+    @staticmethod
+    def frames(audio: Any) -> Any:
+        """Split audio into overlapping analysis frames without copying."""
+        count = FeatureExtractor.frame_count(len(audio))
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        return np.lib.stride_tricks.as_strided(
+            audio, shape=(count, FRAME_SAMPLES),
+            strides=(audio.strides[0] * HOP_SAMPLES, audio.strides[0]), writeable=False
+        )
+
+    def compute(self, audio: Any) -> Any:
+        """Return (features, frame_rms) for every whole frame of ``audio``.
+
+        Features are unit-length rows so a dot product is a cosine similarity.
+        """
+        frames = self.frames(audio)
+        if len(frames) == 0:
+            return np.zeros((0, CEPSTRA - 1), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        spectrum = np.abs(np.fft.rfft(frames * self.window, FFT_SIZE)) ** 2
+        log_mel = np.log(spectrum @ self.filterbank.T + 1e-8)
+        cepstra = log_mel @ self.dct.T
+        norms = np.linalg.norm(cepstra, axis=1, keepdims=True)
+        return (cepstra / np.maximum(norms, 1e-8)).astype(np.float32), rms.astype(np.float32)
+
+
+def dtw_distance(template: Any, window: Any) -> float:
+    """Return the best subsequence-DTW cost of ``template`` inside ``window``.
+
+    The template may start and end anywhere in the window. Each template frame
+    advances the window by 1 or 2 frames, or by 0 frames but never twice in a
+    row (the Itakura constraint), so a match spans half to twice the template
+    length and every row can be computed with vector operations. The cost is
+    the mean cosine distance along the path.
+    """
+    if len(template) == 0 or len(window) == 0:
+        return float("inf")
+    cost = 1.0 - template @ window.T
+    moved = cost[0].copy()  # Best path cost ending with a diagonal step
+    held = np.full_like(moved, np.inf)  # ...ending with a step that stayed put
+    for row in cost[1:]:
+        either = np.minimum(moved, held)
+        best = np.full_like(moved, np.inf)
+        best[1:] = either[:-1]
+        np.minimum(best[2:], either[:-2], out=best[2:])
+        held = row + moved
+        moved = row + best
+    return float(np.minimum(moved, held).min() / len(template))
+
+
+def trim_silence(audio: Any, threshold: float = 0.01, margin: int = 3) -> Any:
+    """Trim leading and trailing frames quieter than ``threshold`` RMS."""
+    frames = FeatureExtractor.frames(audio)
+    if len(frames) == 0:
+        return audio
+    loud = np.flatnonzero(np.sqrt(np.mean(np.square(frames), axis=1)) >= threshold)
+    if len(loud) == 0:
+        return audio[:0]
+    first = max(0, loud[0] - margin) * HOP_SAMPLES
+    last = min(len(frames) - 1, loud[-1] + margin) * HOP_SAMPLES + FRAME_SAMPLES
+    return audio[first:last]
+
+
+class WakeWordSpotter:
+    """Streaming keyword spotter matching audio against enrolled templates."""
+
+    def __init__(self, templates: Iterable[Any], threshold: float = DEFAULT_THRESHOLD,
+                 samplerate: int = SAMPLE_RATE, window_seconds: float = 1.5,
+                 check_seconds: float = 0.1, energy_threshold: float = 0.01,
+                 refractory_seconds: float = 1.0):
+        """Create a spotter.
+
+        Args:
+            templates: MFCC matrices of enrolled wake-word recordings.
+            threshold: Detection fires when the DTW cost falls below this.
+            samplerate: Sample rate of the audio passed to ``process``.
+            window_seconds: Audio searched for the wake word on each check.
+            check_seconds: How often the window is matched.
+            energy_threshold: Windows whose loudest frame is quieter than this
+                RMS level are skipped without matching.
+            refractory_seconds: Minimum time between two detections.
+        """
+        if samplerate != SAMPLE_RATE:
+            raise ValueError(f"WakeWordSpotter expects {SAMPLE_RATE} Hz audio")
+        self.templates = [np.asarray(t, dtype=np.float32) for t in templates]
+        self.threshold = threshold
+        self.energy_threshold = energy_threshold
+        self.extractor = FeatureExtractor(samplerate)
+        self.window_frames = int(window_seconds * samplerate / HOP_SAMPLES)
+        self.check_samples = int(check_seconds * samplerate)
+        self.refractory_samples = int(refractory_seconds * samplerate)
+        self.buffer = AudioRingBuffer(int(window_seconds * samplerate) + FRAME_SAMPLES)
+        self._features = np.zeros((0, CEPSTRA - 1), dtype=np.float32)
+        self._rms = np.zeros(0, dtype=np.float32)
+        self.last_score = float("inf")
+        self.reset()
+
+    def reset(self):
+        """Forget buffered audio, e.g. after the microphone was reopened."""
+        self.buffer.reset()
+        self._features = self._features[:0]
+        self._rms = self._rms[:0]
+        self._next_frame = 0
+        self._next_check = self.check_samples
+        self._last_detection = -self.refractory_samples
+        self.last_score = float("inf")
+        self._stats = {"checks": 0, "matched": 0, "detections": 0, "cpu_seconds": 0.0,
+                       "audio_seconds": 0.0}
+
+    @classmethod
+    def load(cls, path: str = TEMPLATES_PATH, **options: Any) -> Optional["WakeWordSpotter"]:
+        """Load templates saved by ``save_templates``, or None if there are none."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            templates = [data[key] for key in sorted(data.files)]
+        if not templates:
+            return None
+        return cls(templates, **options)
+
+    def _update_features(self):
+        """Extract features for every whole frame written since the last call."""
+        written = self.buffer.total_written
+        count = FeatureExtractor.frame_count(written - self._next_frame)
+        if count == 0:
+            return
+        end = self._next_frame + (count - 1) * HOP_SAMPLES + FRAME_SAMPLES
+        features, rms = self.extractor.compute(self.buffer.view(self._next_frame, end))
+        self._features = np.concatenate((self._features, features))[-self.window_frames:]
+        self._rms = np.concatenate((self._rms, rms))[-self.window_frames:]
+        self._next_frame += count * HOP_SAMPLES
+
+    def score(self, features: Any) -> float:
+        """Return the best DTW cost of any template inside ``features``."""
+        return min(dtw_distance(template, features) for template in self.templates)
+
+    def process(self, block: Any) -> bool:
+        """Feed a block of audio and return True if the wake word was spotted."""
+        started = time.process_time()
+        detected = False
+        # Large blocks are fed one check at a time so the ring buffer never
+        # overwrites audio that has not been turned into features yet
+        for offset in range(0, len(block), self.check_samples):
+            detected |= self._process_piece(block[offset:offset + self.check_samples])
+        self._stats["audio_seconds"] += len(block) / SAMPLE_RATE
+        self._stats["cpu_seconds"] += time.process_time() - started
+        return detected
+
+    def _process_piece(self, block: Any) -> bool:
+        """Write at most one check worth of audio and run any due checks."""
+        self.buffer.write(block)
+        detected = False
+        while self.buffer.total_written >= self._next_check:
+            position = self._next_check
+            self._next_check += self.check_samples
+            self._update_features()
+            self._stats["checks"] += 1
+            if len(self._rms) == 0 or float(self._rms.max()) < self.energy_threshold:
+                self.last_score = float("inf")
+                continue
+            self._stats["matched"] += 1
+            self.last_score = self.score(self._features)
+            if (self.last_score < self.threshold
+                    and position - self._last_detection >= self.refractory_samples):
+                self._last_detection = position
+                self._stats["detections"] += 1
+                # Start afresh so the same utterance cannot trigger again
+                self._features = self._features[:0]
+                self._rms = self._rms[:0]
+                detected = True
+        return detected
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return check counts and CPU time relative to audio time."""
+        stats = dict(self._stats)
+        audio = stats["audio_seconds"] or 1.0
+        stats["cpu_percent"] = 100.0 * stats["cpu_seconds"] / audio
+        return stats
+
+
+def templates_from_audio(recordings: Iterable[Any]) -> List[Any]:
+    """Turn wake-word recordings into trimmed MFCC templates."""
+    extractor = FeatureExtractor()
+    templates = []
+    for audio in recordings:
+        trimmed = trim_silence(np.asarray(audio, dtype=np.float32))
+        features, _ = extractor.compute(trimmed)
+        if len(features) >= 10:  # At least 100 ms of speech
+            templates.append(features)
+        else:
+            logger.warning("Skipping wake word recording without enough speech")
+    return templates
+
+
+def save_templates(templates: List[Any], path: str = TEMPLATES_PATH):
+    """Persist templates for ``WakeWordSpotter.load``."""
+    np.savez(path, **{f"template_{index:02d}": t for index, t in enumerate(templates)})
+
+
+def _record_samples(count: int, seconds: float) -> List[Any]:
+    """Record wake-word samples from the microphone."""
+    recordings = []
+    with get_capture_service().subscribe(SAMPLE_RATE) as subscription:
+        for index in range(count):
+            input(f"Press Enter and say the wake word ({index + 1}/{count})...")
+            recordings.append(subscription.record(seconds))
+    return recordings
+
+
+def main():
+    """Command-line entry point for enrolling wake-word templates."""
+    parser = argparse.ArgumentParser(description="Enroll wake word templates")
+    parser.add_argument("command", choices=["enroll"])
+    parser.add_argument("wavs", nargs="*", help="Recordings of the wake word (default: mic)")
+    parser.add_argument("--count", type=int, default=3, help="Samples to record from the mic")
+    parser.add_argument("--seconds", type=float, default=1.5, help="Length of each sample")
+    parser.add_argument("--output", default=TEMPLATES_PATH)
+    args = parser.parse_args()
+
+    if args.wavs:
+        from utils.audio_io import load_wav  # pylint: disable=import-outside-toplevel
+        recordings = [load_wav(path, SAMPLE_RATE) for path in args.wavs]
+    else:
+        recordings = _record_samples(args.count, args.seconds)
+
+    templates = templates_from_audio(recordings)
+    if not templates:
+        print("No usable wake word recordings.")
+        return
+    save_templates(templates, args.output)
+    print(f"Saved {len(templates)} wake word templates to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
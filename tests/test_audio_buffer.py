@@ -0,0 +1,50 @@
+"""Tests for the preallocated audio ring buffer."""
+
+import numpy as np
+
+from core.audio_buffer import AudioRingBuffer
+
+
+def filled(capacity: int, blocks) -> AudioRingBuffer:
+    buffer = AudioRingBuffer(capacity)
+    position = 0
+    for size in blocks:
+        buffer.write(np.arange(position, position + size, dtype=np.float32))
+        position += size
+    return buffer
+
+
+def test_positions_are_absolute_across_wraps():
+    buffer = filled(10, [4, 4, 4, 3])  # 15 samples through a 10-sample buffer
+    assert buffer.total_written == 15 and len(buffer) == 10
+    np.testing.assert_array_equal(buffer.view(8, 12), [8, 9, 10, 11])
+    np.testing.assert_array_equal(buffer.latest(3), [12, 13, 14])
+
+
+def test_overwritten_positions_are_clamped_to_the_oldest_sample():
+    buffer = filled(10, [7, 7])
+    np.testing.assert_array_equal(buffer.view(0), np.arange(4, 14))
+    assert len(buffer.view(20)) == 0
+
+
+def test_unwrapped_reads_are_views_and_wrapped_reads_are_copies():
+    buffer = filled(10, [6, 6])
+    assert buffer.view(2, 10).base is not None
+    wrapped = buffer.view(8, 12)
+    wrapped[:] = -1
+    np.testing.assert_array_equal(buffer.view(8, 12), [8, 9, 10, 11])
+
+
+def test_block_larger_than_capacity_keeps_the_newest_samples():
+    buffer = filled(10, [3, 25])
+    assert buffer.total_written == 28
+    np.testing.assert_array_equal(buffer.latest(10), np.arange(18, 28))
+    np.testing.assert_array_equal(buffer.view(20, 22), [20, 21])
+
+
+def test_reset_and_rms():
+    buffer = filled(10, [5])
+    buffer.reset()
+    assert buffer.total_written == 0 and len(buffer.view()) == 0 and buffer.rms(4) == 0.0
+    buffer.write(np.full(8, 0.5, dtype=np.float32))
+    assert abs(buffer.rms(4) - 0.5) < 1e-6
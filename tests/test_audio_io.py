@@ -0,0 +1,45 @@
+"""Tests for the block resampler in utils.audio_io."""
+
+import numpy as np
+import pytest
+
+from utils.audio_io import StreamResampler, resample
+
+
+def tone(frequency: float, samplerate: int, seconds: float = 1.0) -> np.ndarray:
+    return np.sin(2 * np.pi * frequency * np.arange(int(seconds * samplerate)) / samplerate)
+
+
+def in_blocks(resampler: StreamResampler, audio: np.ndarray, sizes=(97, 480, 661, 13)):
+    blocks, offset, index = [], 0, 0
+    while offset < len(audio):
+        size = sizes[index % len(sizes)]
+        blocks.append(resampler.process(audio[offset:offset + size]))
+        offset += size
+        index += 1
+    return np.concatenate(blocks)
+
+
+@pytest.mark.parametrize("orig_rate,target_rate", [(22050, 16000), (16000, 22050), (48000, 16000)])
+def test_blocks_match_reference_tone(orig_rate, target_rate):
+    resampler = StreamResampler(orig_rate, target_rate)
+    output = in_blocks(resampler, tone(440, orig_rate))
+    expected = tone(440, target_rate)[:len(output)]
+    # Everything but the last half kernel has been produced
+    assert len(output) >= target_rate - resampler.half_width * target_rate / orig_rate - 1
+    assert np.max(np.abs(output[200:] - expected[200:])) < 1e-3
+
+
+def test_block_size_does_not_change_output():
+    audio = np.random.default_rng(0).standard_normal(22050)
+    whole = StreamResampler(22050, 16000).process(audio)
+    blocked = in_blocks(StreamResampler(22050, 16000), audio)
+    np.testing.assert_allclose(blocked, whole[:len(blocked)], atol=1e-5)
+
+
+def test_downsampling_rejects_content_above_nyquist():
+    audio = tone(10000, 22050)
+    output = in_blocks(StreamResampler(22050, 16000), audio)[500:-500]
+    aliased = resample(audio, 22050, 16000)[500:-500]
+    assert np.sqrt(np.mean(output ** 2)) < 0.01
+    assert np.sqrt(np.mean(aliased ** 2)) > 0.1
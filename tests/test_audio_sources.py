@@ -0,0 +1,24 @@
+"""Tests for the audio sources SpeechToText captures from."""
+
+import numpy as np
+import pytest
+
+from core.audio_sources import BLOCK_SECONDS, SAMPLE_RATE, ArraySource, AudioSource
+
+
+def test_source_must_implement_read():
+    class Incomplete(AudioSource):  # pylint: disable=abstract-method
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()  # pylint: disable=abstract-class-instantiated
+
+
+def test_array_source_yields_blocks_until_exhausted():
+    samples = np.arange(SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+    with ArraySource(samples) as source:
+        blocks = []
+        while (block := source.read()) is not None:
+            blocks.append(block)
+    assert all(len(block) == int(BLOCK_SECONDS * SAMPLE_RATE) for block in blocks[:-1])
+    np.testing.assert_array_equal(np.concatenate(blocks), samples)
@@ -0,0 +1,76 @@
+"""Tests for BargeInDetector on synthetic microphone and playback audio."""
+
+import numpy as np
+import pytest
+
+from core.audio_capture import BLOCK_SECONDS
+from core.barge_in import SAMPLE_RATE, BargeInDetector
+
+ECHO_DELAY = int(0.03 * SAMPLE_RATE)
+ONSET = 1.5
+
+
+def speech_like(seconds: float, seed: int, amplitude: float = 0.3) -> np.ndarray:
+    """Noise shaped by a 4 Hz syllable envelope, loud enough to pass the VAD."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (amplitude * envelope * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def echo_of(playback: np.ndarray, coupling: float, seed: int = 99) -> np.ndarray:
+    """What the microphone hears of the playback: delayed, attenuated, plus room noise."""
+    mic = np.zeros_like(playback)
+    mic[ECHO_DELAY:] = coupling * playback[:-ECHO_DELAY]
+    mic += 0.003 * np.random.default_rng(seed).standard_normal(len(mic)).astype(np.float32)
+    return mic
+
+
+def detect(detector: BargeInDetector, mic: np.ndarray, playback: np.ndarray):
+    """Feed capture-sized blocks; return the sample position of detection or None."""
+    step = int(BLOCK_SECONDS * SAMPLE_RATE)
+    for offset in range(0, len(mic), step):
+        if detector.process(mic[offset:offset + step], playback[offset:offset + step]):
+            return min(offset + step, len(mic))
+    return None
+
+
+@pytest.mark.parametrize("coupling", [0.1, 0.5, 1.0])
+def test_echo_only_does_not_trigger(coupling):
+    playback = speech_like(4.0, seed=1)
+    detector = BargeInDetector(SAMPLE_RATE, noise_floor_db=-50.0)
+    assert detect(detector, echo_of(playback, coupling), playback) is None
+
+
+@pytest.mark.parametrize("coupling", [0.05, 0.1])
+def test_user_over_echo_triggers_within_100_ms(coupling):
+    playback = speech_like(4.0, seed=1)
+    mic = echo_of(playback, coupling)
+    start = int(ONSET * SAMPLE_RATE)
+    mic[start:] += speech_like(4.0 - ONSET, seed=2)
+    detector = BargeInDetector(SAMPLE_RATE, noise_floor_db=-50.0)
+    position = detect(detector, mic, playback)
+    assert position is not None
+    assert start <= position <= start + int(0.1 * SAMPLE_RATE)
+    assert detector.onset_age <= position - start + detector.frame
+
+
+def test_silent_playback_detects_plain_speech():
+    silence = np.zeros(int(2.0 * SAMPLE_RATE), dtype=np.float32)
+    mic = echo_of(silence, 0.0)
+    start = int(1.0 * SAMPLE_RATE)
+    mic[start:] += speech_like(1.0, seed=3)
+    detector = BargeInDetector(SAMPLE_RATE, noise_floor_db=-50.0)
+    position = detect(detector, mic, silence)
+    assert position is not None and position >= start
+
+
+def test_reset_keeps_learned_coupling():
+    playback = speech_like(3.0, seed=1)
+    detector = BargeInDetector(SAMPLE_RATE, noise_floor_db=-50.0)
+    detect(detector, echo_of(playback, 0.3), playback)
+    learned = detector.coupling_db
+    detector.reset()
+    assert not detector.detected
+    assert detector.coupling_db == learned
+    assert learned < detector.initial_coupling_db
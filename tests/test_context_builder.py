@@ -0,0 +1,56 @@
+"""Tests for the token-budgeted chat context."""
+
+from utils.context_builder import ContextBuilder, estimate_tokens
+
+
+class FakeMemory:
+    """Stands in for PersistentMemory, returning turns oldest first."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.fetches = 0
+
+    def fetch_last(self, n=5):
+        self.fetches += 1
+        return self.turns[-n:]
+
+
+def test_seeds_from_memory_once_in_order():
+    memory = FakeMemory([("hi", "hello"), ("time?", "noon")])
+    builder = ContextBuilder(memory, token_budget=1000)
+    builder.build()
+    builder.build()
+    assert memory.fetches == 1
+    assert builder.build() == "User: hi\nJarvis: hello\nUser: time?\nJarvis: noon"
+
+
+def test_added_turns_appear_once_after_seeded_ones():
+    builder = ContextBuilder(FakeMemory([("a", "b")]), token_budget=1000)
+    builder.add("c", "d")
+    assert builder.build() == "User: a\nJarvis: b\nUser: c\nJarvis: d"
+
+
+def test_keeps_the_newest_whole_turns_within_budget():
+    builder = ContextBuilder(token_budget=30)
+    for n in range(10):
+        builder.add(f"question {n}", f"answer {n} " + "x" * 20)
+    context = builder.build()
+    assert "question 9" in context and "question 0" not in context
+    assert context.startswith("User: ")  # No partial turn at the start
+    assert builder.estimated_tokens() <= 30
+    kept = [int(line.split()[-1]) for line in context.split("\n") if line.startswith("User:")]
+    assert len(kept) >= 2 and kept == list(range(10 - len(kept), 10))  # Oldest first
+
+
+def test_max_turns_bounds_the_tail_and_empty_budget_gives_no_context():
+    builder = ContextBuilder(token_budget=10_000, max_turns=3)
+    for n in range(5):
+        builder.add(f"q{n}", f"a{n}")
+    assert builder.build().count("User:") == 3 and "q1" not in builder.build()
+    assert ContextBuilder(token_budget=0).build() == ""
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
@@ -0,0 +1,78 @@
+"""Tests for the adaptive endpointer on synthetic noise and speech."""
+
+import numpy as np
+
+from core.endpointer import Endpointer
+
+SAMPLE_RATE = 16000
+BLOCK = 480
+NOISE = 0.05
+
+
+def noise(seconds: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (NOISE * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+
+
+def utterance(snr_db: float, start: float = 0.5, end: float = 3.5,
+              total: float = 6.0, seed: int = 0) -> np.ndarray:
+    """Noise with word-like bursts between ``start`` and ``end``, soft gaps between words."""
+    audio = noise(total, seed)
+    t = np.arange(int((end - start) * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = np.where(t % 0.45 < 0.3, 0.6 + 0.4 * np.sin(2 * np.pi * 5 * t), 0.25)
+    speech = NOISE * 10 ** (snr_db / 20) * envelope
+    speech *= np.random.default_rng(seed + 1).standard_normal(len(t))
+    audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] += speech.astype(np.float32)
+    return audio
+
+
+def calibrated(**kwargs) -> Endpointer:
+    endpointer = Endpointer(SAMPLE_RATE, **kwargs)
+    endpointer.process(noise(0.3, seed=99))
+    endpointer.reset()
+    return endpointer
+
+
+def feed(endpointer: Endpointer, audio: np.ndarray) -> bool:
+    for offset in range(0, len(audio), BLOCK):
+        if endpointer.process(audio[offset:offset + BLOCK]):
+            return True
+    return False
+
+
+def test_ends_after_speech_with_bounded_delay():
+    endpointer = calibrated()
+    assert feed(endpointer, utterance(snr_db=20))
+    assert abs(endpointer.speech_start / SAMPLE_RATE - 0.5) < 0.05
+    assert abs(endpointer.speech_end / SAMPLE_RATE - 3.5) < 0.2
+    assert endpointer.min_hang <= endpointer.delay <= endpointer.max_hang + 0.05
+
+
+def test_low_snr_pauses_between_words_do_not_raise_the_floor():
+    endpointer = calibrated()
+    floor = highest = endpointer.noise_floor_db
+    audio = utterance(snr_db=14)
+    for offset in range(0, len(audio), BLOCK):
+        done = endpointer.process(audio[offset:offset + BLOCK])
+        highest = max(highest, endpointer.noise_floor_db)
+        if done:
+            break
+    assert endpointer.speech_end / SAMPLE_RATE > 3.3
+    assert highest - floor < 3.0
+
+
+def test_floor_follows_a_louder_room_during_silence():
+    endpointer = calibrated(leading_timeout=20.0)
+    floor = endpointer.noise_floor_db
+    feed(endpointer, 1.5 * noise(2.0, seed=5))  # 3.5 dB louder, below either margin
+    assert endpointer.noise_floor_db - floor > 3.0
+
+
+def test_leading_timeout_is_configurable():
+    endpointer = calibrated(leading_timeout=2.0)
+    assert feed(endpointer, noise(3.0, seed=3))
+    assert endpointer.timed_out and endpointer.endpoint is None
+    assert endpointer.position <= 2.0 * SAMPLE_RATE + endpointer.frame
+
+    patient = calibrated()
+    assert not feed(patient, noise(3.0, seed=3))
@@ -0,0 +1,110 @@
+"""Tests for local fast-path skill routing."""
+
+import pytest
+
+from core.fast_router import FastPathRouter
+
+
+class FakeSkill:
+    """A class-based skill with a ``commands`` keyword table."""
+
+    def __init__(self, commands, reply="done"):
+        self.commands = commands
+        self.reply = reply
+
+    def execute(self, text):
+        return self.reply
+
+
+class FakeSkillManager:
+    """Stands in for SkillManager, recording executed skills."""
+
+    def __init__(self, skills):
+        self.skills = {name: {"instance": skill} for name, skill in skills.items()}
+        self.executed = []
+
+    def execute_skill(self, skill_name, *args):
+        self.executed.append((skill_name, args))
+        return self.skills[skill_name]["instance"].execute(*args)
+
+
+@pytest.fixture
+def manager():
+    return FakeSkillManager({
+        "music": FakeSkill({"play": ["play music", "play"], "stop": ["stop"]}),
+        "productivity": FakeSkill({"task": ["add a task", "task"]}),
+        "pc_control": FakeSkill({"app": ["open"], "volume": ["volume"]}),
+    })
+
+
+def test_multi_word_phrase_wins_over_single_word_hits(manager):
+    router = FastPathRouter(manager)
+    # "play music" (2 words) beats the single-word "open" hit
+    assert router.match("open spotify and play music for me please") == "music"
+    assert router.route("play music") == "done"
+    assert manager.executed == [("music", ("play music",))]
+
+
+def test_single_word_hit_is_trusted_only_on_short_commands(manager):
+    router = FastPathRouter(manager, short_command_words=4)
+    assert router.match("stop") == "music"
+    assert router.match("please stop it now") == "music"
+    assert router.match("please stop telling me about the weather") is None
+
+
+def test_tie_falls_back_to_the_llm(manager):
+    router = FastPathRouter(manager)
+    assert router._decide("open task") == (None, True)
+    assert router._decide("stop the volume") == (None, True)
+    assert router.route("open task") is None
+    assert manager.executed == []
+
+
+def test_several_weak_hits_below_a_higher_threshold_are_ambiguous(manager):
+    router = FastPathRouter(manager, min_phrase_words=3)
+    # "play music" (2) beats "open" (1) but neither reaches the threshold
+    assert router._decide("open play music") == (None, True)
+
+
+def test_unmatched_command_is_a_miss(manager):
+    router = FastPathRouter(manager)
+    assert router._decide("tell me a joke") == (None, False)
+    assert router._decide("") == (None, False)
+
+
+def test_counters_track_hits_misses_and_ambiguous(manager):
+    router = FastPathRouter(manager)
+    router.route("play music")
+    router.route("add a task")
+    router.route("tell me a joke")
+    router.route("open task")
+    router.record_llm_route(0.5)
+    router.record_llm_route(1.5)
+
+    stats = router.get_stats()
+    assert stats["lookups"] == 4
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["ambiguous"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["round_trips_saved"] == 2
+    assert stats["llm_routes"] == 2
+    assert stats["avg_llm_route_ms"] == pytest.approx(1000.0)
+    assert "2/4 commands routed locally (50%)" in router.summary()
+
+
+def test_skill_declining_a_matched_command_counts_as_a_miss():
+    manager = FakeSkillManager({"music": FakeSkill({"play": ["play music"]}, reply=None)})
+    router = FastPathRouter(manager)
+    assert router.route("play music") is None
+    stats = router.get_stats()
+    assert (stats["hits"], stats["misses"]) == (0, 1)
+
+
+def test_function_skills_route_only_listed_phrases():
+    manager = FakeSkillManager({})
+    manager.skills["get_time_date"] = {"function": lambda: "noon"}
+    manager.skills["tell_joke"] = {"function": lambda text: "ha"}
+    router = FastPathRouter(manager)
+    assert router.match("what time is it") == "get_time_date"
+    assert router.match("tell me a joke") is None
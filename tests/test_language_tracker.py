@@ -0,0 +1,121 @@
+"""Tests for sticky language tracking in auto language mode."""
+
+import pytest
+
+from core.language_tracker import LanguageTracker
+
+
+class Info:
+    """Stands in for faster-whisper's TranscriptionInfo."""
+
+    def __init__(self, language, language_probability):
+        self.language = language
+        self.language_probability = language_probability
+
+
+class Segment:
+    """Stands in for a decoded faster-whisper segment."""
+
+    def __init__(self, text="", avg_logprob=-0.2):
+        self.text = text
+        self.avg_logprob = avg_logprob
+
+
+def test_detects_until_a_confident_language_sticks():
+    tracker = LanguageTracker(min_probability=0.7)
+    assert tracker.choose() is None
+
+    decision = tracker.observe(None, Info("hi", 0.55), [Segment()])
+    assert decision.source == "detected"
+    assert tracker.choose() is None  # Below the threshold: keep detecting
+
+    tracker.observe(None, Info("hi", 0.7), [Segment()])
+    assert tracker.choose() == "hi"
+
+
+def test_unsupported_language_never_sticks():
+    tracker = LanguageTracker(languages=("en", "hi"))
+    tracker.observe(None, Info("fr", 0.99), [Segment()])
+    assert tracker.choose() is None
+
+
+def test_confident_forced_decode_keeps_the_language():
+    tracker = LanguageTracker(min_logprob=-1.0)
+    tracker.observe(None, Info("en", 0.9), [Segment()])
+
+    decision = tracker.observe("en", Info("en", 1.0), [Segment(avg_logprob=-0.3)])
+    assert (decision.language, decision.source, decision.dropped) == ("en", "sticky", False)
+    assert decision.probability == pytest.approx(0.9)
+    assert tracker.choose() == "en"
+
+
+def test_low_confidence_drops_then_re_detection_switches_language():
+    tracker = LanguageTracker(min_logprob=-1.0)
+    tracker.observe(None, Info("en", 0.9), [Segment()])
+
+    # The same sequence SpeechToText._transcribe runs on a poor forced decode
+    language = tracker.choose()
+    decision = tracker.observe(language, Info("en", 1.0),
+                               [Segment(avg_logprob=-1.8), Segment(avg_logprob=-0.9)])
+    assert decision.dropped
+    assert tracker.choose() is None
+
+    decision = tracker.observe(None, Info("hi", 0.85), [Segment()])
+    assert (decision.language, decision.source) == ("hi", "detected")
+    assert tracker.last_decision is decision
+    assert tracker.choose() == "hi"
+
+
+def test_sticky_language_expires_after_max_uses():
+    tracker = LanguageTracker(max_sticky_uses=2)
+    tracker.observe(None, Info("en", 0.9), [Segment()])
+    for _ in range(2):
+        assert tracker.choose() == "en"
+        tracker.observe("en", Info("en", 1.0), [Segment()])
+    assert tracker.choose() is None
+
+    tracker.observe(None, Info("en", 0.9), [Segment()])
+    assert tracker.choose() == "en"
+
+
+def test_reset_forgets_the_sticky_language():
+    tracker = LanguageTracker()
+    tracker.observe(None, Info("en", 0.9), [Segment()])
+    tracker.reset()
+    assert tracker.choose() is None
+
+
+class FakeWhisper:
+    """Returns scripted decodes and records the language each call forced."""
+
+    def __init__(self, decodes):
+        self.decodes = list(decodes)
+        self.languages = []
+
+    def transcribe(self, audio, language=None, initial_prompt=None, beam_size=1):
+        self.languages.append(language)
+        segments, info = self.decodes.pop(0)
+        return iter(segments), info
+
+
+def test_transcribe_re_detects_when_the_sticky_language_decodes_poorly():
+    speech_to_text = pytest.importorskip("core.speech_to_text")
+    stt = speech_to_text.SpeechToText.__new__(speech_to_text.SpeechToText)
+    stt.language = "auto"
+    stt.language_tracker = LanguageTracker(min_logprob=-1.0)
+    stt.whisper_config = {"beam_size": 1}
+    stt.last_compute = 0.0
+    stt.model = FakeWhisper([
+        ([Segment("hello", -0.2)], Info("en", 0.95)),
+        ([Segment("namaste", -2.0)], Info("en", 1.0)),
+        ([Segment("namaste", -0.3)], Info("hi", 0.9)),
+    ])
+
+    assert stt._transcribe(None)[0] == "hello"
+    text, info = stt._transcribe(None)
+
+    assert stt.model.languages == [None, "en", None]
+    assert (text, info.language) == ("namaste", "hi")
+    assert stt.last_language == "hi"
+    assert stt.last_language_decision.source == "detected"
+    assert stt.language_tracker.choose() == "hi"
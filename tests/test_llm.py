@@ -0,0 +1,254 @@
+"""Tests for the resilience helpers in core.llm."""
+
+import asyncio
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from core.llm import (
+    DEGRADED_REPLY, CircuitBreaker, FakeBackend, GeminiLLM, LLMBackend, SingleFlight
+)
+from utils.metrics import metrics
+
+
+class ScriptedBackend(LLMBackend):
+    """Raises or answers according to a script, one entry per call."""
+
+    name = "scripted"
+
+    def __init__(self, script: List[object]):
+        self.script = list(script)
+
+    def _next(self) -> str:
+        outcome = self.script.pop(0) if self.script else "OK"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return str(outcome)
+
+    def generate(self, prompt: str) -> str:
+        return self._next()
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        reply = self._next()
+        for word in reply.split():
+            yield word + " "
+
+
+def make_llm(script: List[object]) -> GeminiLLM:
+    return GeminiLLM(
+        backend=ScriptedBackend(script), max_retries=0, deadline=2.0,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.1),
+    )
+
+
+def test_breaker_opens_and_half_open_trial_closes_it():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # Only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_half_open_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_rejected_trial_does_not_wedge_the_breaker():
+    llm = make_llm([ConnectionError("down"), ValueError("blocked"), "recovered"])
+    assert llm.generate_reply("a") == DEGRADED_REPLY
+    assert llm.breaker.state == "open"
+
+    time.sleep(0.15)
+    assert llm.generate_reply("b") == DEGRADED_REPLY  # Trial raises ValueError
+    assert llm.breaker.state == "closed"
+    assert llm.generate_reply("c") == "recovered"
+
+
+def test_abandoned_stream_releases_the_trial():
+    llm = make_llm([ConnectionError("down"), "one two three", "back again"])
+    assert llm.generate_reply("a") == DEGRADED_REPLY
+
+    time.sleep(0.15)
+    stream = llm.generate_reply_stream("b")
+    assert next(stream) == "one "
+    stream.close()  # Consumer stops early during the half-open trial
+    assert llm.breaker.state == "open"
+
+    time.sleep(0.15)
+    assert "".join(llm.generate_reply_stream("c")) == "back again "
+    assert llm.breaker.state == "closed"
+
+
+@pytest.mark.parametrize("error", [ValueError("blocked"), ConnectionError("down")])
+def test_stream_errors_yield_the_degraded_reply(error):
+    llm = make_llm([error])
+    assert list(llm.generate_reply_stream("a")) == [DEGRADED_REPLY]
+
+
+def test_backend_must_implement_generate():
+    class Incomplete(LLMBackend):  # pylint: disable=abstract-method
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()  # pylint: disable=abstract-class-instantiated
+
+
+def run_concurrently(flight: SingleFlight, key: str, fn, callers: int) -> List[object]:
+    """Call ``flight.do`` from several threads and collect results or exceptions."""
+    outcomes: List[object] = [None] * callers
+
+    def call(index: int):
+        try:
+            outcomes[index] = flight.do(key, fn)
+        except Exception as e:  # pylint: disable=broad-except
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def slow(result: object, entered: threading.Event, release: threading.Event):
+    def fn():
+        entered.set()
+        release.wait(5)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    return fn
+
+
+@pytest.mark.parametrize("result", ["shared reply", ConnectionError("down")])
+def test_single_flight_collapses_concurrent_calls(result):
+    flight = SingleFlight()
+    entered, release = threading.Event(), threading.Event()
+    leader = threading.Thread(target=run_concurrently,
+                              args=(flight, "k", slow(result, entered, release), 1))
+    leader.start()
+    entered.wait(5)
+    followers: List[object] = []
+    waiting = threading.Thread(
+        target=lambda: followers.extend(
+            run_concurrently(flight, "k", lambda: "should not run", 4)
+        )
+    )
+    waiting.start()
+    deadline = time.monotonic() + 5
+    while flight.get_stats()["collapsed"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    waiting.join(5)
+    assert all(outcome is result for outcome in followers)
+    assert flight.get_stats() == {"executed": 1, "collapsed": 4, "in_flight": 0}
+
+
+def test_single_flight_runs_again_once_the_call_finishes():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.do("other", lambda: 3) == 3
+    assert flight.get_stats()["executed"] == 3
+
+
+class SlowBackend(LLMBackend):
+    """Takes ``latency`` seconds per call and records the peak concurrency."""
+
+    name = "slow"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.latency)
+            return "late"
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.mark.parametrize("hedge", [False, True])
+def test_abandoned_calls_keep_counting_against_max_concurrency(hedge):
+    backend = SlowBackend(latency=0.5)
+    llm = GeminiLLM(backend=backend, max_concurrency=1, deadline=0.2, max_retries=2,
+                    backoff_base=0.01, hedge=hedge,
+                    breaker=CircuitBreaker(failure_threshold=100))
+    if hedge:
+        llm._latencies.extend([0.01] * 20)  # pylint: disable=protected-access
+    callers = [threading.Thread(target=llm.generate_reply, args=(f"prompt {n}",))
+               for n in range(3)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(5)
+    assert backend.peak == 1
+    deadline = time.monotonic() + 2
+    while llm.get_stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert llm.get_stats()["in_flight"] == 0 and backend.running == 0
+
+
+def wait_for_free_slot(llm: GeminiLLM, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while llm.get_stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return llm.get_stats()["in_flight"] == 0
+
+
+def test_cancelling_an_async_call_frees_its_slot():
+    backend = FakeBackend(default_response="slow", latency=5.0)
+    llm = GeminiLLM(backend=backend, max_concurrency=1, deadline=10.0)
+
+    async def cancel_midway():
+        task = asyncio.create_task(llm.generate_reply_async("slow prompt", timeout=10.0))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.monotonic()
+    asyncio.run(cancel_midway())  # Returns without waiting out the backend
+    assert time.monotonic() - started < 1.0
+    assert wait_for_free_slot(llm)
+    assert llm.breaker.state == "closed"
+    backend.latency = 0.0
+    assert llm.generate_reply("next prompt", deadline=0.5) == "slow"
+
+
+def test_async_timeout_is_degraded_and_recorded_once():
+    metrics.reset()
+    llm = GeminiLLM(backend=FakeBackend(latency=5.0), max_concurrency=1)
+    started = time.monotonic()
+    reply = asyncio.run(llm.generate_reply_async("p", timeout=0.2, call_site="async_timeout"))
+    assert reply == DEGRADED_REPLY and time.monotonic() - started < 1.0
+    recorded = metrics.snapshot()["async_timeout"]
+    assert recorded["calls"] == 1 and recorded["errors"] == 1
@@ -0,0 +1,146 @@
+"""Tests for the pre-rendered TTS phrase cache."""
+
+import os
+
+import numpy as np
+import pytest
+
+from core import phrase_cache
+from core.phrase_cache import REPEATS_TO_CACHE, PhraseCache
+from utils.audio_io import save_wav
+
+
+class FakeSoundDevice:
+    """Stands in for the sounddevice module, recording playback."""
+
+    class PortAudioError(Exception):
+        pass
+
+    def __init__(self):
+        self.played = []
+        self.stopped = 0
+        self.fail = False
+
+    def play(self, audio, samplerate):
+        if self.fail:
+            raise self.PortAudioError("no output device")
+        self.played.append((audio, samplerate))
+
+    def wait(self):
+        pass
+
+    def stop(self):
+        self.stopped += 1
+
+
+class FakeEngine:
+    """Renders each text as a short constant tone and counts renders."""
+
+    def __init__(self):
+        self.rendered = []
+
+    def save_to_file(self, text, path):
+        self.rendered.append(text)
+        save_wav(path, np.full(160, 0.1 * len(self.rendered), dtype=np.float32), 16000)
+
+
+@pytest.fixture
+def sd(monkeypatch):
+    fake = FakeSoundDevice()
+    monkeypatch.setattr(phrase_cache, "sd", fake)
+    return fake
+
+
+def test_miss_then_hit_after_render(tmp_path):
+    cache = PhraseCache(cache_dir=str(tmp_path), phrases=())
+    engine = FakeEngine()
+
+    assert cache.get("default", "Step completed.") is None
+    rendered = cache.render("default", "Step completed.", engine.save_to_file)
+    assert cache.get("default", " Step completed. ") is rendered
+    assert engine.rendered == ["Step completed."]
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["renders"], stats["entries"]) == (1, 1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PhraseCache(max_entries=2, cache_dir=None, phrases=())
+    engine = FakeEngine()
+    cache.render("default", "one", engine.save_to_file)
+    cache.render("default", "two", engine.save_to_file)
+    cache.get("default", "one")  # "two" is now the oldest
+    cache.render("default", "three", engine.save_to_file)
+
+    assert cache.get("default", "two") is None
+    assert cache.get("default", "one") is not None
+    assert cache.get("default", "three") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_memory_only_cache_leaves_no_files():
+    paths = []
+
+    def synthesize(text, path):
+        paths.append(path)
+        save_wav(path, np.ones(160, dtype=np.float32) * 0.5, 16000)
+
+    cache = PhraseCache(cache_dir=None, phrases=())
+    assert cache.render("default", "hello there", synthesize) is not None
+    assert not os.path.exists(paths[0])
+
+
+def test_disk_cache_is_keyed_by_profile_and_text(tmp_path):
+    engine = FakeEngine()
+    PhraseCache(cache_dir=str(tmp_path), phrases=()).render("jarvis", "hello", engine.save_to_file)
+    assert len(os.listdir(tmp_path)) == 1
+
+    restarted = PhraseCache(cache_dir=str(tmp_path), phrases=())
+    assert restarted.get("jarvis", "hello") is not None  # Read back from disk
+    assert restarted.get("friday", "hello") is None  # Another voice profile
+    assert restarted.get("jarvis", "goodbye") is None
+    assert engine.rendered == ["hello"]
+
+
+def test_disk_cache_is_pruned_to_max_entries(tmp_path):
+    cache = PhraseCache(cache_dir=str(tmp_path), max_disk_entries=2, phrases=())
+    engine = FakeEngine()
+    for index, text in enumerate(["one", "two", "three"]):
+        cache.render("default", text, engine.save_to_file)
+        path = cache._path("default", text)
+        os.utime(path, (index, index))  # Distinct modification times
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert not os.path.exists(cache._path("default", "one"))
+
+
+def test_failed_render_is_not_cached(tmp_path):
+    def broken(text, path):
+        raise RuntimeError("engine busy")
+
+    cache = PhraseCache(cache_dir=str(tmp_path), phrases=())
+    assert cache.render("default", "hello", broken) is None
+    assert cache.get("default", "hello") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_phrases_are_cached_when_listed_or_repeated():
+    cache = PhraseCache(cache_dir=None, phrases=["Step completed."])
+    assert cache.should_cache("Step completed.")
+    results = [cache.should_cache("Turning on the lights") for _ in range(REPEATS_TO_CACHE)]
+    assert results[-1] and not any(results[:-1])
+    assert not cache.should_cache("x" * (phrase_cache.MAX_PHRASE_CHARS + 1))
+
+
+def test_play_and_stop_use_sounddevice(sd):
+    cache = PhraseCache(cache_dir=None, phrases=())
+    entry = cache.render("default", "hello", FakeEngine().save_to_file)
+
+    assert cache.available
+    assert cache.play(entry)
+    assert sd.played == [entry]
+    cache.stop()
+    assert sd.stopped == 1
+
+    sd.fail = True
+    assert not cache.play(entry)
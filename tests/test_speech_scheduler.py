@@ -0,0 +1,99 @@
+"""Tests for SpeechScheduler ordering, deduplication, staleness and control jobs."""
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from core.speech_scheduler import (
+    PRIORITY_ALARM, PRIORITY_PROACTIVE, PRIORITY_REPLY, SpeechScheduler
+)
+
+
+@pytest.fixture
+def scheduler():
+    """A scheduler whose worker is held on a gate job until ``release`` is called."""
+    scheduler = SpeechScheduler()
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait(5)
+
+    scheduler.run(hold, label="gate")
+    started.wait(5)
+    scheduler.release = gate.set
+    yield scheduler
+    gate.set()
+
+
+def test_higher_priority_is_spoken_first(scheduler):
+    spoken = []
+    futures = [
+        scheduler.submit(text, lambda text=text: spoken.append(text), priority)
+        for text, priority in [("tip", PRIORITY_PROACTIVE), ("reply one", PRIORITY_REPLY),
+                               ("alarm", PRIORITY_ALARM), ("reply two", PRIORITY_REPLY)]
+    ]
+    scheduler.release()
+    wait(futures, timeout=5)
+    assert spoken == ["alarm", "reply one", "reply two", "tip"]
+
+
+def test_duplicate_text_shares_the_queued_future(scheduler):
+    spoken = []
+    first = scheduler.submit("Hello", lambda: spoken.append(1))
+    second = scheduler.submit("  hello ", lambda: spoken.append(2))
+    other_priority = scheduler.submit("hello", lambda: spoken.append(3), PRIORITY_ALARM)
+    assert second is first and other_priority is not first
+    scheduler.release()
+    wait([first, other_priority], timeout=5)
+    assert sorted(spoken) == [1, 3]
+    assert scheduler.get_stats()["deduplicated"] == 1
+
+
+def test_stale_items_are_dropped(scheduler):
+    spoken = []
+    stale = scheduler.submit("old news", lambda: spoken.append("old"), max_age=0.01)
+    fresh = scheduler.submit("current", lambda: spoken.append("new"), max_age=10)
+    time.sleep(0.05)
+    scheduler.release()
+    wait([stale, fresh], timeout=5)
+    assert stale.cancelled() and spoken == ["new"]
+    assert scheduler.get_stats()["stale"] == 1
+
+
+def test_control_jobs_are_not_deduplicated_counted_or_cancelled(scheduler):
+    ran = []
+    controls = [scheduler.run(lambda: ran.append("render"), PRIORITY_PROACTIVE, label="render")
+                for _ in range(2)]
+    speech = scheduler.submit("tip", lambda: ran.append("tip"), PRIORITY_PROACTIVE)
+    assert scheduler.cancel(PRIORITY_PROACTIVE) == 1
+    assert scheduler.pending() == 0
+    scheduler.release()
+    wait(controls, timeout=5)
+    assert ran == ["render", "render"] and speech.cancelled()
+    stats = scheduler.get_stats()
+    assert stats["spoken"] == 0 and stats["cancelled"] == 1
+
+
+def test_cancelled_items_release_waiters_while_the_worker_is_busy(scheduler):
+    futures = [scheduler.submit(f"reply {n}", lambda: None) for n in range(3)]
+    assert scheduler.cancel(PRIORITY_REPLY) == 3
+    done, not_done = wait(futures, timeout=1)
+    assert len(done) == 3 and not not_done
+
+
+def test_repeated_sentence_in_one_stream_is_spoken_twice(scheduler):
+    spoken = []
+    futures = [
+        scheduler.submit(sentence, lambda sentence=sentence: spoken.append(sentence),
+                         PRIORITY_REPLY, dedup=False)
+        for sentence in ["No.", "Absolutely not.", "No."]
+    ]
+    assert len(set(map(id, futures))) == 3
+    scheduler.release()
+    wait(futures, timeout=5)
+    assert spoken == ["No.", "Absolutely not.", "No."]
+    assert scheduler.get_stats()["deduplicated"] == 0
@@ -0,0 +1,117 @@
+"""Tests for overlapped sentence synthesis and playback."""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.tts_pipeline import SpeechPipeline, render_to_array
+from utils.audio_io import save_wav
+
+
+class Recorder:
+    """Records synthesize and play calls in the order they happen."""
+
+    def __init__(self, synth_delay=0.0, play_delay=0.0):
+        self.synth_delay = synth_delay
+        self.play_delay = play_delay
+        self.events = []
+        self.lock = threading.Lock()
+
+    def log(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def synthesize(self, sentence):
+        self.log(("synth", sentence))
+        time.sleep(self.synth_delay)
+        return None if sentence == "unrenderable" else (sentence, 22050)
+
+    def play(self, entry):
+        self.log(("play", entry[0]))
+        time.sleep(self.play_delay)
+        return True
+
+
+def test_plays_sentences_in_order():
+    recorder = Recorder()
+    timings = SpeechPipeline(recorder.synthesize, recorder.play).run(["one", "two", "three"])
+
+    played = [text for kind, text in recorder.events if kind == "play"]
+    assert played == ["one", "two", "three"]
+    assert [timing.text for timing in timings] == ["one", "two", "three"]
+    assert all(timing.played for timing in timings)
+
+
+def test_next_sentence_is_synthesized_while_the_previous_one_plays():
+    recorder = Recorder(synth_delay=0.02, play_delay=0.1)
+    timings = SpeechPipeline(recorder.synthesize, recorder.play).run(["one", "two"])
+
+    first, second = timings
+    assert second.synth_start < first.play_end
+    assert second.play_start >= first.play_end
+
+
+def test_unrenderable_sentence_is_skipped():
+    recorder = Recorder()
+    timings = SpeechPipeline(recorder.synthesize, recorder.play).run(
+        ["one", "unrenderable", "two"])
+
+    assert [text for kind, text in recorder.events if kind == "play"] == ["one", "two"]
+    assert not timings[1].played and timings[1].play_start is None
+
+
+def test_failed_playback_does_not_stop_later_sentences():
+    played = []
+
+    def play(entry):
+        played.append(entry[0])
+        if entry[0] == "one":
+            raise RuntimeError("device lost")
+        return True
+
+    timings = SpeechPipeline(lambda text: (text, 22050), play).run(["one", "two"])
+    assert played == ["one", "two"]
+    assert [timing.played for timing in timings] == [False, True]
+
+
+def test_stop_mid_pipeline_ends_synthesis_and_playback():
+    stop = threading.Event()
+    recorder = Recorder(play_delay=0.05)
+
+    def play(entry):
+        recorder.play(entry)
+        stop.set()  # Barge-in while the first sentence is playing
+        return True
+
+    pipeline = SpeechPipeline(recorder.synthesize, play, stop_event=stop)
+    timings = pipeline.run(["one", "two", "three", "four"])
+
+    assert [text for kind, text in recorder.events if kind == "play"] == ["one"]
+    synthesized = [text for kind, text in recorder.events if kind == "synth"]
+    assert "four" not in synthesized
+    assert timings[0].played
+    assert not any(timing.played for timing in timings[1:])
+
+
+def test_stop_before_run_speaks_nothing():
+    stop = threading.Event()
+    stop.set()
+    recorder = Recorder()
+    assert SpeechPipeline(recorder.synthesize, recorder.play, stop_event=stop).run(["one"]) == []
+    assert recorder.events == []
+
+
+def test_render_to_array_reads_back_and_removes_the_file():
+    written = []
+
+    def synthesize_to_file(text, path):
+        written.append(path)
+        save_wav(path, np.full(1600, 0.25, dtype=np.float32), 16000)
+
+    audio, samplerate = render_to_array(synthesize_to_file, "hello")
+    assert samplerate == 16000
+    assert len(audio) == 1600
+    assert np.allclose(audio, 0.25, atol=1e-3)
+    assert written and not os.path.exists(written[0])
@@ -0,0 +1,87 @@
+"""Tests for voice profile resolution and applying profiles to the engine."""
+
+import pytest
+
+from core.voice_profiles import VOICE_PROFILES, VoiceProfile
+
+
+class Voice:
+    """Stands in for an installed pyttsx3 voice."""
+
+    def __init__(self, voice_id):
+        self.id = voice_id
+
+
+VOICES = [Voice("david"), Voice("zira"), Voice("hazel")]
+
+
+class FakeEngine:
+    """Records every ``setProperty`` call."""
+
+    def __init__(self, voices=VOICES):
+        self.voices = voices
+        self.calls = []
+
+    def setProperty(self, name, value):  # pylint: disable=invalid-name
+        self.calls.append((name, value))
+
+    def getProperty(self, name):  # pylint: disable=invalid-name
+        return self.voices if name == "voices" else None
+
+
+def test_resolve_picks_voice_by_id_before_index():
+    profile = VoiceProfile("custom", rate=170, volume=0.8, voice_index=0, voice_id="hazel")
+    key, properties = profile.resolve(VOICES)
+    assert properties == {"rate": 170, "volume": 0.8, "voice": "hazel"}
+    assert key == "rate=170|voice=hazel|volume=0.8"
+
+
+def test_resolve_falls_back_to_index_when_id_is_not_installed():
+    profile = VoiceProfile("custom", rate=170, voice_index=-1, voice_id="missing")
+    assert profile.resolve(VOICES)[1]["voice"] == "hazel"
+
+
+def test_resolve_leaves_voice_unset_without_a_usable_voice():
+    assert "voice" not in VoiceProfile("custom", rate=170, voice_index=3).resolve(VOICES)[1]
+    assert "voice" not in VOICE_PROFILES["jarvis"].resolve([])[1]
+    assert "voice" not in VOICE_PROFILES["normal"].resolve(VOICES)[1]
+
+
+def test_profiles_that_sound_the_same_share_a_key():
+    first = VoiceProfile("a", rate=180, voice_index=1)
+    second = VoiceProfile("b", rate=180, voice_id="zira", pre_roll=0.5)
+    assert first.resolve(VOICES)[0] == second.resolve(VOICES)[0]
+    assert first.resolve(VOICES)[0] != VoiceProfile("c", rate=180).resolve(VOICES)[0]
+
+
+@pytest.fixture
+def tts(monkeypatch):
+    """TextToSpeech with a fake engine in place of pyttsx3's."""
+    text_to_speech = pytest.importorskip("core.text_to_speech")
+    cls = text_to_speech.TextToSpeech
+    engine = FakeEngine()
+    monkeypatch.setattr(cls, "_engine", engine)
+    monkeypatch.setattr(cls, "_voices", None)
+    monkeypatch.setattr(cls, "_applied", {"rate": 180, "volume": 0.9})
+    monkeypatch.setattr(cls, "_resolved", {})
+    return cls, engine
+
+
+def test_apply_profile_sets_only_changed_properties(tts):
+    cls, engine = tts
+    cls._apply_profile(VOICE_PROFILES["jarvis"])
+    assert sorted(engine.calls) == [("rate", 153), ("voice", "david")]
+
+    engine.calls.clear()
+    cls._apply_profile(VOICE_PROFILES["jarvis"])
+    assert engine.calls == []
+
+    cls._apply_profile(VOICE_PROFILES["normal"])
+    assert engine.calls == [("rate", 180)]  # Volume and voice are unchanged
+
+
+def test_profiles_are_resolved_once(tts):
+    cls, engine = tts
+    first = cls._resolve_profile(VOICE_PROFILES["jarvis"])
+    engine.voices = [Voice("other")]
+    assert cls._resolve_profile(VOICE_PROFILES["jarvis"]) is first
@@ -0,0 +1,120 @@
+"""Tests for the acoustic wake word spotter on synthetic audio."""
+
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.wake_word_benchmark import count_detections, run
+from core.wake_word import WakeWordDetector
+from core.wake_word_spotter import (
+    SAMPLE_RATE, FeatureExtractor, WakeWordSpotter, dtw_distance, save_templates,
+    templates_from_audio
+)
+from utils.audio_io import save_wav
+
+WAKE_WORD = (300, 900, 500)  # Pitch of each "syllable" in Hz
+OTHER_WORD = (700, 250, 1100)
+
+
+def word(pitches, stretch: float = 1.0, seed: int = 0) -> np.ndarray:
+    """Harmonic tones, one per syllable, standing in for a spoken word."""
+    syllables = []
+    for pitch in pitches:
+        t = np.arange(int(0.15 * stretch * SAMPLE_RATE)) / SAMPLE_RATE
+        tone = sum(np.sin(2 * np.pi * pitch * harmonic * t) / harmonic for harmonic in range(1, 6))
+        syllables.append(tone * np.hanning(len(t)) ** 0.3)
+    audio = np.concatenate(syllables)
+    audio = 0.3 * audio / np.max(np.abs(audio))
+    return (audio + 0.002 * np.random.default_rng(seed).standard_normal(len(audio))).astype(
+        np.float32)
+
+
+def clip(audio: np.ndarray, at: float = 1.0, seconds: float = 3.0, seed: int = 1) -> np.ndarray:
+    """Embed audio in quiet room noise."""
+    rng = np.random.default_rng(seed)
+    out = (0.002 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+    start = int(at * SAMPLE_RATE)
+    out[start:start + len(audio)] += audio
+    return out
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return templates_from_audio([word(WAKE_WORD, seed=1), word(WAKE_WORD, 1.1, seed=2)])
+
+
+def detections(spotter: WakeWordSpotter, audio: np.ndarray, block: int = 480):
+    return [offset for offset in range(0, len(audio), block)
+            if spotter.process(audio[offset:offset + block])]
+
+
+def test_dtw_identical_shifted_and_different_sequences():
+    features, _ = FeatureExtractor().compute(word(WAKE_WORD))
+    assert dtw_distance(features, features) == pytest.approx(0.0, abs=1e-5)
+    # Subsequence match: the template may start anywhere in the window
+    padded = np.concatenate((features[::-1][:20], features, features[::-1][:20]))
+    assert dtw_distance(features, padded) == pytest.approx(0.0, abs=1e-5)
+    stretched, _ = FeatureExtractor().compute(word(WAKE_WORD, stretch=1.4))
+    other, _ = FeatureExtractor().compute(word(OTHER_WORD))
+    assert dtw_distance(features, stretched) < 0.05
+    assert dtw_distance(features, other) > 0.3
+    assert dtw_distance(features, features[:0]) == float("inf")
+
+
+def test_matching_clip_triggers_once(templates):
+    spotter = WakeWordSpotter(templates)
+    hits = detections(spotter, clip(word(WAKE_WORD, stretch=0.95, seed=5)))
+    assert len(hits) == 1
+    assert SAMPLE_RATE <= hits[0] <= 1.8 * SAMPLE_RATE
+    assert spotter.get_stats()["detections"] == 1
+
+
+@pytest.mark.parametrize("audio", [
+    clip(word(OTHER_WORD, seed=5)),
+    clip(np.zeros(1), seconds=3.0),
+    (0.2 * np.random.default_rng(7).standard_normal(3 * SAMPLE_RATE)).astype(np.float32),
+], ids=["other word", "quiet room", "loud noise"])
+def test_non_matching_clip_does_not_trigger(templates, audio):
+    spotter = WakeWordSpotter(templates)
+    assert not detections(spotter, audio)
+
+
+def test_quiet_windows_skip_matching(templates):
+    spotter = WakeWordSpotter(templates)
+    detections(spotter, clip(np.zeros(1)))
+    stats = spotter.get_stats()
+    assert stats["checks"] > 0 and stats["matched"] == 0
+
+
+def test_count_detections_respects_threshold_and_refractory_period():
+    scores = [(1600, 0.5), (3200, 0.2), (4800, 0.1), (20000, 0.25), (40000, 0.4)]
+    assert count_detections(scores, 0.3, refractory_samples=16000) == 2
+    assert count_detections(scores, 0.3, refractory_samples=0) == 3
+    assert count_detections(scores, 0.05, refractory_samples=0) == 0
+
+
+def test_benchmark_reports_false_accepts_and_rejects(tmp_path, templates):
+    for label, clips in {
+        "positive": [clip(word(WAKE_WORD, 0.9, seed=8)), clip(word(WAKE_WORD, 1.05, seed=9))],
+        "negative": [clip(word(OTHER_WORD, seed=10)), clip(np.zeros(1), seed=11)],
+    }.items():
+        os.makedirs(tmp_path / label)
+        for index, audio in enumerate(clips):
+            save_wav(str(tmp_path / label / f"{index}.wav"), audio, SAMPLE_RATE)
+    template_path = str(tmp_path / "templates.npz")
+    save_templates(templates, template_path)
+
+    report = run(str(tmp_path), template_path, [0.3])
+    assert report["positives"] == 2 and report["negatives"] == 2
+    assert report["thresholds"][0]["false_reject_rate"] == 0.0
+    assert report["thresholds"][0]["false_accepts"] == 0
+
+
+def test_detector_warns_without_templates(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    with caplog.at_level(logging.WARNING):
+        detector = WakeWordDetector()
+    assert detector.spotter is None
+    assert "No wake word templates" in caplog.text
@@ -0,0 +1,34 @@
+"""Tests for transcript normalization and word error rate."""
+
+import pytest
+
+from utils.wer import edit_distance, normalize_transcript, word_error_rate
+
+
+def test_normalize_lowercases_and_strips_punctuation():
+    assert normalize_transcript("Hello, World! It's 5 o’clock.") == [
+        "hello", "world", "its", "5", "oclock"
+    ]
+
+
+def test_normalize_keeps_devanagari_vowel_signs_and_drops_danda():
+    assert normalize_transcript("नमस्ते। किताब") == ["नमस्ते", "किताब"]
+
+
+@pytest.mark.parametrize("reference,hypothesis,distance", [
+    ("a b c", "a b c", 0),
+    ("a b c", "a x c", 1),  # Substitution
+    ("a b c", "a c", 1),  # Deletion
+    ("a b c", "a b c d", 1),  # Insertion
+    ("a b c", "", 3),
+    ("", "a b", 2),
+])
+def test_edit_distance(reference, hypothesis, distance):
+    assert edit_distance(reference.split(), hypothesis.split()) == distance
+
+
+def test_word_error_rate():
+    assert word_error_rate("Open the browser.", "open the browser") == 0.0
+    assert word_error_rate("open the browser", "open a browser please") == pytest.approx(2 / 3)
+    assert word_error_rate("", "") == 0.0
+    assert word_error_rate("", "noise") == 1.0
@@ -0,0 +1,161 @@
+"""Audio file helpers shared by benchmarks and file-based audio sources."""
+
+import json
+import os
+import wave
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import soundfile  # type: ignore
+except ImportError:  # Only needed for non-WAV formats such as FLAC
+    soundfile = None
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg")
+
+
+def resample(audio: Any, orig_rate: int, target_rate: int) -> Any:
+    """Resample mono audio by linear interpolation."""
+    if orig_rate == target_rate or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+    duration = len(audio) / orig_rate
+    target_len = int(round(duration * target_rate))
+    positions = np.linspace(0, len(audio) - 1, target_len)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+
+class StreamResampler:
+    """Band-limited resampler for mono audio that arrives in blocks.
+
+    Uses windowed-sinc interpolation with the cutoff at the lower of the two
+    Nyquist frequencies, so downsampling does not alias. Input history and
+    the fractional read position carry over between ``process`` calls, so
+    block boundaries add no clicks and the output does not drift. An output
+    sample is produced once ``half_width`` input samples past it have arrived.
+    """
+
+    def __init__(self, orig_rate: int, target_rate: int, zero_crossings: int = 16):
+        """Create a resampler.
+
+        Args:
+            orig_rate: Sample rate of the input blocks.
+            target_rate: Sample rate to produce.
+            zero_crossings: Sinc zero crossings on each side of the kernel;
+                more gives a sharper low-pass at more cost per sample.
+        """
+        self.orig_rate = orig_rate
+        self.target_rate = target_rate
+        self.step = orig_rate / target_rate  # Input samples per output sample
+        self.cutoff = min(1.0, target_rate / orig_rate)  # Relative to the input Nyquist
+        self.half_width = int(np.ceil(zero_crossings / self.cutoff))
+        self.reset()
+
+    def reset(self):
+        """Forget the history, as at the start of a new stream."""
+        self._buffer = np.zeros(self.half_width, dtype=np.float64)
+        self._position = float(self.half_width)  # Next output, in buffer samples
+
+    def process(self, block: Any) -> Any:
+        """Resample the next block and return the output it completes."""
+        block = np.asarray(block, dtype=np.float64).reshape(-1)
+        if self.orig_rate == self.target_rate:
+            return block.astype(np.float32)
+        buffer = np.concatenate((self._buffer, block))
+        # Outputs whose whole kernel lies inside the buffer
+        count = int(np.floor((len(buffer) - 1 - self.half_width - self._position) / self.step)) + 1
+        count = max(0, count)
+        positions = self._position + self.step * np.arange(count)
+        taps = np.arange(-self.half_width + 1, self.half_width + 1)
+        indices = np.floor(positions).astype(np.int64)[:, None] + taps
+        distance = positions[:, None] - indices
+        window = 0.5 * (1.0 + np.cos(np.pi * distance / self.half_width))
+        kernel = self.cutoff * np.sinc(self.cutoff * distance) * window
+        output = np.sum(buffer[indices] * kernel, axis=1) if count else np.zeros(0)
+
+        # Keep the samples the next output's kernel still needs
+        next_position = self._position + self.step * count
+        keep_from = max(0, int(np.floor(next_position)) - self.half_width + 1)
+        self._buffer = buffer[keep_from:]
+        self._position = next_position - keep_from
+        return output.astype(np.float32)
+
+
+def read_wav(path: str) -> Tuple[Any, int]:
+    """Read a PCM WAV file as mono float32 in [-1, 1] at its own sample rate."""
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        audio = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        audio = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    return audio, rate
+
+
+def read_audio(path: str) -> Tuple[Any, int]:
+    """Read any supported audio file as mono float32 at its own sample rate.
+
+    PCM WAV is read with the standard library; other formats (FLAC, OGG,
+    AIFF, float WAV) need soundfile.
+    """
+    if path.lower().endswith(".wav"):
+        try:
+            return read_wav(path)
+        except (wave.Error, ValueError):
+            if soundfile is None:
+                raise
+    if soundfile is None:
+        raise ImportError(f"soundfile is required to read {os.path.splitext(path)[1]} files")
+    audio, rate = soundfile.read(path, dtype="float32", always_2d=True)
+    return audio.mean(axis=1), rate
+
+
+def load_wav(path: str, samplerate: int = 16000) -> Any:
+    """Load a PCM WAV file as mono float32 in [-1, 1] at ``samplerate``."""
+    audio, rate = read_wav(path)
+    return resample(audio, rate, samplerate)
+
+
+def load_audio(path: str, samplerate: int = 16000) -> Any:
+    """Load a WAV file, or FLAC/OGG when soundfile is installed, as mono float32."""
+    audio, rate = read_audio(path)
+    return resample(audio, rate, samplerate)
+
+
+def save_wav(path: str, audio: Any, samplerate: int = 16000):
+    """Save mono float audio as a 16-bit PCM WAV file."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(samplerate)
+        wav.writeframes(pcm.tobytes())
+
+
+def load_manifest(directory: str, filename: str = "manifest.json") -> List[Dict[str, Any]]:
+    """Load a transcribed clip manifest.
+
+    The manifest is a JSON list of ``{"audio": "clip.wav", "text": "...",
+    "language": "en"}`` entries with audio paths relative to ``directory``.
+    Returned entries carry absolute audio paths.
+    """
+    with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    clips = []
+    for entry in entries:
+        clip = dict(entry)
+        clip["audio"] = os.path.abspath(os.path.join(directory, entry["audio"]))
+        clip.setdefault("language", None)
+        clips.append(clip)
+    return clips
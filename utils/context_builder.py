@@ -0,0 +1,61 @@
+"""Token-budgeted conversation context for LLM prompts."""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+from config import CONTEXT_TOKEN_BUDGET
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class ContextBuilder:
+    """Keeps an in-memory tail of recent turns and renders it within a token budget.
+
+    The tail is seeded from persistent memory once and then updated on every
+    ``add``, so building the context never touches the database and each turn
+    appears exactly once.
+    """
+
+    def __init__(self, persistent_memory: Any = None, token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 max_turns: int = 20):
+        self.token_budget = token_budget
+        self._lock = threading.Lock()
+        self._turns: Deque[Tuple[str, int]] = deque(maxlen=max_turns)
+        self._rendered: Optional[str] = None
+
+        if persistent_memory is not None:
+            for user_text, jarvis_text in persistent_memory.fetch_last(max_turns):
+                self._append(user_text, jarvis_text)
+
+    def _append(self, user_text: str, jarvis_text: str):
+        """Render a turn once and store it with its token estimate."""
+        turn = f"User: {user_text}\nJarvis: {jarvis_text}"
+        self._turns.append((turn, estimate_tokens(turn) + 1))
+        self._rendered = None
+
+    def add(self, user_text: str, jarvis_text: str):
+        """Record a completed user/assistant turn."""
+        with self._lock:
+            self._append(user_text, jarvis_text)
+
+    def build(self) -> str:
+        """Return the newest whole turns that fit in the token budget, oldest first."""
+        with self._lock:
+            if self._rendered is None:
+                selected = []
+                used = 0
+                for turn, tokens in reversed(self._turns):
+                    if used + tokens > self.token_budget:
+                        break
+                    selected.append(turn)
+                    used += tokens
+                self._rendered = "\n".join(reversed(selected))
+            return self._rendered
+
+    def estimated_tokens(self) -> int:
+        """Return the token estimate of the context ``build`` currently returns."""
+        return estimate_tokens(self.build())
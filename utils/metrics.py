@@ -0,0 +1,132 @@
+"""In-process metrics registry for per-call-site LLM telemetry."""
+
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from utils.context_builder import estimate_tokens
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class CallSiteStats:
+    """Latency histogram, sizes, error and cache counts for one call site."""
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.errors = 0
+        self.cache: Dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.prompt_chars = 0
+        self.response_chars = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, prompt: str, response: str, error: bool, cache: str):
+        """Add one call to the statistics."""
+        latency_ms = latency * 1000
+        self.calls += 1
+        self.errors += int(error)
+        self.cache[cache] = self.cache.get(cache, 0) + 1
+        self.prompt_chars += len(prompt)
+        self.response_chars += len(response)
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.response_tokens += estimate_tokens(response)
+        self._latencies.append(latency_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Return a latency percentile in milliseconds over the recent window."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the statistics as plain JSON-serializable data."""
+        calls = self.calls or 1
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.errors / calls,
+            "latency_ms": {
+                "p50": round(self.percentile(0.50), 1),
+                "p95": round(self.percentile(0.95), 1),
+                "p99": round(self.percentile(0.99), 1),
+                "histogram": dict(zip(labels, self.buckets)),
+            },
+            "avg_prompt_chars": self.prompt_chars / calls,
+            "avg_response_chars": self.response_chars / calls,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "cache": dict(self.cache),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of per-call-site LLM statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: Dict[str, CallSiteStats] = {}
+
+    def record_llm_call(self, call_site: str, latency: float, prompt: str, response: str,
+                        error: bool = False, cache: str = "bypass"):
+        """Record one LLM call.
+
+        Args:
+            call_site: Name of the code path making the call, e.g. "routing".
+            latency: Wall-clock seconds the caller waited.
+            prompt: Full prompt text including context.
+            response: Reply text.
+            error: Whether the call failed and was answered by the fallback.
+            cache: Cache outcome: "hit", "miss", "bypass" or "coalesced".
+        """
+        with self._lock:
+            stats = self._sites.get(call_site)
+            if stats is None:
+                stats = self._sites[call_site] = CallSiteStats()
+            stats.record(latency, prompt, response, error, cache)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the summary of every call site."""
+        with self._lock:
+            return {site: stats.to_dict() for site, stats in self._sites.items()}
+
+    def to_json(self) -> str:
+        """Return the snapshot as a JSON string."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def dump(self, path: str):
+        """Write the snapshot to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def summary_lines(self) -> List[str]:
+        """Return one human-readable line per call site, slowest p95 first."""
+        snapshot = self.snapshot()
+        ordered = sorted(snapshot.items(), key=lambda item: -item[1]["latency_ms"]["p95"])
+        return [
+            f"{site}: {data['calls']} calls, p50 {data['latency_ms']['p50']} ms, "
+            f"p95 {data['latency_ms']['p95']} ms, p99 {data['latency_ms']['p99']} ms, "
+            f"errors {data['error_rate']:.0%}, "
+            f"~{data['prompt_tokens'] + data['response_tokens']} tokens, cache {data['cache']}"
+            for site, data in ordered
+        ]
+
+    def reset(self):
+        """Drop all recorded statistics."""
+        with self._lock:
+            self._sites.clear()
+
+
+metrics = MetricsRegistry()
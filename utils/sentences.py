@@ -0,0 +1,52 @@
+"""Incremental sentence segmentation for streamed text."""
+
+import re
+from typing import Iterable, Iterator, List, Optional
+
+# Sentence end: terminal punctuation (including the Devanagari danda) followed
+# by whitespace, or a line break.
+_BOUNDARY = re.compile(r'(?<=[.!?।])["\')\]]*\s+|\n+')
+_ABBREVIATIONS = ("mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "e.g.", "i.e.", "etc.")
+
+
+class SentenceSegmenter:
+    """Accumulates text chunks and emits sentences as soon as they complete."""
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk and return any sentences it completed."""
+        self._buffer += chunk
+        sentences: List[str] = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars or candidate.lower().endswith(_ABBREVIATIONS):
+                continue  # Too short to speak on its own, keep accumulating
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text remains once the stream has ended."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+
+
+def iter_sentences(chunks: Iterable[str], min_chars: int = 12) -> Iterator[str]:
+    """Yield complete sentences from an iterable of text chunks."""
+    segmenter = SentenceSegmenter(min_chars)
+    for chunk in chunks:
+        yield from segmenter.feed(chunk)
+    remainder = segmenter.flush()
+    if remainder:
+        yield remainder
+
+
+def split_sentences(text: str, min_chars: int = 12) -> List[str]:
+    """Split a complete text into sentences."""
+    return list(iter_sentences([text], min_chars))
@@ -0,0 +1,38 @@
+"""Word error rate for scoring speech recognition output."""
+
+import unicodedata
+from typing import List
+
+
+def normalize_transcript(text: str) -> List[str]:
+    """Lowercase, strip punctuation and split a transcript into words."""
+    # Apostrophes join contractions; other punctuation (including the
+    # Devanagari danda) and symbols become spaces. Combining marks such as
+    # Devanagari vowel signs are kept.
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    cleaned = "".join(" " if unicodedata.category(char)[0] in "PS" else char for char in text)
+    return cleaned.split()
+
+
+def edit_distance(reference: List[str], hypothesis: List[str]) -> int:
+    """Return the word-level Levenshtein distance."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current[j] = min(
+                previous[j] + 1,  # Deletion
+                current[j - 1] + 1,  # Insertion
+                previous[j - 1] + (ref_word != hyp_word),  # Substitution
+            )
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Return (substitutions + deletions + insertions) / reference words."""
+    ref_words = normalize_transcript(reference)
+    hyp_words = normalize_transcript(hypothesis)
+    if not ref_words:
+        return 0.0 if not hyp_words else 1.0
+    return edit_distance(ref_words, hyp_words) / len(ref_words)
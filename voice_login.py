@@ -1,9 +1,10 @@
-import sounddevice as sd  # type: ignore
 import librosa  # type: ignore
 import numpy as np
 import os
 from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
 
+from core.audio_capture import get_capture_service
+
 
 class VoiceLogin:
     def __init__(self):
@@ -15,12 +16,9 @@ class VoiceLogin:
         """Record voice sample."""
         try:
             print("Recording voice... Please speak for 3 seconds.")
-            audio = sd.rec(int(self.duration * self.sample_rate),
-                          samplerate=self.sample_rate,
-                          channels=1,
-                          dtype='float64')
-            sd.wait()
-            return audio.flatten()
+            with get_capture_service().subscribe(self.sample_rate) as subscription:
+                audio = subscription.record(self.duration)
+            return audio.astype(np.float64)
         except (OSError, RuntimeError) as e:
             print(f"Recording failed: {e}")
             return np.array([])